@@ -0,0 +1,57 @@
+"""
+Benchmark of per-request JWT authentication overhead.
+
+Compares full signature verification on every request with verified-token cache
+lookup, both directly and through ``JWTToken`` dependency used by items router.
+
+Run from ``api`` folder: ``python -m benchmarks.bench_auth``.
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("jwt_secret", "benchmark")
+for variable in ("db_user", "db_password", "db_host", "db_name"):
+    os.environ.setdefault(variable, "benchmark")
+os.environ.setdefault("db_port", "5432")
+
+from benchmarks.report import measure
+from starlette.requests import Request
+from src.auth import token_handler
+from src.auth.token import JWTToken
+
+
+def main():
+    token = token_handler.create_token()["access_token"]
+    request = Request(
+        {
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+    dependency = JWTToken()
+    loop = asyncio.new_event_loop()
+
+    results = {
+        "decode_token": measure(lambda: token_handler.decode_token(token)),
+        "decode_token_cached": measure(
+            lambda: token_handler.decode_token_cached(token)
+        ),
+        "JWTToken (cached)": measure(
+            lambda: loop.run_until_complete(dependency(request))
+        ),
+    }
+    cache = token_handler.verified_tokens
+    token_handler.verified_tokens = None
+    results["JWTToken (uncached)"] = measure(
+        lambda: loop.run_until_complete(dependency(request))
+    )
+    token_handler.verified_tokens = cache
+    loop.close()
+
+    for name, duration in results.items():
+        print(f"{name:<24} {duration:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+Load test of every items and token endpoint against seeded local database.
+
+Application runs either in-process through ASGI transport (``--mode asgi``),
+which measures framework, service and database time without network, or in
+uvicorn subprocess (``--mode uvicorn``), which adds HTTP server and socket
+overhead. Each scenario reports requests per second and p50, p95, p99 latency
+and is compared with stored baseline; run exits with code 1 on regression.
+
+Scenarios run with Item and Items list caches disabled (``uncached``), so reads
+reach the database, and enabled (``cached``), as configured by default.
+``--cache`` selects one of these runs.
+
+Database settings are read from environment variables as by the API itself.
+Run from ``api`` folder: ``python -m benchmarks.bench_endpoints --help``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+import httpx
+from benchmarks import report
+from benchmarks.seed import PREFIX, cleanup, seed
+from src.auth.token_handler import create_token
+
+WRITE_PREFIX = f"{PREFIX}-write"
+BULK_SIZE = 10
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline_endpoints.json")
+CACHE_RUNS = {"off": (False,), "on": (True,), "both": (False, True)}
+NO_CACHE_ENV = {"item_cache_backend": "none", "list_cache_backend": "none"}
+
+
+@dataclass
+class Scenario:
+    """
+    Scenario object describes single benchmarked request.
+
+    :param name: Scenario name used in report and baseline.
+    :type name: str
+    :param method: HTTP method.
+    :type method: str
+    :param request: Callable building URL and request options from request index and shared state.
+    :type request: Callable
+    :param status: Expected response status code.
+    :type status: int
+    :param collect: Callable storing data from response in shared state. Default: None.
+    :type collect: Callable | None
+    """
+
+    name: str
+    method: str
+    request: Callable[[int, dict], tuple[str, dict]]
+    status: int
+    collect: Callable[[httpx.Response, dict], None] | None = field(default=None)
+
+
+def new_item(index: int) -> dict:
+    return {
+        "title": f"{WRITE_PREFIX} {index}",
+        "description": "Benchmark write",
+        "completed": False,
+    }
+
+
+def bulk_ids(state: dict, index: int) -> list[int]:
+    return state["bulk"][index * BULK_SIZE : (index + 1) * BULK_SIZE]
+
+
+def import_body(index: int) -> bytes:
+    return "\n".join(
+        json.dumps(new_item(index * BULK_SIZE + number)) for number in range(BULK_SIZE)
+    ).encode()
+
+
+SCENARIOS = [
+    Scenario("GET /token", "GET", lambda i, s: ("/token", {}), 200),
+    Scenario(
+        "GET /items",
+        "GET",
+        lambda i, s: ("/items", {"params": {"limit": 20, "offset": i % 50}}),
+        200,
+    ),
+    Scenario(
+        "GET /items?fields",
+        "GET",
+        lambda i, s: (
+            "/items",
+            {"params": {"limit": 20, "offset": i % 50, "fields": "id,title"}},
+        ),
+        200,
+    ),
+    Scenario(
+        "GET /items?filter",
+        "GET",
+        lambda i, s: (
+            "/items",
+            {
+                "params": {
+                    "filter_field": "title",
+                    "filter_value": f"{PREFIX} {i % 100}",
+                }
+            },
+        ),
+        200,
+    ),
+    Scenario(
+        "GET /items/export",
+        "GET",
+        lambda i, s: (
+            "/items/export",
+            {"params": {"filter_field": "title", "filter_value": f"{PREFIX} 1"}},
+        ),
+        200,
+    ),
+    Scenario(
+        "POST /items",
+        "POST",
+        lambda i, s: ("/items", {"json": new_item(i)}),
+        201,
+        lambda response, s: s["single"].append(
+            int(response.headers["location"].rsplit("/", 1)[1])
+        ),
+    ),
+    Scenario(
+        "GET /items/{id}",
+        "GET",
+        lambda i, s: (f"/items/{s['single'][i % len(s['single'])]}", {}),
+        200,
+    ),
+    Scenario(
+        "PATCH /items/{id}",
+        "PATCH",
+        lambda i, s: (
+            f"/items/{s['single'][i % len(s['single'])]}",
+            {"json": {"completed": i % 2 == 0}},
+        ),
+        204,
+    ),
+    Scenario(
+        "DELETE /items/{id}",
+        "DELETE",
+        lambda i, s: (f"/items/{s['single'][i]}", {}),
+        204,
+    ),
+    Scenario(
+        "POST /items/bulk",
+        "POST",
+        lambda i, s: (
+            "/items/bulk",
+            {"json": [new_item(i * BULK_SIZE + n) for n in range(BULK_SIZE)]},
+        ),
+        201,
+        lambda response, s: s["bulk"].extend(row["id"] for row in response.json()),
+    ),
+    Scenario(
+        "PATCH /items/bulk",
+        "PATCH",
+        lambda i, s: (
+            "/items/bulk",
+            {
+                "json": [
+                    {"id": item_id, **new_item(item_id), "completed": True}
+                    for item_id in bulk_ids(s, i)
+                ]
+            },
+        ),
+        200,
+    ),
+    Scenario(
+        "DELETE /items/bulk",
+        "DELETE",
+        lambda i, s: ("/items/bulk", {"json": bulk_ids(s, i)}),
+        200,
+    ),
+    Scenario(
+        "POST /items/import",
+        "POST",
+        lambda i, s: (
+            "/items/import",
+            {
+                "content": import_body(i),
+                "headers": {"Content-Type": "application/x-ndjson"},
+            },
+        ),
+        201,
+    ),
+]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    state: dict,
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """Send scenario requests from concurrent workers and summarize latencies.
+
+    :param client: HTTP client bound to application.
+    :type client: httpx.AsyncClient
+    :param scenario: Benchmarked scenario.
+    :type scenario: Scenario
+    :param state: State shared between scenarios, e.g. ids of created Items.
+    :type state: dict
+    :param requests: Number of requests.
+    :type requests: int
+    :param concurrency: Number of concurrent workers.
+    :type concurrency: int
+    :returns: Requests per second and latency percentiles.
+    :rtype: dict[str, float]
+    """
+
+    durations = []
+    indexes = iter(range(requests))
+
+    async def worker():
+        for index in indexes:
+            url, options = scenario.request(index, state)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, url, **options)
+            durations.append(time.perf_counter() - started)
+            if response.status_code != scenario.status:
+                raise RuntimeError(
+                    f"{scenario.name} returned {response.status_code}: {response.text}"
+                )
+            if scenario.collect is not None:
+                scenario.collect(response, state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return report.summarize(durations, time.perf_counter() - started)
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient, requests: int, concurrency: int
+) -> dict[str, dict[str, float]]:
+    """Run every scenario in order, so write scenarios reuse Items created before.
+
+    :param client: HTTP client bound to application.
+    :type client: httpx.AsyncClient
+    :param requests: Number of requests per scenario.
+    :type requests: int
+    :param concurrency: Number of concurrent workers.
+    :type concurrency: int
+    :returns: Results keyed by scenario name.
+    :rtype: dict[str, dict[str, float]]
+    """
+
+    state = {"single": [], "bulk": []}
+    results = {}
+    for scenario in SCENARIOS:
+        results[scenario.name] = await run_scenario(
+            client, scenario, state, requests, concurrency
+        )
+    return results
+
+
+@contextmanager
+def caches_disabled() -> Iterator[None]:
+    """Serve items routes of in-process application without Item and list caches."""
+
+    from src.entrypoints.routers import items
+
+    caches = items.item_cache, items.list_cache
+    items.item_cache = items.list_cache = None
+    try:
+        yield
+    finally:
+        items.item_cache, items.list_cache = caches
+
+
+async def run_asgi(
+    requests: int, concurrency: int, cached: bool = True
+) -> dict[str, dict[str, float]]:
+    """Benchmark application in-process through ASGI transport.
+
+    :param requests: Number of requests per scenario.
+    :type requests: int
+    :param concurrency: Number of concurrent workers.
+    :type concurrency: int
+    :param cached: Keep Item and list caches enabled. Default: True.
+    :type cached: bool
+    :returns: Results keyed by scenario name.
+    :rtype: dict[str, dict[str, float]]
+    """
+
+    from src.adapters.cache import item_cache, list_cache
+    from src.entrypoints.fastapi_app import app
+
+    for cache in (item_cache, list_cache):
+        if cache is not None:
+            cache.clear()
+    with caches_disabled() if not cached else nullcontext():
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                app=app, base_url="http://benchmark", headers=auth_headers()
+            ) as client:
+                return await run_scenarios(client, requests, concurrency)
+
+
+async def run_uvicorn(
+    requests: int, concurrency: int, cached: bool = True
+) -> dict[str, dict[str, float]]:
+    """Benchmark application served by uvicorn subprocess on free local port.
+
+    :param requests: Number of requests per scenario.
+    :type requests: int
+    :param concurrency: Number of concurrent workers.
+    :type concurrency: int
+    :param cached: Keep Item and list caches enabled. Default: True.
+    :type cached: bool
+    :returns: Results keyed by scenario name.
+    :rtype: dict[str, dict[str, float]]
+    """
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.entrypoints.fastapi_app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ if cached else {**os.environ, **NO_CACHE_ENV},
+    )
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", headers=auth_headers(), limits=limits
+        ) as client:
+            await wait_until_ready(client, server)
+            return await run_scenarios(client, requests, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def wait_until_ready(
+    client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30
+):
+    """Wait until uvicorn accepts requests.
+
+    :param client: HTTP client bound to server.
+    :type client: httpx.AsyncClient
+    :param server: Server process.
+    :type server: subprocess.Popen
+    :param timeout: Maximum number of seconds to wait. Default: 30.
+    :type timeout: float
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            await client.get("/token")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def auth_headers() -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_token()['access_token']}"}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--requests", type=int, default=200, help="Per scenario.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--cache",
+        choices=tuple(CACHE_RUNS),
+        default="both",
+        help="Run scenarios with Item and list caches off, on or both.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1000, help="Number of seeded Items."
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store results as baseline."
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative regression."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    seed(args.seed)
+    runner = run_asgi if args.mode == "asgi" else run_uvicorn
+    results = {}
+    for cached in CACHE_RUNS[args.cache]:
+        label = "cached" if cached else "uncached"
+        try:
+            run = asyncio.run(runner(args.requests, args.concurrency, cached))
+        finally:
+            cleanup(WRITE_PREFIX)
+        results.update(
+            {f"{args.mode} {label} {name}": metrics for name, metrics in run.items()}
+        )
+    return report.finish(results, args.baseline, args.save_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
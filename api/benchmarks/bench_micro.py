@@ -0,0 +1,222 @@
+"""
+Micro-benchmarks of hot paths below HTTP layer.
+
+Covers JWT token decoding, Item serialization and repository queries against
+seeded local database. Plans of sorted pages positioned by cursor are checked
+with EXPLAIN to seek on (column, id) index; run fails when any is not. Database settings are read from environment variables
+as by the API itself; ``--no-db`` skips repository benchmarks. Results are
+mean microseconds per call and are compared with stored baseline; run exits
+with code 1 on regression.
+
+Run from ``api`` folder: ``python -m benchmarks.bench_micro --help``.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("jwt_secret", "benchmark")
+for variable in ("db_user", "db_password", "db_host", "db_name"):
+    os.environ.setdefault(variable, "benchmark")
+os.environ.setdefault("db_port", "5432")
+
+from benchmarks import report
+from benchmarks.report import measure
+from benchmarks.seed import seed
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from src.adapters.repository import (
+    PostgreSqlRepository,
+    prepare_keyset_clause,
+    prepare_rows_statement,
+)
+from src.adapters.session import PostgreSqlSession
+from src.auth import token_handler
+from src.domain.model import Item
+from src.domain.schema import FilterMode, ItemSchema
+from src.utils.formatters import parse_sort, rows_to_objects
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline_micro.json")
+PAGE_SIZE = 20
+SORTS = ("title", "description", "completed", "title:desc")
+
+
+def bench_token(rounds: int) -> dict[str, float]:
+    token = token_handler.create_token()["access_token"]
+    return {
+        "decode_token": measure(lambda: token_handler.decode_token(token), rounds),
+        "decode_token_cached": measure(
+            lambda: token_handler.decode_token_cached(token), rounds
+        ),
+    }
+
+
+def bench_serialization(rounds: int) -> dict[str, float]:
+    rows = [
+        (number, f"Item {number}", f"Description of item {number}", number % 2 == 0)
+        for number in range(PAGE_SIZE)
+    ]
+    items = [Item(**row) for row in rows_to_objects(rows)]
+    results = {
+        "ItemSchema.from_orm + json": measure(
+            lambda: json.dumps([ItemSchema.from_orm(item).dict() for item in items]),
+            rounds,
+        ),
+        "jsonable_encoder + json": measure(
+            lambda: json.dumps(
+                jsonable_encoder([ItemSchema.from_orm(item) for item in items])
+            ),
+            rounds,
+        ),
+        "rows_to_objects + json": measure(
+            lambda: json.dumps(rows_to_objects(rows)), rounds
+        ),
+    }
+    try:
+        import orjson
+    except ImportError:
+        return results
+    results["rows_to_objects + orjson"] = measure(
+        lambda: orjson.dumps(rows_to_objects(rows)), rounds
+    )
+    return results
+
+
+def bench_repository(rounds: int) -> dict[str, float]:
+    session = PostgreSqlSession().create_session()
+    orm, core = PostgreSqlRepository(session), PostgreSqlRepository(session, True)
+    item_id = orm.get_items(1, 0, None, None)[0].id
+    benchmarks = {
+        "get_item (ORM)": lambda: orm.get_item(item_id),
+        "get_item (read-only)": lambda: core.get_item(item_id),
+        "get_items (ORM)": lambda: orm.get_items(PAGE_SIZE, 0, None, None),
+        "get_items (read-only)": lambda: core.get_items(PAGE_SIZE, 0, None, None),
+        "get_item_rows id,title": lambda: core.get_item_rows(
+            PAGE_SIZE, 0, None, None, columns=("id", "title")
+        ),
+        "get_items filtered": lambda: core.get_items(
+            PAGE_SIZE, 0, "title", "bench 1", None
+        ),
+    }
+    try:
+        results = {}
+        for name, function in benchmarks.items():
+            results[name] = measure(lambda: (function(), session.expunge_all()), rounds)
+        return results
+    finally:
+        session.close()
+
+
+def middle_position(repository: PostgreSqlRepository, sort: str) -> tuple:
+    order = parse_sort(sort)
+    total = sum(repository.count_items(None, None).values())
+    row = repository.get_item_rows(1, total // 2, None, None, sort=order)[0]
+    values = [getattr(row, name) for name, _ in order[:-1]]
+    return order, row.id, values
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def bench_sorted_pages(rounds: int) -> dict[str, float]:
+    session = PostgreSqlSession().create_session()
+    repository = PostgreSqlRepository(session, True)
+    try:
+        results = {}
+        for sort in SORTS:
+            order, after_id, values = middle_position(repository, sort)
+            results[f"get_item_rows sort={sort} cursor"] = measure(
+                lambda: repository.get_item_rows(
+                    PAGE_SIZE, 0, None, None, after_id, sort=order, after_values=values
+                ),
+                rounds,
+            )
+        return results
+    finally:
+        session.close()
+
+
+def check_sorted_page_plans() -> list[str]:
+    """Find sorts whose page after cursor is not sought on (column, id) index.
+
+    Sequential and bitmap scans are disabled for the check, so the outcome
+    depends on the query shape rather than on the size of seeded table.
+
+    :returns: Sorts with index scan filtering rows or with sort step.
+    :rtype: list[str]
+    """
+
+    session = PostgreSqlSession().create_session()
+    repository = PostgreSqlRepository(session, True)
+    failed = []
+    try:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        for sort in SORTS:
+            order, after_id, values = middle_position(repository, sort)
+            statement = (
+                prepare_rows_statement(None, None, FilterMode.SUBSTRING, sort=order)
+                .where(prepare_keyset_clause(after_id, order, values))
+                .limit(PAGE_SIZE)
+            )
+            compiled = statement.compile(
+                dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = session.execute(
+                text(f"EXPLAIN (FORMAT JSON) {compiled}")
+            ).scalar_one()
+            nodes = list(plan_nodes(plan[0]["Plan"]))
+            sought = any("ROW(" in node.get("Index Cond", "") for node in nodes)
+            sorted_ = any(node["Node Type"] == "Sort" for node in nodes)
+            print(f"sort={sort}: {'index seek' if sought else 'index filter'}")
+            if not sought or sorted_:
+                failed.append(sort)
+        return failed
+    finally:
+        session.rollback()
+        session.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rounds", type=int, default=2000, help="Calls per repeat.")
+    parser.add_argument(
+        "--db-rounds", type=int, default=100, help="Queries per repeat."
+    )
+    parser.add_argument("--no-db", action="store_true", help="Skip repository.")
+    parser.add_argument(
+        "--seed", type=int, default=1000, help="Number of seeded Items."
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store results as baseline."
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative regression."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    durations = {**bench_token(args.rounds), **bench_serialization(args.rounds)}
+    failed = []
+    if not args.no_db:
+        seed(args.seed)
+        durations.update(bench_repository(args.db_rounds))
+        durations.update(bench_sorted_pages(args.db_rounds))
+        failed = check_sorted_page_plans()
+    results = {name: {"mean_us": duration} for name, duration in durations.items()}
+    code = report.finish(results, args.baseline, args.save_baseline, args.tolerance)
+    if failed:
+        print(f"Sorted pages not sought on index: {', '.join(failed)}")
+        return 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
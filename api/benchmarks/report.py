@@ -0,0 +1,182 @@
+"""
+Module contains measurement, reporting and baseline comparison shared by benchmarks.
+
+Results are dictionaries keyed by benchmark name, each holding metrics such as
+``rps``, ``p50``, ``p95``, ``p99`` or ``mean``. Requests per second is better
+when higher, every other metric is a duration and is better when lower.
+"""
+
+import json
+import math
+import os
+import timeit
+
+HIGHER_IS_BETTER = {"rps"}
+
+
+def measure(function, rounds: int = 20000) -> float:
+    """Measure mean duration of function call.
+
+    :param function: Measured callable without arguments.
+    :type function: Callable
+    :param rounds: Number of calls. Default: 20000.
+    :type rounds: int
+    :returns: Mean duration in microseconds.
+    :rtype: float
+    """
+
+    return min(timeit.repeat(function, number=rounds, repeat=5)) / rounds * 1e6
+
+
+def percentile(durations: list[float], fraction: float) -> float:
+    """Compute percentile with nearest-rank method.
+
+    :param durations: Measured durations.
+    :type durations: list[float]
+    :param fraction: Percentile as fraction, e.g. 0.95.
+    :type fraction: float
+    :returns: Duration at percentile.
+    :rtype: float
+    """
+
+    ordered = sorted(durations)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(durations: list[float], elapsed: float) -> dict[str, float]:
+    """Summarize request latencies of single scenario.
+
+    :param durations: Request latencies in seconds.
+    :type durations: list[float]
+    :param elapsed: Wall-clock duration of scenario in seconds.
+    :type elapsed: float
+    :returns: Requests per second and p50, p95, p99 latencies in milliseconds.
+    :rtype: dict[str, float]
+    """
+
+    return {
+        "rps": len(durations) / elapsed,
+        "p50": percentile(durations, 0.50) * 1e3,
+        "p95": percentile(durations, 0.95) * 1e3,
+        "p99": percentile(durations, 0.99) * 1e3,
+    }
+
+
+def load_baseline(path: str) -> dict[str, dict[str, float]]:
+    """Load stored baseline results.
+
+    :param path: Path to baseline JSON file.
+    :type path: str
+    :returns: Baseline results, empty when file does not exist.
+    :rtype: dict[str, dict[str, float]]
+    """
+
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, results: dict[str, dict[str, float]]):
+    """Store results as new baseline.
+
+    :param path: Path to baseline JSON file.
+    :type path: str
+    :param results: Benchmark results.
+    :type results: dict[str, dict[str, float]]
+    """
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Find metrics which regressed against baseline by more than tolerance.
+
+    :param results: Current benchmark results.
+    :type results: dict[str, dict[str, float]]
+    :param baseline: Baseline results.
+    :type baseline: dict[str, dict[str, float]]
+    :param tolerance: Allowed relative change, e.g. 0.2 for 20%.
+    :type tolerance: float
+    :returns: Descriptions of regressed metrics.
+    :rtype: list[str]
+    """
+
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if not expected:
+                continue
+            change = (value - expected) / expected
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    f"{name} {metric}: {value:.2f} vs baseline {expected:.2f} "
+                    f"({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def print_report(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+):
+    """Print results table with relative change against baseline.
+
+    :param results: Benchmark results.
+    :type results: dict[str, dict[str, float]]
+    :param baseline: Baseline results, may be empty.
+    :type baseline: dict[str, dict[str, float]]
+    """
+
+    metrics = list(dict.fromkeys(metric for row in results.values() for metric in row))
+    width = max(len(name) for name in results) + 2
+    print(f"{'benchmark':<{width}}" + "".join(f"{metric:>18}" for metric in metrics))
+    for name, row in results.items():
+        cells = []
+        for metric in metrics:
+            value, expected = row.get(metric), baseline.get(name, {}).get(metric)
+            cell = "" if value is None else f"{value:.2f}"
+            if value is not None and expected:
+                cell += f" ({(value - expected) / expected:+.0%})"
+            cells.append(f"{cell:>18}")
+        print(f"{name:<{width}}" + "".join(cells))
+
+
+def finish(
+    results: dict[str, dict[str, float]],
+    baseline_path: str,
+    save: bool,
+    tolerance: float,
+) -> int:
+    """Report results, compare them with baseline and optionally store them.
+
+    :param results: Benchmark results.
+    :type results: dict[str, dict[str, float]]
+    :param baseline_path: Path to baseline JSON file.
+    :type baseline_path: str
+    :param save: Store results as new baseline instead of comparing.
+    :type save: bool
+    :param tolerance: Allowed relative change, e.g. 0.2 for 20%.
+    :type tolerance: float
+    :returns: Process exit code, 1 when any metric regressed.
+    :rtype: int
+    """
+
+    baseline = {} if save else load_baseline(baseline_path)
+    print_report(results, baseline)
+    if save:
+        save_baseline(baseline_path, results)
+        print(f"Baseline stored in {baseline_path}")
+        return 0
+    regressions = compare(results, baseline, tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
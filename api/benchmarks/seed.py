@@ -0,0 +1,50 @@
+"""
+Module seeds local database with Items used by benchmarks.
+
+Table must exist beforehand, see ``sql/prepare_data.sql``. Seeded rows are
+marked with ``bench`` title prefix, so they can be removed with ``cleanup``.
+"""
+
+from sqlalchemy import delete, func, insert, select
+from src.adapters.session import PostgreSqlSession, engine_registry
+from src.domain.model import Item
+
+PREFIX = "bench"
+
+
+def seed(count: int):
+    """Insert benchmark Items until table holds at least provided number of them.
+
+    :param count: Expected number of benchmark Items.
+    :type count: int
+    """
+
+    engine = engine_registry.get_engine(PostgreSqlSession().url)
+    with engine.begin() as connection:
+        existing = connection.execute(
+            select(func.count()).where(Item.title.like(f"{PREFIX} %"))
+        ).scalar_one()
+        if existing < count:
+            connection.execute(
+                insert(Item),
+                [
+                    {
+                        "title": f"{PREFIX} {number}",
+                        "description": f"Benchmark item {number}",
+                        "completed": number % 2 == 0,
+                    }
+                    for number in range(existing, count)
+                ],
+            )
+
+
+def cleanup(prefix: str = PREFIX):
+    """Delete Items created by benchmarks.
+
+    :param prefix: Title prefix of removed Items. Default: bench.
+    :type prefix: str
+    """
+
+    engine = engine_registry.get_engine(PostgreSqlSession().url)
+    with engine.begin() as connection:
+        connection.execute(delete(Item).where(Item.title.like(f"{prefix}%")))
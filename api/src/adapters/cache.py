@@ -0,0 +1,585 @@
+"""
+Module contains cache backends and read-through caching of repository lookups.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from anyio import to_thread
+from src.config.settings import settings
+from src.domain.model import Item
+from src.domain.schema import ItemSchema
+
+
+class CacheStats:
+    """
+    CacheStats object counts cache lookups outcome.
+
+    :param hits: Number of lookups served from cache.
+    :type hits: int
+    :param misses: Number of lookups not found in cache or expired.
+    :type misses: int
+    :param evictions: Number of entries dropped because of size bound or expiration.
+    :type evictions: int
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> dict:
+        """Retrieve counters as dictionary.
+
+        :returns: Counters keyed by name.
+        :rtype: dict
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class AbstractCache(ABC):
+    """
+    Base object for key-value cache backends.
+
+    Values must be JSON serializable. Backends performing network I/O set
+    ``blocking`` flag, so their asynchronous methods run in a worker thread
+    instead of blocking the event loop.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str):
+        """Retrieve cached value.
+
+        :param key: Cache key.
+        :type key: str
+
+        :returns: Cached value or None when key is missing or expired.
+        :rtype: Any
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: float | None = None):
+        """Store value under provided key.
+
+        :param key: Cache key.
+        :type key: str
+        :param value: JSON serializable value.
+        :type value: Any
+        :param ttl: Entry time to live in seconds. Default: None, cache TTL is used.
+        :type ttl: float | None
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *keys: str):
+        """Remove provided keys from cache.
+
+        :param keys: Cache keys.
+        :type keys: str
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        """
+        Remove all entries from cache.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def generation(self, namespace: str) -> int | None:
+        """Retrieve current generation of namespace.
+
+        Generation is embedded in keys of namespace entries, so bumping it
+        makes all of them miss without scanning keys. Lookups are not counted.
+
+        :param namespace: Namespace name.
+        :type namespace: str
+
+        :returns: Generation number or None when cache is unavailable, so namespace is not cached.
+        :rtype: int | None
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_generation(self, namespace: str):
+        """Start new generation of namespace, invalidating all its entries.
+
+        :param namespace: Namespace name.
+        :type namespace: str
+        """
+
+        raise NotImplementedError
+
+    async def async_get(self, key: str):
+        """Retrieve cached value from event loop.
+
+        :param key: Cache key.
+        :type key: str
+
+        :returns: Cached value or None when key is missing or expired.
+        :rtype: Any
+        """
+
+        return await self.__run(self.get, key)
+
+    async def async_set(self, key: str, value, ttl: float | None = None):
+        """Store value under provided key from event loop.
+
+        :param key: Cache key.
+        :type key: str
+        :param value: JSON serializable value.
+        :type value: Any
+        :param ttl: Entry time to live in seconds. Default: None, cache TTL is used.
+        :type ttl: float | None
+        """
+
+        return await self.__run(self.set, key, value, ttl)
+
+    async def async_delete(self, *keys: str):
+        """Remove provided keys from cache from event loop.
+
+        :param keys: Cache keys.
+        :type keys: str
+        """
+
+        return await self.__run(self.delete, *keys)
+
+    async def async_generation(self, namespace: str) -> int | None:
+        """Retrieve current generation of namespace from event loop.
+
+        :param namespace: Namespace name.
+        :type namespace: str
+
+        :returns: Generation number or None when cache is unavailable.
+        :rtype: int | None
+        """
+
+        return await self.__run(self.generation, namespace)
+
+    async def async_bump_generation(self, namespace: str):
+        """Start new generation of namespace from event loop.
+
+        :param namespace: Namespace name.
+        :type namespace: str
+        """
+
+        return await self.__run(self.bump_generation, namespace)
+
+    async def __run(self, method, *args):
+        if self.blocking:
+            return await to_thread.run_sync(method, *args)
+        return method(*args)
+
+
+class InMemoryCache(AbstractCache):
+    """
+    Process local least recently used cache with time to live.
+
+    :param max_size: Maximum number of entries, least recently used are evicted first.
+    :type max_size: int
+    :param ttl: Entry time to live in seconds.
+    :type ttl: float
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self.__generations: dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self.__entries[key]
+                self.stats.evictions += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value, ttl: float | None = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self.__lock:
+            self.__entries[key] = (expires, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str):
+        with self.__lock:
+            for key in keys:
+                self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def generation(self, namespace: str) -> int:
+        return self.__generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str):
+        with self.__lock:
+            self.__generations[namespace] = self.__generations.get(namespace, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+class RedisCache(AbstractCache):
+    """
+    Cache shared between processes, backed by Redis compatible server.
+
+    Expiration is handled by the server, so evictions are not counted. Server
+    errors are logged and degrade to no caching, so an outage never fails a
+    request; entries not invalidated during it expire with their TTL.
+
+    :param client: Redis compatible client providing get, set, delete, incr and scan_iter.
+    :type client: redis.Redis
+    :param ttl: Entry time to live in seconds.
+    :type ttl: int
+    :param prefix: Namespace prepended to every key. Default: todos:.
+    :type prefix: str
+    """
+
+    blocking = True
+
+    def __init__(self, client, ttl: int, prefix: str = "todos:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int, prefix: str = "todos:") -> "RedisCache":
+        """Create cache connected to Redis server. Requires optional redis package.
+
+        :param url: Redis connection URL.
+        :type url: str
+        :param ttl: Entry time to live in seconds.
+        :type ttl: int
+        :param prefix: Namespace prepended to every key. Default: todos:.
+        :type prefix: str
+
+        :returns: Redis cache object.
+        :rtype: RedisCache
+        """
+
+        import redis
+
+        return cls(redis.Redis.from_url(url), ttl, prefix)
+
+    def get(self, key: str):
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as err:
+            logging.error(f"Caught error during cache lookup: {err}")
+            value = None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        expires = self.ttl if ttl is None else max(1, min(int(ttl), self.ttl))
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), ex=expires)
+        except Exception as err:
+            logging.error(f"Caught error during cache store: {err}")
+
+    def delete(self, *keys: str):
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as err:
+            logging.error(f"Caught error during cache invalidation: {err}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as err:
+            logging.error(f"Caught error during cache clear: {err}")
+
+    def generation(self, namespace: str) -> int | None:
+        try:
+            return int(self.client.get(f"{self.prefix}generation:{namespace}") or 0)
+        except Exception as err:
+            logging.error(f"Caught error during cache generation lookup: {err}")
+            return None
+
+    def bump_generation(self, namespace: str):
+        try:
+            self.client.incr(f"{self.prefix}generation:{namespace}")
+        except Exception as err:
+            logging.error(f"Caught error during cache invalidation: {err}")
+
+
+class ReadOnlyCache(AbstractCache):
+    """
+    View of cache which serves lookups but never stores values.
+
+    Reads from a lagging replica may return data older than the current
+    generation, so they look entries up without filling the shared cache.
+
+    :param cache: Wrapped cache backend.
+    :type cache: AbstractCache
+    """
+
+    def __init__(self, cache: AbstractCache):
+        self.cache = cache
+        self.stats = cache.stats
+        self.blocking = cache.blocking
+
+    def get(self, key: str):
+        return self.cache.get(key)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        pass
+
+    def delete(self, *keys: str):
+        self.cache.delete(*keys)
+
+    def clear(self):
+        self.cache.clear()
+
+    def generation(self, namespace: str) -> int | None:
+        return self.cache.generation(namespace)
+
+    def bump_generation(self, namespace: str):
+        self.cache.bump_generation(namespace)
+
+
+def create_cache(
+    backend: str, max_size: int, ttl: int, redis_url: str | None = None
+) -> AbstractCache | None:
+    """Create cache backend based on its name.
+
+    :param backend: Backend name, one of memory, redis or none.
+    :type backend: str
+    :param max_size: Maximum number of entries kept by in-memory backend.
+    :type max_size: int
+    :param ttl: Entry time to live in seconds.
+    :type ttl: int
+    :param redis_url: Redis connection URL, required by redis backend.
+    :type redis_url: str | None
+
+    :returns: Cache object or None when caching is disabled.
+    :rtype: AbstractCache | None
+    """
+
+    if backend == "memory":
+        return InMemoryCache(max_size, ttl)
+    if backend == "redis":
+        return RedisCache.from_url(redis_url, ttl)
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+ITEMS_NAMESPACE = "items"
+
+
+def item_cache_key(item_id: int) -> str:
+    """Prepare cache key of single Item.
+
+    :param item_id: Id of Item in table.
+    :type item_id: int
+
+    :returns: Cache key.
+    :rtype: str
+    """
+
+    return f"item:{item_id}"
+
+
+def items_page_key(
+    generation: int,
+    limit: int,
+    offset: int,
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    after_id: int | None,
+    filter_mode: str,
+    columns: Sequence[str] | None = None,
+    sort: Sequence[tuple[str, str]] | None = None,
+    after_values: Sequence = (),
+) -> str:
+    """Prepare cache key of Items page from normalized query parameters.
+
+    Filter parameters are dropped unless both field and value are provided,
+    the same as repository ignores them.
+
+    :param generation: Generation of Items lists namespace.
+    :type generation: int
+    :param limit: Limit page items size.
+    :type limit: int
+    :param offset: Page number.
+    :type offset: int
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param after_id: Return only Items with Id greater than provided one.
+    :type after_id: int | None
+    :param filter_mode: Text matching mode.
+    :type filter_mode: str
+    :param columns: Names of row columns, None when page is stored as Item objects. Default: None.
+    :type columns: Sequence[str] | None
+    :param sort: Pairs of column name and direction, ending with id. Default: None, id ascending.
+    :type sort: Sequence[tuple[str, str]] | None
+    :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+    :type after_values: Sequence
+
+    :returns: Cache key.
+    :rtype: str
+    """
+
+    if filter_field is None or filter_value is None:
+        filter_field = filter_value = filter_mode = None
+    elif isinstance(filter_value, bool):
+        filter_value = str(filter_value).lower()
+    params = json.dumps(
+        [
+            limit,
+            offset,
+            filter_field,
+            filter_value,
+            after_id,
+            filter_mode,
+            columns,
+            sort,
+            list(after_values),
+        ],
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(params.encode()).hexdigest()
+    return f"{ITEMS_NAMESPACE}:{generation}:{digest}"
+
+
+def items_stats_key(
+    generation: int,
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    filter_mode: str,
+) -> str:
+    """Prepare cache key of Items counts from normalized filter parameters.
+
+    :param generation: Generation of Items lists namespace.
+    :type generation: int
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text matching mode.
+    :type filter_mode: str
+
+    :returns: Cache key.
+    :rtype: str
+    """
+
+    if filter_field is None or filter_value is None:
+        filter_field = filter_value = filter_mode = None
+    elif isinstance(filter_value, bool):
+        filter_value = str(filter_value).lower()
+    params = json.dumps(
+        [filter_field, filter_value, filter_mode], separators=(",", ":")
+    )
+    digest = hashlib.sha256(params.encode()).hexdigest()
+    return f"{ITEMS_NAMESPACE}:{generation}:stats:{digest}"
+
+
+class CachedRepository:
+    """
+    Read-through cache wrapped around repository.
+
+    ``get_item`` results are served from cache and stored on miss, every other
+    method is delegated to wrapped repository unchanged. Entries are invalidated
+    by the service layer after writes.
+
+    :param repository: Wrapped repository.
+    :type repository: AbstractRepository
+    :param cache: Cache backend.
+    :type cache: AbstractCache
+    """
+
+    def __init__(self, repository, cache: AbstractCache):
+        self.repository = repository
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self.repository, name)
+
+    def get_item(self, item_id: int) -> Item:
+        cached = self.cache.get(item_cache_key(item_id))
+        if cached is not None:
+            return Item(**cached)
+        result = self.repository.get_item(item_id)
+        if result is not None:
+            self.cache.set(item_cache_key(item_id), ItemSchema.from_orm(result).dict())
+        return result
+
+
+class AsyncCachedRepository(CachedRepository):
+    """
+    Read-through cache wrapped around asynchronous repository.
+
+    :param repository: Wrapped asynchronous repository.
+    :type repository: AsyncAbstractRepository
+    :param cache: Cache backend.
+    :type cache: AbstractCache
+    """
+
+    async def get_item(self, item_id: int) -> Item:
+        cached = await self.cache.async_get(item_cache_key(item_id))
+        if cached is not None:
+            return Item(**cached)
+        result = await self.repository.get_item(item_id)
+        if result is not None:
+            await self.cache.async_set(
+                item_cache_key(item_id), ItemSchema.from_orm(result).dict()
+            )
+        return result
+
+
+item_cache = create_cache(
+    settings.item_cache_backend,
+    settings.item_cache_max_size,
+    settings.item_cache_ttl,
+    settings.redis_url,
+)
+
+list_cache = create_cache(
+    settings.list_cache_backend,
+    settings.list_cache_max_size,
+    settings.list_cache_ttl,
+    settings.redis_url,
+)
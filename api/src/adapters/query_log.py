@@ -0,0 +1,392 @@
+"""
+Module contains slow query log of database statements.
+
+Statements running longer than ``slow_query_threshold`` seconds are written
+to log as JSON records with bound-parameter shapes (types, never values) and
+repository method which issued them. A sampled fraction of slow SELECT
+statements is re-run with ``EXPLAIN (ANALYZE, BUFFERS)`` on PostgreSQL to
+capture the plan. EXPLAIN runs in background on its own pooled connection,
+so it neither delays the request nor aborts its transaction when it fails.
+The slowest statements are kept in memory per call site and
+served by ``/admin/slow-queries`` endpoint.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from sqlalchemy import Engine, event
+from sqlalchemy.util import greenlet_spawn
+from src.adapters.repository import AbstractRepository
+from src.config.settings import settings
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+def value_shape(value) -> str:
+    """Describe bound parameter value without revealing it.
+
+    :param value: Parameter value.
+    :type value: Any
+    :returns: Type name, with length for sequences, e.g. list[3].
+    :rtype: str
+    """
+
+    if isinstance(value, (list, tuple, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameters_shape(parameters, executemany: bool = False):
+    """Describe bound parameters of statement without revealing values.
+
+    :param parameters: Parameters passed to DBAPI cursor.
+    :type parameters: dict | Sequence | None
+    :param executemany: Parameters hold one set per row. Default: False.
+    :type executemany: bool
+    :returns: Parameter types keyed by name or listed by position.
+    :rtype: dict | list | None
+    """
+
+    if executemany:
+        rows = list(parameters)
+        return {
+            "rows": len(rows),
+            "row": parameters_shape(rows[0]) if rows else None,
+        }
+    if isinstance(parameters, dict):
+        return {name: value_shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [value_shape(value) for value in parameters]
+    return None
+
+
+def find_call_site() -> str:
+    """Find repository method executing current statement.
+
+    Asynchronous repositories run synchronous repository logic, so the
+    method is found in both modes.
+
+    :returns: Class and method name, e.g. PostgreSqlRepository.get_items, or unknown.
+    :rtype: str
+    """
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        instance = frame.f_locals.get("self")
+        if isinstance(instance, AbstractRepository):
+            return f"{type(instance).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class SlowQueryLog:
+    """
+    SlowQueryLog object records statements slower than threshold.
+
+    :param threshold: Minimum statement duration in seconds. Default: None, log disabled.
+    :type threshold: float | None
+    :param explain_rate: Fraction of slow SELECT statements explained with ANALYZE. Default: 0.
+    :type explain_rate: float
+    :param top_size: Number of slowest statements kept in memory. Default: 50.
+    :type top_size: int
+    """
+
+    def __init__(
+        self,
+        threshold: float | None = None,
+        explain_rate: float = 0,
+        top_size: int = 50,
+    ):
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.top_size = top_size
+        self.__entries: dict[tuple[str, str], dict] = {}
+        self.__lock = threading.Lock()
+        self.__executor = None
+        self.__pending: set[Future | asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Information that statements are timed.
+        """
+
+        return self.threshold is not None
+
+    def instrument(self, engine: Engine):
+        """Time every statement executed by engine.
+
+        :param engine: Synchronous engine, or ``sync_engine`` of asynchronous one.
+        :type engine: Engine
+        """
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            if context is not None:
+                context.query_log_started = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            started = getattr(context, "query_log_started", None)
+            if started is None or not self.enabled:
+                return
+            duration = time.perf_counter() - started
+            if duration < self.threshold:
+                return
+            call_site = find_call_site()
+            self.record(
+                statement,
+                parameters_shape(parameters, executemany),
+                duration,
+                call_site,
+            )
+            if self.should_explain(connection, statement, executemany):
+                self.schedule_explain(
+                    connection.engine, statement, parameters, call_site
+                )
+
+    def should_explain(self, connection, statement: str, executemany: bool) -> bool:
+        """Decide whether slow statement is sampled for EXPLAIN ANALYZE.
+
+        Only single SELECT statements on PostgreSQL are explained, because
+        ANALYZE executes the statement again.
+
+        :param connection: Connection which executed statement.
+        :type connection: Connection
+        :param statement: SQL statement.
+        :type statement: str
+        :param executemany: Statement ran once per parameter set.
+        :type executemany: bool
+        :returns: Information that plan should be captured.
+        :rtype: bool
+        """
+
+        return (
+            not executemany
+            and connection.dialect.name == "postgresql"
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_rate
+        )
+
+    def schedule_explain(
+        self, engine: Engine, statement: str, parameters, call_site: str
+    ):
+        """Capture execution plan of slow statement in background.
+
+        Asynchronous engines explain in a task of the running event loop,
+        synchronous ones in a worker thread.
+
+        :param engine: Engine which executed statement.
+        :type engine: Engine
+        :param statement: SQL statement.
+        :type statement: str
+        :param parameters: Parameters passed to DBAPI cursor.
+        :type parameters: dict | Sequence | None
+        :param call_site: Repository method which executed statement.
+        :type call_site: str
+        """
+
+        arguments = (engine, statement, parameters, call_site)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self.__lock:
+            if loop is not None:
+                pending = loop.create_task(
+                    greenlet_spawn(self.explain_plan, *arguments)
+                )
+            else:
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="slow-query-explain"
+                    )
+                pending = self.__executor.submit(self.explain_plan, *arguments)
+            self.__pending.add(pending)
+        pending.add_done_callback(self.__pending.discard)
+
+    def explain_plan(self, engine: Engine, statement: str, parameters, call_site: str):
+        """Capture execution plan on connection borrowed from pool and record it.
+
+        :param engine: Engine which executed statement.
+        :type engine: Engine
+        :param statement: SQL statement.
+        :type statement: str
+        :param parameters: Parameters passed to DBAPI cursor.
+        :type parameters: dict | Sequence | None
+        :param call_site: Repository method which executed statement.
+        :type call_site: str
+        """
+
+        try:
+            connection = engine.raw_connection()
+        except Exception as err:
+            logging.error(f"Caught exception during EXPLAIN of slow query: {err}")
+            return
+        try:
+            plan = self.explain(connection, statement, parameters)
+        finally:
+            connection.close()
+        if plan is not None:
+            self.record_plan(call_site, statement, plan)
+
+    def explain(self, connection, statement: str, parameters) -> list | None:
+        """Capture execution plan of statement, rolling back its transaction.
+
+        :param connection: DBAPI connection, not used by any request.
+        :type connection: Any
+        :param statement: SQL statement.
+        :type statement: str
+        :param parameters: Parameters passed to DBAPI cursor.
+        :type parameters: dict | Sequence | None
+        :returns: Plan in PostgreSQL JSON format, None when it cannot be captured.
+        :rtype: list | None
+        """
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(EXPLAIN_PREFIX + statement, parameters)
+            plan = cursor.fetchone()[0]
+            return json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as err:
+            logging.error(f"Caught exception during EXPLAIN of slow query: {err}")
+            return None
+        finally:
+            cursor.close()
+            connection.rollback()
+
+    def wait(self, timeout: float | None = None):
+        """Wait until plans explained in worker thread are recorded.
+
+        :param timeout: Maximum number of seconds to wait. Default: None, no limit.
+        :type timeout: float | None
+        """
+
+        with self.__lock:
+            futures = [
+                pending for pending in self.__pending if isinstance(pending, Future)
+            ]
+        wait(futures, timeout)
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        duration: float,
+        call_site: str,
+        plan: list | None = None,
+    ):
+        """Log slow statement and keep it in the slowest statements table.
+
+        :param statement: SQL statement.
+        :type statement: str
+        :param parameters: Bound-parameter shapes.
+        :type parameters: dict | list | None
+        :param duration: Statement duration in seconds.
+        :type duration: float
+        :param call_site: Repository method which executed statement.
+        :type call_site: str
+        :param plan: Execution plan. Default: None.
+        :type plan: list | None
+        """
+
+        logging.warning(
+            json.dumps(
+                {
+                    "event": "slow_query",
+                    "duration": round(duration, 6),
+                    "call_site": call_site,
+                    "statement": statement,
+                    "parameters": parameters,
+                    "plan": plan,
+                }
+            )
+        )
+        key = (call_site, statement)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                if len(self.__entries) >= self.top_size:
+                    fastest = min(
+                        self.__entries, key=lambda k: self.__entries[k]["max_duration"]
+                    )
+                    if self.__entries[fastest]["max_duration"] >= duration:
+                        return
+                    del self.__entries[fastest]
+                entry = self.__entries[key] = {
+                    "call_site": call_site,
+                    "statement": statement,
+                    "count": 0,
+                    "total_duration": 0.0,
+                    "max_duration": 0.0,
+                    "parameters": parameters,
+                    "plan": None,
+                }
+            entry["count"] += 1
+            entry["total_duration"] += duration
+            entry["max_duration"] = max(entry["max_duration"], duration)
+            entry["parameters"] = parameters
+            if plan is not None:
+                entry["plan"] = plan
+
+    def record_plan(self, call_site: str, statement: str, plan: list):
+        """Log execution plan of slow statement and attach it to its entry.
+
+        :param call_site: Repository method which executed statement.
+        :type call_site: str
+        :param statement: SQL statement.
+        :type statement: str
+        :param plan: Execution plan.
+        :type plan: list
+        """
+
+        logging.warning(
+            json.dumps(
+                {
+                    "event": "slow_query_plan",
+                    "call_site": call_site,
+                    "statement": statement,
+                    "plan": plan,
+                }
+            )
+        )
+        with self.__lock:
+            entry = self.__entries.get((call_site, statement))
+            if entry is not None:
+                entry["plan"] = plan
+
+    def top(self) -> list[dict]:
+        """Retrieve slowest statements.
+
+        :returns: Statements per call site, slowest first.
+        :rtype: list[dict]
+        """
+
+        with self.__lock:
+            entries = [dict(entry) for entry in self.__entries.values()]
+        return sorted(entries, key=lambda entry: entry["max_duration"], reverse=True)
+
+    def clear(self):
+        """
+        Forget recorded statements.
+        """
+
+        with self.__lock:
+            self.__entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    settings.slow_query_threshold,
+    settings.slow_query_explain_rate,
+    settings.slow_query_top_size,
+)
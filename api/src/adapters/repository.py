@@ -1,13 +1,299 @@
 """
-Module contains logic for operations on database. 
+Module contains logic for operations on database.
 """
 
+import csv
+import io
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator, Sequence
 
-from sqlalchemy.orm import Query, Session
-from src.domain.model import Item
-from src.domain.schema import ItemBaseSchema
+from pydantic import parse_obj_as
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ColumnElement,
+    Insert,
+    Integer,
+    Row,
+    Select,
+    String,
+    UnaryExpression,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.domain.model import (
+    DEFAULT_SORT,
+    ITEM_COLUMNS,
+    TEXT_SEARCH_CONFIG,
+    Item,
+    ItemCount,
+)
+from src.domain.schema import (
+    FilterMode,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+)
+from src.utils.metrics import track_operations
+from src.utils.tracing import trace_operations
+
+COPY_COLUMNS = ("title", "description", "completed")
+
+
+def prepare_filter_clause(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+) -> ColumnElement[bool] | None:
+    """Prepare index-friendly filtering clause for Items query.
+
+    Substring and prefix modes compile to ``LIKE`` served by trigram indexes,
+    full-text mode matches generated search vector served by its GIN index.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+
+    :returns: Filtering clause or None when field is not filterable.
+    :rtype: ColumnElement[bool] | None
+    """
+
+    match filter_field:
+        case "title" | "description":
+            column = getattr(Item, filter_field)
+            match filter_mode:
+                case FilterMode.FULLTEXT:
+                    search_vector = getattr(Item, f"{filter_field}_search")
+                    return search_vector.bool_op("@@")(
+                        func.plainto_tsquery(
+                            literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"),
+                            filter_value,
+                        )
+                    )
+                case FilterMode.PREFIX:
+                    return column.startswith(filter_value, autoescape=True)
+                case _:
+                    return column.contains(filter_value, autoescape=True)
+        case "completed":
+            return Item.completed == parse_obj_as(bool, filter_value)
+    return None
+
+
+def select_columns(columns: Sequence[str] = ITEM_COLUMNS) -> Select:
+    """Prepare Core query of provided Items columns.
+
+    Rows are plain named tuples, so neither ORM instances nor identity map
+    entries are created for them.
+
+    :param columns: Names of selected columns. Default: id, title, description, completed.
+    :type columns: Sequence[str]
+
+    :returns: Items query.
+    :rtype: Select
+    """
+
+    return select(*(getattr(Item, column) for column in columns))
+
+
+def prepare_order_clause(
+    sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+) -> list[ColumnElement | UnaryExpression]:
+    """Prepare ORDER BY clause of Items query.
+
+    :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+    :type sort: Sequence[tuple[str, str]]
+
+    :returns: Ordering columns.
+    :rtype: list[ColumnElement | UnaryExpression]
+    """
+
+    return [
+        getattr(Item, name).desc() if direction == "desc" else getattr(Item, name)
+        for name, direction in sort
+    ]
+
+
+def prepare_keyset_clause(
+    after_id: int,
+    sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+    after_values: Sequence = (),
+) -> ColumnElement[bool]:
+    """Prepare clause selecting Items which follow provided position in sort order.
+
+    Sort columns are not nullable, so when all keys share direction the clause
+    is a row comparison, e.g. ``(title, id) > ('a', 5)``, which PostgreSQL
+    uses as index condition of (column, id) index scan. Ordered by id only, it
+    is ``id > after_id``. Mixed directions are expanded into a disjunction.
+
+    :param after_id: Id of last Item on the previous page.
+    :type after_id: int
+    :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+    :type sort: Sequence[tuple[str, str]]
+    :param after_values: Values of sort columns preceding id in last Item. Default: none.
+    :type after_values: Sequence
+
+    :returns: Filtering clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    columns = [getattr(Item, name) for name, _ in sort]
+    bounds = [
+        bindparam(column.key, value, type_=column.type, unique=True)
+        for column, value in zip(columns, (*after_values, after_id))
+    ]
+    directions = [direction for _, direction in sort]
+    if len(set(directions)) == 1:
+        left, right = columns[0], bounds[0]
+        if len(columns) > 1:
+            left, right = tuple_(*columns), tuple_(*bounds)
+        return left < right if directions[0] == "desc" else left > right
+    terms = []
+    for index, direction in enumerate(directions):
+        column, bound = columns[index], bounds[index]
+        follows = column < bound if direction == "desc" else column > bound
+        equal = (column == bound for column, bound in zip(columns, bounds[:index]))
+        terms.append(and_(*equal, follows))
+    return or_(*terms)
+
+
+def prepare_rows_statement(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    filter_mode: FilterMode,
+    columns: Sequence[str] = ITEM_COLUMNS,
+    sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+) -> Select:
+    """Prepare column-only Items query in provided order.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text matching mode.
+    :type filter_mode: FilterMode
+    :param columns: Names of selected columns. Default: id, title, description, completed.
+    :type columns: Sequence[str]
+    :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+    :type sort: Sequence[tuple[str, str]]
+
+    :returns: Items query.
+    :rtype: Select
+    """
+
+    statement = select_columns(columns)
+    clause = prepare_filter_clause(filter_field, filter_value, filter_mode)
+    if clause is not None:
+        statement = statement.where(clause)
+    return statement.order_by(*prepare_order_clause(sort))
+
+
+def prepare_stream_statement(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    filter_mode: FilterMode,
+    batch_size: int,
+) -> Select:
+    """Prepare column-only Items query fetched through server-side cursor.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text matching mode.
+    :type filter_mode: FilterMode
+    :param batch_size: Number of rows fetched per batch.
+    :type batch_size: int
+
+    :returns: Items query.
+    :rtype: Select
+    """
+
+    return prepare_rows_statement(
+        filter_field, filter_value, filter_mode
+    ).execution_options(yield_per=batch_size)
+
+
+def prepare_count_statement(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    filter_mode: FilterMode,
+) -> Select:
+    """Prepare query counting Items by completion state.
+
+    Unfiltered and completion filtered counts are sums of the counter table
+    rows appended by triggers, so they take constant time however large the
+    table grows. Text filters count matching rows through their indexes.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text matching mode.
+    :type filter_mode: FilterMode
+
+    :returns: Query of completed and count columns.
+    :rtype: Select
+    """
+
+    clause = prepare_filter_clause(filter_field, filter_value, filter_mode)
+    if clause is None or filter_field == "completed":
+        count = cast(func.sum(ItemCount.count), BigInteger).label("count")
+        statement = select(ItemCount.completed, count).group_by(ItemCount.completed)
+        if clause is not None:
+            statement = statement.where(
+                ItemCount.completed == parse_obj_as(bool, filter_value)
+            )
+        return statement
+    completed = Item.completed.is_(True).label("completed")
+    return (
+        select(completed, func.count().label("count")).where(clause).group_by(completed)
+    )
+
+
+def prepare_counts_rollup_statement() -> Insert:
+    """Prepare statement replacing counter table rows with their sum per state.
+
+    Rows are deleted and re-inserted as sums in one statement, so rows appended
+    by concurrent writes are neither lost nor waited for.
+
+    :returns: Insert of summed rows deleted by the same statement.
+    :rtype: Insert
+    """
+
+    removed = (
+        delete(ItemCount).returning(ItemCount.completed, ItemCount.count).cte("removed")
+    )
+    count = func.sum(removed.c.count)
+    return (
+        insert(ItemCount)
+        .add_cte(removed)
+        .from_select(
+            ["completed", "count"],
+            select(removed.c.completed, count)
+            .group_by(removed.c.completed)
+            .having(count != 0),
+        )
+    )
 
 
 class AbstractRepository(ABC):
@@ -28,6 +314,19 @@ class AbstractRepository(ABC):
 
         raise NotImplementedError
 
+    @abstractmethod
+    def lock_item(self, item_id: int) -> Item | None:
+        """Retrieve Item and lock its row until the transaction ends.
+
+        :param item_id: Id of Item in table.
+        :type item_id: int
+
+        :returns: Item object or None when Id does not exist.
+        :rtype: Item | None
+        """
+
+        raise NotImplementedError
+
     @abstractmethod
     def get_items(
         self,
@@ -35,6 +334,10 @@ class AbstractRepository(ABC):
         offset: int,
         filter_field: str | None,
         filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
     ) -> list[Item]:
         """Retrieve Items based on provided parameters.
 
@@ -46,6 +349,14 @@ class AbstractRepository(ABC):
         :type filter_field: str | None
         :param filter_value: Filter value.
         :type filter_value: str | bool | None
+        :param after_id: Return only Items following Item with provided Id in sort order.
+        :type after_id: int | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+        :type sort: Sequence[tuple[str, str]]
+        :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+        :type after_values: Sequence
 
         :returns: List of Item objects.
         :rtype: list[Item]
@@ -54,28 +365,99 @@ class AbstractRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def insert_item(self, item: ItemBaseSchema) -> bool:
+    def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Row]:
+        """Retrieve Items as rows of provided columns.
+
+        :param limit: Limit page items size.
+        :type limit: int
+        :param offset: Page number.
+        :type offset: int
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param after_id: Return only Items following Item with provided Id in sort order.
+        :type after_id: int | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param columns: Names of selected columns. Default: id, title, description, completed.
+        :type columns: Sequence[str]
+        :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+        :type sort: Sequence[tuple[str, str]]
+        :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+        :type after_values: Sequence
+
+        :returns: List of rows in provided order.
+        :rtype: list[Row]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        """Count Items matching provided filter by completion state.
+
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+
+        :returns: Number of Items keyed by completion state.
+        :rtype: dict[bool, int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def rollup_counts(self) -> None:
+        """Replace counter table rows with a single row per completion state."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_item(self, item: ItemBaseSchema) -> int:
         """Insert Item based on provided schema.
 
         :param item: Body of Item to insert.
         :type item: ItemBaseSchema
 
-        :returns: Operation result.
-        :rtype: bool
+        :returns: Id of inserted Item.
+        :rtype: int
         """
 
         raise NotImplementedError
 
     @abstractmethod
-    def update_item(self, item_id: int, item: ItemBaseSchema) -> bool:
-        """Update Item based on provided Id and schema.
+    def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
+        """Update provided fields of Item, leaving omitted ones unchanged.
+
+        Row is written only when at least one provided value differs from
+        the stored one.
 
         :param item_id: Id of Item in table to update.
         :type item_id: int
-        :param item: Body of Item to update.
-        :type item: ItemBaseSchema
+        :param item: Fields of Item to update.
+        :type item: ItemPatchSchema
 
-        :returns: Operation result.
+        :returns: Information that Item exists.
         :rtype: bool
         """
 
@@ -85,94 +467,799 @@ class AbstractRepository(ABC):
     def delete_item(self, item_id: int) -> bool:
         """Delete Item based on provided Id.
 
-        :param item_id: Id of Item in table to update.
+        :param item_id: Id of Item in table to delete.
         :type item_id: int
 
-        :returns: Operation result.
+        :returns: Information that Item existed and was deleted.
         :rtype: bool
         """
 
         raise NotImplementedError
 
+    @abstractmethod
+    def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        """Insert Items based on provided schemas in a single statement.
+
+        :param items: Bodies of Items to insert.
+        :type items: list[ItemBaseSchema]
 
+        :returns: Ids of inserted Items in input order.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        """Update Items based on provided schemas in a single statement.
+
+        :param items: Bodies of Items to update with their Ids.
+        :type items: list[ItemBulkUpdateSchema]
+
+        :returns: Ids of updated Items.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_items(self, item_ids: list[int]) -> list[int]:
+        """Delete Items based on provided Ids in a single statement.
+
+        :param item_ids: Ids of Items in table to delete.
+        :type item_ids: list[int]
+
+        :returns: Ids of deleted Items.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ) -> Iterator[list[Row]]:
+        """Stream Items rows in batches with server-side cursor.
+
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param batch_size: Number of rows fetched per batch. Default: 1000.
+        :type batch_size: int
+
+        :returns: Batches of (id, title, description, completed) rows ordered by Id.
+        :rtype: Iterator[list[Row]]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        """Load Items with PostgreSQL COPY and commit them.
+
+        :param items: Bodies of Items to load.
+        :type items: list[ItemBaseSchema]
+
+        :returns: Number of loaded Items.
+        :rtype: int
+        """
+
+        raise NotImplementedError
+
+
+@track_operations
+@trace_operations("repository")
 class PostgreSqlRepository(AbstractRepository):
     """
     Object for PostgreSQL database operations.
 
+    In read-only mode ``get_item`` and ``get_items`` issue Core queries and
+    return rows with Item attributes instead of ORM entities, which skips
+    instance construction and identity map bookkeeping. Rows cannot be
+    modified, so the mode is meant for requests that only read.
+
     :param client_session: Connection session to PostgreSQL database.
     :type client_session: Session
+    :param read_only: Return rows instead of ORM entities from reads. Default: False.
+    :type read_only: bool
     """
 
-    def __init__(self, client_session: Session):
+    def __init__(self, client_session: Session, read_only: bool = False):
         self.session = client_session
+        self.read_only = read_only
 
     def get_item(self, item_id: int) -> Item:
         try:
+            if self.read_only:
+                return self.session.execute(
+                    select_columns().where(Item.id == item_id)
+                ).first()
             return self.session.query(Item).filter(Item.id == item_id).first()
         except Exception as err:
             logging.error(f"Caught error during getting Item(Id {item_id}): {err}")
             raise err
 
+    def lock_item(self, item_id: int) -> Item | None:
+        try:
+            return (
+                self.session.query(Item)
+                .filter(Item.id == item_id)
+                .with_for_update()
+                .first()
+            )
+        except Exception as err:
+            logging.error(f"Caught error during locking Item(Id {item_id}): {err}")
+            raise err
+
     def get_items(
         self,
         limit: int,
         offset: int,
         filter_field: str | None,
         filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
     ) -> list[Item]:
-        def __prepare_query_filters(
-            query: Query,
-            filter_field: str | None,
-            filter_value: str | bool | None,
-        ) -> Query:
-            match filter_field:
-                case "title":
-                    query = query.filter(Item.title.contains(filter_value))
-                case "description":
-                    query = query.filter(Item.description.contains(filter_value))
-                case "completed":
-                    query = query.filter(Item.completed == filter_value)
-            return query
-
         try:
+            if self.read_only:
+                return self.get_item_rows(
+                    limit,
+                    offset,
+                    filter_field,
+                    filter_value,
+                    after_id,
+                    filter_mode,
+                    sort=sort,
+                    after_values=after_values,
+                )
             query = self.session.query(Item)
-            query = __prepare_query_filters(query, filter_field, filter_value)
-            return query.offset(offset).limit(limit).all()
+            clause = prepare_filter_clause(filter_field, filter_value, filter_mode)
+            if clause is not None:
+                query = query.filter(clause)
+            if after_id is not None:
+                query = query.filter(
+                    prepare_keyset_clause(after_id, sort, after_values)
+                )
+            return (
+                query.order_by(*prepare_order_clause(sort))
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
         except Exception as err:
             logging.error(f"Caught error during getting Items: {err}")
             raise err
 
-    def insert_item(self, item: ItemBaseSchema):
+    def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Row]:
+        try:
+            statement = prepare_rows_statement(
+                filter_field, filter_value, filter_mode, columns, sort
+            )
+            if after_id is not None:
+                statement = statement.where(
+                    prepare_keyset_clause(after_id, sort, after_values)
+                )
+            return self.session.execute(statement.offset(offset).limit(limit)).all()
+        except Exception as err:
+            logging.error(f"Caught error during getting Items rows: {err}")
+            raise err
+
+    def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        try:
+            statement = prepare_count_statement(filter_field, filter_value, filter_mode)
+            return {
+                completed: count
+                for completed, count in self.session.execute(statement).all()
+            }
+        except Exception as err:
+            logging.error(f"Caught error during counting Items: {err}")
+            raise err
+
+    def rollup_counts(self) -> None:
         try:
-            db_item = Item(**item.dict())
-            self.session.add(db_item)
+            self.session.execute(prepare_counts_rollup_statement())
             self.session.commit()
-            self.session.refresh(db_item)
-            return True
+        except Exception as err:
+            logging.error(f"Caught error during Items counts rollup: {err}")
+            raise err
+
+    def insert_item(self, item: ItemBaseSchema) -> int:
+        try:
+            statement = insert(Item).values(item.dict()).returning(Item.id)
+            item_id = self.session.execute(statement).scalar_one()
+            self.session.commit()
+            return item_id
         except Exception as err:
             logging.error(f"Caught error during Item upload: {err}")
             raise err
 
-    def update_item(self, item_id: int, item: ItemBaseSchema):
+    def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
         try:
-            self.session.query(Item).filter(Item.id == item_id).update(
-                {
-                    Item.title: item.title,
-                    Item.description: item.description,
-                    Item.completed: item.completed,
-                }
+            changes = item.dict(exclude_unset=True)
+            if changes:
+                statement = (
+                    update(Item)
+                    .where(
+                        Item.id == item_id,
+                        or_(
+                            *(
+                                getattr(Item, field).is_distinct_from(value)
+                                for field, value in changes.items()
+                            )
+                        ),
+                    )
+                    .values(changes)
+                    .returning(Item.id)
+                    .execution_options(synchronize_session=False)
+                )
+                updated = self.session.execute(statement).first()
+                self.session.commit()
+                if updated is not None:
+                    return True
+            return (
+                self.session.execute(select(Item.id).where(Item.id == item_id)).first()
+                is not None
             )
-            self.session.commit()
-            return True
         except Exception as err:
             logging.error(f"Caught error during Item(Id: {item_id}) update: {err}")
             raise err
 
-    def delete_item(self, item_id: int):
+    def delete_item(self, item_id: int) -> bool:
         try:
-            self.session.query(Item).filter(Item.id == item_id).delete()
+            statement = (
+                delete(Item)
+                .where(Item.id == item_id)
+                .returning(Item.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted = self.session.execute(statement).first()
             self.session.commit()
-            return True
+            return deleted is not None
         except Exception as err:
             logging.error(f"Caught error during Item(Id: {item_id}) deletion: {err}")
             raise err
+
+    def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        try:
+            statement = insert(Item).returning(Item.id, sort_by_parameter_order=True)
+            item_ids = (
+                self.session.execute(statement, [item.dict() for item in items])
+                .scalars()
+                .all()
+            )
+            self.session.commit()
+            return item_ids
+        except Exception as err:
+            logging.error(f"Caught error during Items bulk upload: {err}")
+            raise err
+
+    def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        try:
+            payload = values(
+                column("id", Integer),
+                column("title", String),
+                column("description", String),
+                column("completed", Boolean),
+                name="payload",
+            ).data(
+                [
+                    (item.id, item.title, item.description, item.completed)
+                    for item in items
+                ]
+            )
+            statement = (
+                update(Item)
+                .where(Item.id == payload.c.id)
+                .values(
+                    title=payload.c.title,
+                    description=payload.c.description,
+                    completed=payload.c.completed,
+                )
+                .returning(Item.id)
+                .execution_options(synchronize_session=False)
+            )
+            item_ids = self.session.execute(statement).scalars().all()
+            self.session.commit()
+            return item_ids
+        except Exception as err:
+            logging.error(f"Caught error during Items bulk update: {err}")
+            raise err
+
+    def delete_items(self, item_ids: list[int]) -> list[int]:
+        try:
+            statement = (
+                delete(Item)
+                .where(Item.id == any_(literal(item_ids, ARRAY(Integer))))
+                .returning(Item.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_ids = self.session.execute(statement).scalars().all()
+            self.session.commit()
+            return deleted_ids
+        except Exception as err:
+            logging.error(f"Caught error during Items bulk deletion: {err}")
+            raise err
+
+    def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ) -> Iterator[list[Row]]:
+        try:
+            statement = prepare_stream_statement(
+                filter_field, filter_value, filter_mode, batch_size
+            )
+            yield from self.session.execute(statement).partitions()
+        except Exception as err:
+            logging.error(f"Caught error during Items streaming: {err}")
+            raise err
+
+    def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        try:
+            buffer = io.StringIO()
+            # COPY reads unquoted empty CSV field as NULL, quoted one as empty string
+            csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(
+                (item.title, item.description, item.completed) for item in items
+            )
+            cursor = self.session.connection().connection.cursor()
+            cursor.copy_expert(
+                f"COPY {Item.__tablename__} ({', '.join(COPY_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')",
+                io.BytesIO(buffer.getvalue().encode()),
+            )
+            self.session.commit()
+            return len(items)
+        except Exception as err:
+            logging.error(f"Caught error during Items copy: {err}")
+            raise err
+
+
+class AsyncAbstractRepository(ABC):
+    """
+    Base object for asynchronous database operations.
+
+    Methods mirror :class:`AbstractRepository` and are awaited by async services.
+    """
+
+    @abstractmethod
+    async def get_item(self, item_id: int) -> Item:
+        """Retrieve Item based on provided Id.
+
+        :param item_id: Id of Item in table.
+        :type item_id: int
+
+        :returns: Item object.
+        :rtype: Item
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_item(self, item_id: int) -> Item | None:
+        """Retrieve Item and lock its row until the transaction ends.
+
+        :param item_id: Id of Item in table.
+        :type item_id: int
+
+        :returns: Item object or None when Id does not exist.
+        :rtype: Item | None
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_items(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Item]:
+        """Retrieve Items based on provided parameters.
+
+        :param limit: Limit page items size.
+        :type limit: int
+        :param offset: Page number.
+        :type offset: int
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param after_id: Return only Items following Item with provided Id in sort order.
+        :type after_id: int | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+        :type sort: Sequence[tuple[str, str]]
+        :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+        :type after_values: Sequence
+
+        :returns: List of Item objects.
+        :rtype: list[Item]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Row]:
+        """Retrieve Items as rows of provided columns.
+
+        :param limit: Limit page items size.
+        :type limit: int
+        :param offset: Page number.
+        :type offset: int
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param after_id: Return only Items following Item with provided Id in sort order.
+        :type after_id: int | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param columns: Names of selected columns. Default: id, title, description, completed.
+        :type columns: Sequence[str]
+        :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+        :type sort: Sequence[tuple[str, str]]
+        :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+        :type after_values: Sequence
+
+        :returns: List of rows in provided order.
+        :rtype: list[Row]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        """Count Items matching provided filter by completion state.
+
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+
+        :returns: Number of Items keyed by completion state.
+        :rtype: dict[bool, int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rollup_counts(self) -> None:
+        """Replace counter table rows with a single row per completion state."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_item(self, item: ItemBaseSchema) -> int:
+        """Insert Item based on provided schema.
+
+        :param item: Body of Item to insert.
+        :type item: ItemBaseSchema
+
+        :returns: Id of inserted Item.
+        :rtype: int
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
+        """Update provided fields of Item, leaving omitted ones unchanged.
+
+        Row is written only when at least one provided value differs from
+        the stored one.
+
+        :param item_id: Id of Item in table to update.
+        :type item_id: int
+        :param item: Fields of Item to update.
+        :type item: ItemPatchSchema
+
+        :returns: Information that Item exists.
+        :rtype: bool
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_item(self, item_id: int) -> bool:
+        """Delete Item based on provided Id.
+
+        :param item_id: Id of Item in table to delete.
+        :type item_id: int
+
+        :returns: Information that Item existed and was deleted.
+        :rtype: bool
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        """Insert Items based on provided schemas in a single statement.
+
+        :param items: Bodies of Items to insert.
+        :type items: list[ItemBaseSchema]
+
+        :returns: Ids of inserted Items in input order.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        """Update Items based on provided schemas in a single statement.
+
+        :param items: Bodies of Items to update with their Ids.
+        :type items: list[ItemBulkUpdateSchema]
+
+        :returns: Ids of updated Items.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_items(self, item_ids: list[int]) -> list[int]:
+        """Delete Items based on provided Ids in a single statement.
+
+        :param item_ids: Ids of Items in table to delete.
+        :type item_ids: list[int]
+
+        :returns: Ids of deleted Items.
+        :rtype: list[int]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Row]]:
+        """Stream Items rows in batches with server-side cursor.
+
+        :param filter_field: Filtering field name.
+        :type filter_field: str | None
+        :param filter_value: Filter value.
+        :type filter_value: str | bool | None
+        :param filter_mode: Text matching mode. Default: substring.
+        :type filter_mode: FilterMode
+        :param batch_size: Number of rows fetched per batch. Default: 1000.
+        :type batch_size: int
+
+        :returns: Batches of (id, title, description, completed) rows ordered by Id.
+        :rtype: AsyncIterator[list[Row]]
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        """Load Items with PostgreSQL COPY and commit them.
+
+        :param items: Bodies of Items to load.
+        :type items: list[ItemBaseSchema]
+
+        :returns: Number of loaded Items.
+        :rtype: int
+        """
+
+        raise NotImplementedError
+
+
+class AsyncPostgreSqlRepository(AsyncAbstractRepository):
+    """
+    Object for PostgreSQL database asynchronous operations.
+
+    Every operation runs the :class:`PostgreSqlRepository` logic through
+    ``AsyncSession.run_sync``, so both modes issue identical SQL while the
+    asynchronous one awaits the asyncpg driver instead of blocking a thread.
+    Metrics labels and tracing spans come from the synchronous repository.
+
+    :param client_session: Asynchronous connection session to PostgreSQL database.
+    :type client_session: AsyncSession
+    :param read_only: Return rows instead of ORM entities from reads. Default: False.
+    :type read_only: bool
+    """
+
+    def __init__(self, client_session: AsyncSession, read_only: bool = False):
+        self.session = client_session
+        self.read_only = read_only
+
+    async def get_item(self, item_id: int) -> Item:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session, self.read_only).get_item(
+                item_id
+            )
+        )
+
+    async def lock_item(self, item_id: int) -> Item | None:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).lock_item(item_id)
+        )
+
+    async def get_items(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Item]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session, self.read_only).get_items(
+                limit,
+                offset,
+                filter_field,
+                filter_value,
+                after_id,
+                filter_mode,
+                sort,
+                after_values,
+            )
+        )
+
+    async def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Row]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).get_item_rows(
+                limit,
+                offset,
+                filter_field,
+                filter_value,
+                after_id,
+                filter_mode,
+                columns,
+                sort,
+                after_values,
+            )
+        )
+
+    async def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).count_items(
+                filter_field, filter_value, filter_mode
+            )
+        )
+
+    async def rollup_counts(self) -> None:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).rollup_counts()
+        )
+
+    async def insert_item(self, item: ItemBaseSchema) -> int:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).insert_item(item)
+        )
+
+    async def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).update_item(item_id, item)
+        )
+
+    async def delete_item(self, item_id: int) -> bool:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).delete_item(item_id)
+        )
+
+    async def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).insert_items(items)
+        )
+
+    async def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).update_items(items)
+        )
+
+    async def delete_items(self, item_ids: list[int]) -> list[int]:
+        return await self.session.run_sync(
+            lambda session: PostgreSqlRepository(session).delete_items(item_ids)
+        )
+
+    async def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Row]]:
+        try:
+            statement = prepare_stream_statement(
+                filter_field, filter_value, filter_mode, batch_size
+            )
+            result = await self.session.stream(statement)
+            async for partition in result.partitions():
+                yield partition
+        except Exception as err:
+            logging.error(f"Caught error during Items streaming: {err}")
+            raise err
+
+    async def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        try:
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                Item.__tablename__,
+                records=[
+                    (item.title, item.description, item.completed) for item in items
+                ],
+                columns=COPY_COLUMNS,
+            )
+            await self.session.commit()
+            return len(items)
+        except Exception as err:
+            logging.error(f"Caught error during Items copy: {err}")
+            raise err
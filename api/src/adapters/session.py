@@ -2,11 +2,217 @@
 Module contains session and connection logic with database.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from src.adapters.cache import AbstractCache, InMemoryCache, ReadOnlyCache
+from src.adapters.query_log import slow_query_log
 from src.config.settings import settings
+from src.utils import metrics, tracing
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of database engines and their session factories.
+
+    Engines are created once per database URL and shared by every session, so
+    requests borrow connections from a common pool instead of opening new ones.
+    """
+
+    def __init__(self):
+        self.__engines: dict[str, Engine] = {}
+        self.__session_factories: dict[str, sessionmaker] = {}
+        self.__async_engines: dict[str, AsyncEngine] = {}
+        self.__async_session_factories: dict[str, async_sessionmaker] = {}
+        self.__lock = threading.RLock()
+
+    def get_engine(self, url: str) -> Engine:
+        """Retrieve engine for provided database URL, creating it on first use.
+
+        :param url: Database connection URL.
+        :type url: str
+
+        :returns: Shared engine object.
+        :rtype: Engine
+        """
+
+        return self.__get_or_create(
+            self.__engines,
+            url,
+            lambda: self.__instrumented(create_engine(url, **self.__pool_options())),
+        )
+
+    def get_session_factory(self, url: str) -> sessionmaker:
+        """Retrieve session factory bound to engine for provided database URL.
+
+        :param url: Database connection URL.
+        :type url: str
+
+        :returns: Shared session factory.
+        :rtype: sessionmaker
+        """
+
+        return self.__get_or_create(
+            self.__session_factories,
+            url,
+            lambda: sessionmaker(
+                autocommit=False, autoflush=False, bind=self.get_engine(url)
+            ),
+        )
+
+    def get_async_engine(self, url: str) -> AsyncEngine:
+        """Retrieve asynchronous engine for provided database URL, creating it on first use.
+
+        :param url: Database connection URL with asynchronous driver.
+        :type url: str
+
+        :returns: Shared asynchronous engine object.
+        :rtype: AsyncEngine
+        """
+
+        return self.__get_or_create(
+            self.__async_engines,
+            url,
+            lambda: self.__instrumented(
+                create_async_engine(url, **self.__pool_options())
+            ),
+        )
+
+    def get_async_session_factory(self, url: str) -> async_sessionmaker:
+        """Retrieve asynchronous session factory bound to engine for provided database URL.
+
+        :param url: Database connection URL with asynchronous driver.
+        :type url: str
+
+        :returns: Shared asynchronous session factory.
+        :rtype: async_sessionmaker
+        """
+
+        return self.__get_or_create(
+            self.__async_session_factories,
+            url,
+            lambda: async_sessionmaker(
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.get_async_engine(url),
+            ),
+        )
+
+    def checked_out(self, url: str) -> int:
+        """Count connections currently borrowed from pool of provided database URL.
+
+        :param url: Database connection URL.
+        :type url: str
+
+        :returns: Number of checked out connections, 0 when engine was not created yet.
+        :rtype: int
+        """
+
+        engine = self.__engines.get(url)
+        if engine is None and (async_engine := self.__async_engines.get(url)):
+            engine = async_engine.sync_engine
+        return engine.pool.checkedout() if engine is not None else 0
+
+    def pool_status(self) -> dict[str, tuple[int, int]]:
+        """Read connection pool usage of every engine.
+
+        :returns: Checked out and overflow connection counts keyed by database address without credentials.
+        :rtype: dict[str, tuple[int, int]]
+        """
+
+        engines = list(self.__engines.values()) + [
+            engine.sync_engine for engine in self.__async_engines.values()
+        ]
+        status = {}
+        for engine in engines:
+            url, pool = engine.url, engine.pool
+            checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+            overflow = max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0
+            status[f"{url.drivername}://{url.host}:{url.port}/{url.database}"] = (
+                checked_out,
+                overflow,
+            )
+        return status
+
+    def dispose(self):
+        """
+        Close all pooled connections of synchronous engines and forget them.
+        """
+
+        with self.__lock:
+            for engine in self.__engines.values():
+                engine.dispose()
+            self.__engines.clear()
+            self.__session_factories.clear()
+
+    async def async_dispose(self):
+        """
+        Close all pooled connections of asynchronous engines and forget them.
+        """
+
+        with self.__lock:
+            engines = list(self.__async_engines.values())
+            self.__async_engines.clear()
+            self.__async_session_factories.clear()
+        for engine in engines:
+            await engine.dispose()
+
+    def __get_or_create(self, store: dict, url: str, factory):
+        value = store.get(url)
+        if value is None:
+            with self.__lock:
+                value = store.get(url)
+                if value is None:
+                    value = factory()
+                    store[url] = value
+        return value
+
+    @staticmethod
+    def __instrumented(engine: Engine | AsyncEngine) -> Engine | AsyncEngine:
+        sync_engine = getattr(engine, "sync_engine", engine)
+        if metrics.registry.enabled:
+            metrics.instrument_engine(sync_engine)
+        if tracing.tracer.enabled:
+            tracing.instrument_engine(sync_engine)
+        if slow_query_log.enabled:
+            slow_query_log.instrument(sync_engine)
+        return engine
+
+    @staticmethod
+    def __pool_options() -> dict:
+        return {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+            "pool_timeout": settings.db_pool_timeout,
+        }
+
+
+engine_registry = EngineRegistry()
+
+metrics.registry.gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently borrowed from pool.",
+    ("database",),
+    lambda: {
+        (database,): checked_out
+        for database, (checked_out, _) in engine_registry.pool_status().items()
+    },
+)
+metrics.registry.gauge(
+    "db_pool_overflow_connections",
+    "Connections opened above pool size.",
+    ("database",),
+    lambda: {
+        (database,): overflow
+        for database, (_, overflow) in engine_registry.pool_status().items()
+    },
+)
 
 
 class AbstractSession(ABC):
@@ -26,27 +232,203 @@ class AbstractSession(ABC):
 class PostgreSqlSession(AbstractSession):
     """
     Object for PostgreSQL database session creation.
+
+    :param registry: Registry providing shared engines. Default: process-wide registry.
+    :type registry: EngineRegistry
+    :param host: Database host, optionally with port, e.g. replica:5432. Default: None, primary host.
+    :type host: str | None
     """
 
-    def __init__(self):
+    def __init__(
+        self, registry: EngineRegistry = engine_registry, host: str | None = None
+    ):
         self.username = settings.db_user
         self.password = settings.db_password
         self.host = settings.db_host
         self.port = settings.db_port
+        if host is not None:
+            self.host, _, port = host.partition(":")
+            self.port = int(port) if port else settings.db_port
         self.db_name = settings.db_name
-        self.__engine = self.__create_enginge()
+        self.replica = host is not None
+        self.__registry = registry
         self.session = None
 
+    @property
+    def url(self) -> str:
+        """
+        PostgreSQL connection URL.
+        """
+
+        return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.db_name}"
+
     def create_session(self):
         try:
-            self.session = sessionmaker(
-                autocommit=False, autoflush=False, bind=self.__engine
-            )
+            self.session = self.__registry.get_session_factory(self.url)
             return self.session()
         except Exception as err:
             raise err
 
-    def __create_enginge(self):
-        return create_engine(
-            f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.db_name}"
-        )
+
+class AsyncPostgreSqlSession(PostgreSqlSession):
+    """
+    Object for PostgreSQL database asynchronous session creation with asyncpg driver.
+
+    :param registry: Registry providing shared engines. Default: process-wide registry.
+    :type registry: EngineRegistry
+    :param host: Database host, optionally with port, e.g. replica:5432. Default: None, primary host.
+    :type host: str | None
+    """
+
+    def __init__(
+        self, registry: EngineRegistry = engine_registry, host: str | None = None
+    ):
+        super().__init__(registry, host)
+        self.__registry = registry
+
+    @property
+    def url(self) -> str:
+        """
+        PostgreSQL connection URL with asyncpg driver.
+        """
+
+        return super().url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    def create_session(self):
+        try:
+            self.session = self.__registry.get_async_session_factory(self.url)
+            return self.session()
+        except Exception as err:
+            raise err
+
+
+class ReplicaRouter:
+    """
+    ReplicaRouter object selects database serving read-only Units of Work.
+
+    Reads are spread over replica hosts either in turn (``round_robin``) or to
+    the replica with the fewest connections borrowed from its pool
+    (``least_connections``). A client that wrote recently reads from the
+    primary until ``sticky_window`` seconds pass, so it always sees its own
+    writes despite replication lag. Within the same window after any write,
+    replica reads do not fill shared caches, which would otherwise keep
+    stale data under the generation started by the write. Recent writers and
+    the last write time are kept in process memory, so with several workers
+    a client that wrote through one worker may read stale data from a replica
+    through another.
+
+    :param hosts: Replica hosts, optionally with port, e.g. replica:5432.
+    :type hosts: list[str]
+    :param strategy: Replica selection strategy, round_robin or least_connections. Default: round_robin.
+    :type strategy: str
+    :param sticky_window: Seconds after a write during which client reads from primary. Default: 5.
+    :type sticky_window: float
+    :param max_clients: Maximum number of recent writers remembered. Default: 10000.
+    :type max_clients: int
+    :param registry: Registry providing shared engines. Default: process-wide registry.
+    :type registry: EngineRegistry
+    """
+
+    STRATEGIES = ("round_robin", "least_connections")
+
+    def __init__(
+        self,
+        hosts: list[str],
+        strategy: str = "round_robin",
+        sticky_window: float = 5,
+        max_clients: int = 10000,
+        registry: EngineRegistry = engine_registry,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.hosts = hosts
+        self.strategy = strategy
+        self.sticky_window = sticky_window
+        self.__registry = registry
+        self.__writers = InMemoryCache(max_clients, sticky_window)
+        self.__last_write = None
+        self.__next = 0
+        self.__lock = threading.Lock()
+
+    def read_session(
+        self, session_class: type[PostgreSqlSession], client: str | None = None
+    ) -> PostgreSqlSession:
+        """Prepare session provider for read-only Unit of Work.
+
+        :param session_class: Session provider class matching database driver mode.
+        :type session_class: type[PostgreSqlSession]
+        :param client: Client identifier used for read-your-writes stickiness. Default: None.
+        :type client: str | None
+
+        :returns: Session provider bound to selected replica or to primary.
+        :rtype: PostgreSqlSession
+        """
+
+        if not self.hosts or self.is_sticky(client):
+            return session_class(self.__registry)
+        if self.strategy == "least_connections":
+            sessions = [session_class(self.__registry, host) for host in self.hosts]
+            return min(
+                sessions, key=lambda session: self.__registry.checked_out(session.url)
+            )
+        with self.__lock:
+            host = self.hosts[self.__next % len(self.hosts)]
+            self.__next += 1
+        return session_class(self.__registry, host)
+
+    def record_write(self, client: str | None):
+        """Route reads of client to primary for sticky window.
+
+        :param client: Client identifier.
+        :type client: str | None
+        """
+
+        if self.hosts and self.sticky_window > 0:
+            self.__last_write = time.monotonic()
+            if client is not None:
+                self.__writers.set(client, True)
+
+    def is_sticky(self, client: str | None) -> bool:
+        """Check whether client wrote within sticky window.
+
+        :param client: Client identifier.
+        :type client: str | None
+
+        :returns: Information that client reads from primary.
+        :rtype: bool
+        """
+
+        return client is not None and self.__writers.get(client) is not None
+
+    def read_cache(
+        self, cache: AbstractCache | None, session: PostgreSqlSession
+    ) -> AbstractCache | None:
+        """Prepare cache for read-only Unit of Work.
+
+        Replica reads within sticky window of the last write may see data
+        older than that write, so they only look entries up.
+
+        :param cache: Shared cache.
+        :type cache: AbstractCache | None
+        :param session: Session provider selected by :meth:`read_session`.
+        :type session: PostgreSqlSession
+
+        :returns: Shared cache, or view of it which does not store values.
+        :rtype: AbstractCache | None
+        """
+
+        if (
+            cache is None
+            or not session.replica
+            or self.__last_write is None
+            or time.monotonic() - self.__last_write >= self.sticky_window
+        ):
+            return cache
+        return ReadOnlyCache(cache)
+
+
+replica_router = ReplicaRouter(
+    settings.db_replica_hosts,
+    settings.db_replica_strategy,
+    settings.db_read_your_writes_window,
+)
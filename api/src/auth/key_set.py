@@ -0,0 +1,145 @@
+"""
+Module to load JSON Web Key Set used for asymmetric JWT token signing.
+
+Keys are read from a local JWKS file once and kept in memory. The file is
+re-read when its modification time changes, so keys can be rotated without
+restart: every key present in the file verifies tokens, while only the key
+selected for signing issues new ones.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from jwt import PyJWK
+from src.utils.exceptions import KeySetError
+
+
+class JsonWebKeySet:
+    """
+    JsonWebKeySet object caches keys of local JWKS file and reloads them on change.
+
+    :param path: Path to JWKS file.
+    :type path: str
+    :param default_algorithm: Algorithm of keys without ``alg`` member.
+    :type default_algorithm: str
+    :param reload_interval: Minimum number of seconds between file change checks. Default: 5.
+    :type reload_interval: float
+    :param on_reload: Callback executed after keys were reloaded. Default: None.
+    :type on_reload: Callable | None
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_algorithm: str,
+        reload_interval: float = 5,
+        on_reload: Callable[[], None] | None = None,
+    ):
+        self.path = path
+        self.default_algorithm = default_algorithm
+        self.reload_interval = reload_interval
+        self.on_reload = on_reload
+        self.__keys: dict[str, PyJWK] = {}
+        self.__modified = None
+        self.__checked = float("-inf")
+        self.__lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Reload keys when file changed since last check, at most once per reload interval.
+        """
+
+        self.__current_keys()
+
+    def get_key(self, kid: str) -> PyJWK:
+        """Retrieve key by its identifier.
+
+        :param kid: Key identifier from JWT token header.
+        :type kid: str
+        :returns: Key object.
+        :rtype: PyJWK
+        """
+
+        key = self.__current_keys().get(kid)
+        if key is None:
+            raise KeySetError(f"Unknown key id: {kid}")
+        return key
+
+    def get_signing_key(self, kid: str | None = None) -> PyJWK:
+        """Retrieve private key used to sign new tokens.
+
+        :param kid: Key identifier. Default: None, first private key in file.
+        :type kid: str | None
+        :returns: Key object.
+        :rtype: PyJWK
+        """
+
+        keys = self.__current_keys()
+        if kid is not None:
+            key = keys.get(kid)
+        else:
+            key = next((key for key in keys.values() if is_private(key)), None)
+        if key is None or not is_private(key):
+            raise KeySetError("Signing key not found in key set")
+        return key
+
+    def __current_keys(self) -> dict[str, PyJWK]:
+        now = time.monotonic()
+        if now - self.__checked >= self.reload_interval:
+            with self.__lock:
+                if now - self.__checked >= self.reload_interval:
+                    self.__reload_if_modified()
+                    self.__checked = now
+        return self.__keys
+
+    def __reload_if_modified(self):
+        try:
+            modified = os.stat(self.path).st_mtime_ns
+            if modified == self.__modified:
+                return
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+            keys = {}
+            for jwk in data["keys"]:
+                if "kid" not in jwk:
+                    logging.error("Skipped JWKS key without kid member.")
+                    continue
+                keys[jwk["kid"]] = PyJWK(
+                    jwk, algorithm=jwk.get("alg", self.default_algorithm)
+                )
+        except Exception as err:
+            logging.error(f"Caught exception during JWKS loading: {err}")
+            if not self.__keys:
+                raise KeySetError("JWKS file cannot be loaded") from err
+            return
+        self.__keys, self.__modified = keys, modified
+        if self.on_reload is not None:
+            self.on_reload()
+
+
+def is_private(key: PyJWK) -> bool:
+    """Check whether key can sign tokens.
+
+    :param key: Key object.
+    :type key: PyJWK
+    :returns: Information that key holds private part.
+    :rtype: bool
+    """
+
+    return hasattr(key.key, "sign")
+
+
+def verification_key(key: PyJWK):
+    """Retrieve public part of key used to verify tokens.
+
+    :param key: Key object.
+    :type key: PyJWK
+    :returns: Public key object.
+    :rtype: Any
+    """
+
+    return key.key.public_key() if is_private(key) else key.key
@@ -5,16 +5,19 @@ This module creates JWT token and verify token.
 """
 
 import logging
+import time
 
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from src.auth.token_handler import decode_token
+from src.auth.token_handler import decode_token_cached
 from src.utils.exceptions import (
     InvalidTokenError,
     TokenAuthenticationCodeError,
     TokenAuthenticationSchemaError,
     TokenDecodingError,
 )
+from src.utils.metrics import auth_duration
+from src.utils.tracing import tracer
 
 
 class JWTToken(HTTPBearer):
@@ -26,16 +29,17 @@ class JWTToken(HTTPBearer):
         super(JWTToken, self).__init__(auto_error=auto_error)
 
     async def __call__(self, request: Request):
-        credentials: HTTPAuthorizationCredentials = await super(
-            JWTToken, self
-        ).__call__(request)
-        if credentials:
-            if not credentials.scheme == "Bearer":
-                raise TokenAuthenticationSchemaError
-            if not self.verify_token(credentials.credentials):
-                raise InvalidTokenError
-        else:
-            raise TokenAuthenticationCodeError
+        with tracer.start_as_current_span("auth"):
+            credentials: HTTPAuthorizationCredentials = await super(
+                JWTToken, self
+            ).__call__(request)
+            if credentials:
+                if not credentials.scheme == "Bearer":
+                    raise TokenAuthenticationSchemaError
+                if not self.verify_token(credentials.credentials):
+                    raise InvalidTokenError
+            else:
+                raise TokenAuthenticationCodeError
 
     def verify_token(self, token: str) -> bool:
         """Verify JWT token.
@@ -47,8 +51,9 @@ class JWTToken(HTTPBearer):
         """
 
         is_token_valid = False
+        started = time.perf_counter()
         try:
-            payload = decode_token(token)
+            payload = decode_token_cached(token)
         except TokenDecodingError:
             payload = None
         except Exception as err:
@@ -57,4 +62,7 @@ class JWTToken(HTTPBearer):
 
         if payload:
             is_token_valid = True
+        auth_duration.observe(
+            time.perf_counter() - started, "valid" if is_token_valid else "invalid"
+        )
         return is_token_valid
@@ -4,12 +4,32 @@ Module to handle JWT token.
 This module handles JWT token operations like JWT token creation and token decoding.
 """
 
+import hashlib
 import logging
 import time
 
 import jwt
+from src.adapters.cache import InMemoryCache
+from src.auth.key_set import JsonWebKeySet, verification_key
 from src.utils.exceptions import TokenDecodingError
-from src.config.settings import settings
+from src.config.settings import ASYMMETRIC_ALGORITHMS, settings
+
+verified_tokens = (
+    InMemoryCache(settings.token_cache_max_size, settings.jwt_token_expiration)
+    if settings.token_cache_max_size
+    else None
+)
+
+key_set = (
+    JsonWebKeySet(
+        settings.jwt_jwks_path,
+        settings.jwt_algorithm,
+        settings.jwt_jwks_reload_interval,
+        on_reload=verified_tokens.clear if verified_tokens is not None else None,
+    )
+    if settings.jwt_algorithm in ASYMMETRIC_ALGORITHMS
+    else None
+)
 
 
 def token_response(token: str) -> dict[str, str]:
@@ -33,7 +53,18 @@ def create_token() -> dict[str, str]:
 
     payload = {"expires": time.time() + settings.jwt_token_expiration}
 
-    token = jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    if key_set is not None:
+        signing_key = key_set.get_signing_key(settings.jwt_signing_kid)
+        token = jwt.encode(
+            payload,
+            signing_key.key,
+            algorithm=settings.jwt_algorithm,
+            headers={"kid": signing_key.key_id},
+        )
+    else:
+        token = jwt.encode(
+            payload, settings.jwt_secret, algorithm=settings.jwt_algorithm
+        )
     return token_response(token)
 
 
@@ -46,10 +77,39 @@ def decode_token(token: str) -> dict[str, str]:
     :rtype: dict
     """
     try:
-        decoded_token = jwt.decode(
-            token, settings.jwt_secret, algorithms=[settings.jwt_algorithm]
-        )
+        if key_set is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = verification_key(key_set.get_key(kid))
+        else:
+            key = settings.jwt_secret
+        decoded_token = jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
         return decoded_token if decoded_token["expires"] >= time.time() else None
     except Exception as err:
         logging.error(f"Caught exception during JWT token decoding: {err}")
         raise TokenDecodingError from err
+
+
+def decode_token_cached(token: str) -> dict[str, str]:
+    """Decode JWT token, reusing result of previous verification of the same token.
+
+    Verified payloads are cached by token digest until the token expires, so
+    the signature is checked once per token instead of once per request.
+    Reloading key set clears the cache, so tokens of removed keys stop verifying.
+
+    :param token: JWT token.
+    :type token: str
+    :returns: Decoded JWT token.
+    :rtype: dict
+    """
+
+    if verified_tokens is None:
+        return decode_token(token)
+    if key_set is not None:
+        key_set.refresh()
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = verified_tokens.get(key)
+    if payload is None:
+        payload = decode_token(token)
+        if payload:
+            verified_tokens.set(key, payload, ttl=payload["expires"] - time.time())
+    return payload
@@ -5,6 +5,7 @@ This module creates connection with Azure Key Vault and retrieve secrets.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
@@ -38,6 +39,7 @@ class AzureVault:
         :returns: Azure Key Vault secret value.
         :rtype: str
         """
+
         try:
             return self.secret_client.get_secret(secret_name).value
         except Exception as err:
@@ -45,3 +47,24 @@ class AzureVault:
                 f"Caught exception during getting secret value from Azure Key Vault: {err}"
             )
             raise SecretError from err
+
+    def get_secrets(self, secret_names: list[str], max_workers: int = 8) -> dict:
+        """Retrieve secret values from Azure Key Vault concurrently.
+
+        Each secret is a separate HTTPS round trip, so secrets are fetched by
+        a thread pool instead of one after another.
+
+        :param secret_names: Azure Key Vault secret names.
+        :type secret_names: list[str]
+        :param max_workers: Maximum number of concurrent requests. Default: 8.
+        :type max_workers: int
+        :returns: Azure Key Vault secret values keyed by secret name.
+        :rtype: dict[str, str]
+        """
+
+        if not secret_names:
+            return {}
+        workers = min(len(secret_names), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            values = executor.map(self.get_secret, secret_names)
+            return dict(zip(secret_names, values))
@@ -0,0 +1,77 @@
+"""
+Module contains encrypted on-disk cache of Azure Key Vault secrets.
+
+Secrets are stored as a single Fernet token, which carries its creation
+time, so cached secrets expire after time to live without extra metadata.
+Restarted workers read secrets from the cache instead of Azure Key Vault.
+"""
+
+import json
+import logging
+import os
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+
+class SecretCache:
+    """
+    SecretCache object keeps Azure Key Vault secrets in an encrypted file.
+
+    :param path: Path to cache file.
+    :type path: str
+    :param key: Fernet key, urlsafe base64 encoded 32 bytes, see ``Fernet.generate_key``.
+    :type key: str | bytes
+    :param ttl: Cached secrets time to live in seconds. Default: 3600.
+    :type ttl: int
+    """
+
+    def __init__(self, path: str, key: str | bytes, ttl: int = 3600):
+        self.path = path
+        self.ttl = ttl
+        self.__fernet = Fernet(key)
+
+    def load(self, secret_names: list[str]) -> dict | None:
+        """Read secrets from cache file.
+
+        :param secret_names: Secret names which must be cached.
+        :type secret_names: list[str]
+        :returns: Secret values keyed by secret name, None when cache file is
+            missing, expired, unreadable or does not hold every secret.
+        :rtype: dict[str, str] | None
+        """
+
+        try:
+            with open(self.path, "rb") as file:
+                token = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            secrets = json.loads(
+                self.__fernet.decrypt_at_time(token, self.ttl, int(time.time()))
+            )
+        except (InvalidToken, ValueError) as err:
+            logging.warning(f"Caught exception during reading secret cache: {err!r}")
+            return None
+        if not set(secret_names) <= secrets.keys():
+            return None
+        return {name: secrets[name] for name in secret_names}
+
+    def save(self, secrets: dict):
+        """Write secrets to cache file readable only by its owner.
+
+        File is replaced atomically, so concurrently starting workers never
+        read partially written cache.
+
+        :param secrets: Secret values keyed by secret name.
+        :type secrets: dict[str, str]
+        """
+
+        token = self.__fernet.encrypt(json.dumps(secrets).encode())
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        descriptor = os.open(
+            temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(token)
+        os.replace(temporary_path, self.path)
@@ -1,26 +1,42 @@
 """
 Module to create base API configuration.
 
-This module creates Settings object with API configuration
+This module creates Settings object with API configuration. Settings are
+resolved on first access, so importing this module neither reads environment
+variables nor loads Azure SDK, which is imported only for cloud credentials.
+Application modules access settings at import, e.g. ORM models for table name
+and cache, metrics and tracing singletons, so importing the application still
+prepares settings, including Key Vault fetch for cloud credentials.
 """
 
+import functools
 import json
 import os
 
-from pydantic import BaseSettings
-from src.azure.key_vault import AzureVault
+from pydantic import BaseSettings, root_validator, validator
+
+HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA")
 
 
 class Settings(BaseSettings):
     """
     Settings object creates API configuration based on environment variables.
 
-    :param jwt_secret: JWT token encoding secret.
-    :type jwt_secret: str
-    :param jwt_algorithm: JWT token encoding and decoding algorithm. Default: HS256.
+    :param jwt_secret: JWT token encoding secret, required by HMAC algorithms. Default: None.
+    :type jwt_secret: str | None
+    :param jwt_algorithm: JWT token encoding and decoding algorithm, one of HMAC_ALGORITHMS or ASYMMETRIC_ALGORITHMS. Default: HS256.
     :type jwt_algorithm: str
+    :param jwt_jwks_path: Path to JWKS file with keys of asymmetric algorithms. Default: None.
+    :type jwt_jwks_path: str | None
+    :param jwt_jwks_reload_interval: Seconds between JWKS file change checks. Default: 5.
+    :type jwt_jwks_reload_interval: float
+    :param jwt_signing_kid: Id of JWKS key signing new tokens. Default: None, first private key.
+    :type jwt_signing_kid: str | None
     :param jwt_token_expiration: JWT token expiration time in seconds. Default: 600.
     :type jwt_token_expiration: int
+    :param token_cache_max_size: Maximum number of verified JWT tokens kept in memory, 0 disables cache. Default: 10000.
+    :type token_cache_max_size: int
     :param db_user: Database user name.
     :type db_user: str
     :param db_password: Database user password.
@@ -31,17 +47,173 @@ class Settings(BaseSettings):
     :type db_port: int
     :param db_name: Database name.
     :type db_name: str
+    :param db_table_name: Database table name. Default: items.
+    :type db_table_name: str
+    :param db_pool_size: Number of connections kept open in the pool. Default: 5.
+    :type db_pool_size: int
+    :param db_max_overflow: Number of connections allowed above pool size. Default: 10.
+    :type db_max_overflow: int
+    :param db_pool_recycle: Connection lifetime in seconds before it is recycled. Default: 1800.
+    :type db_pool_recycle: int
+    :param db_pool_pre_ping: Test connections for liveness on checkout. Default: True.
+    :type db_pool_pre_ping: bool
+    :param db_pool_timeout: Seconds to wait for a free connection from the pool. Default: 30.
+    :type db_pool_timeout: int
+    :param db_async_mode: Serve requests with asyncpg driver instead of psycopg2. Default: False.
+    :type db_async_mode: bool
+    :param db_replica_hosts: Read replica hosts, optionally with port, serving read-only requests. Default: [], primary only.
+    :type db_replica_hosts: list[str]
+    :param db_replica_strategy: Replica selection strategy, round_robin or least_connections. Default: round_robin.
+    :type db_replica_strategy: str
+    :param db_read_your_writes_window: Seconds after a write during which client reads from primary, tracked per worker process. Default: 5.
+    :type db_read_your_writes_window: float
+    :param bulk_max_batch_size: Maximum number of Items in a single bulk request. Default: 1000.
+    :type bulk_max_batch_size: int
+    :param export_batch_size: Number of rows fetched and serialized per export chunk. Default: 1000.
+    :type export_batch_size: int
+    :param import_batch_size: Number of uploaded Items loaded per COPY statement. Default: 5000.
+    :type import_batch_size: int
+    :param item_cache_backend: Item cache backend, one of memory, redis or none. Default: memory.
+    :type item_cache_backend: str
+    :param item_cache_max_size: Maximum number of Items kept by in-memory cache. Default: 10000.
+    :type item_cache_max_size: int
+    :param item_cache_ttl: Cached Item time to live in seconds. Default: 30.
+    :type item_cache_ttl: int
+    :param list_cache_backend: Items list cache backend, one of memory, redis or none. Memory backend keeps generations per worker process. Default: memory.
+    :type list_cache_backend: str
+    :param list_cache_max_size: Maximum number of Items pages kept by in-memory cache. Default: 1000.
+    :type list_cache_max_size: int
+    :param list_cache_max_page_size: Pages with more Items than this are not cached. Default: 500.
+    :type list_cache_max_page_size: int
+    :param list_cache_ttl: Cached Items page time to live in seconds. Default: 10.
+    :type list_cache_ttl: int
+    :param redis_url: Redis connection URL used by redis cache backend. Default: None.
+    :type redis_url: str | None
+    :param fast_json: Serve Items pages from column rows serialized with orjson. Default: False.
+    :type fast_json: bool
+    :param metrics_enabled: Collect request, database and authentication metrics served by /metrics endpoint. Default: False.
+    :type metrics_enabled: bool
+    :param tracing_exporter: Span exporter, one of none, memory or opentelemetry. Default: none, tracing disabled.
+    :type tracing_exporter: str
+    :param slow_query_threshold: Statements running longer than this number of seconds are logged. Default: None, slow query log disabled.
+    :type slow_query_threshold: float | None
+    :param slow_query_explain_rate: Fraction of slow SELECT statements re-run with EXPLAIN (ANALYZE, BUFFERS). Default: 0.
+    :type slow_query_explain_rate: float
+    :param slow_query_top_size: Number of slowest statements kept for admin endpoint. Default: 50.
+    :type slow_query_top_size: int
+    :param secret_refresh_interval: Seconds between Azure Key Vault secrets refreshes picking up rotated secrets. Default: None, refresh disabled.
+    :type secret_refresh_interval: float | None
+    :param counts_rollup_interval: Seconds between rollups of Items counter rows appended by writes. Default: 60, None disables rollup.
+    :type counts_rollup_interval: float | None
     """
 
-    jwt_secret: str
+    jwt_secret: str | None = None
     jwt_algorithm: str = "HS256"
+    jwt_jwks_path: str | None = None
+    jwt_jwks_reload_interval: float = 5
+    jwt_signing_kid: str | None = None
     jwt_token_expiration: int = 600
+    token_cache_max_size: int = 10000
     db_user: str
     db_password: str
     db_host: str
     db_port: int
     db_name: str
     db_table_name: str = "items"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_timeout: int = 30
+    db_async_mode: bool = False
+    db_replica_hosts: list[str] = []
+    db_replica_strategy: str = "round_robin"
+    db_read_your_writes_window: float = 5
+    bulk_max_batch_size: int = 1000
+    export_batch_size: int = 1000
+    import_batch_size: int = 5000
+    item_cache_backend: str = "memory"
+    item_cache_max_size: int = 10000
+    item_cache_ttl: int = 30
+    list_cache_backend: str = "memory"
+    list_cache_max_size: int = 1000
+    list_cache_max_page_size: int = 500
+    list_cache_ttl: int = 10
+    redis_url: str | None = None
+    fast_json: bool = False
+    metrics_enabled: bool = False
+    tracing_exporter: str = "none"
+    slow_query_threshold: float | None = None
+    slow_query_explain_rate: float = 0
+    slow_query_top_size: int = 50
+    secret_refresh_interval: float | None = None
+    counts_rollup_interval: float | None = 60
+
+    @validator("jwt_algorithm")
+    def check_jwt_algorithm(cls, value: str) -> str:
+        """Check that JWT algorithm is supported.
+
+        :param value: JWT algorithm name.
+        :type value: str
+        :returns: JWT algorithm name.
+        :rtype: str
+        """
+
+        if value not in HMAC_ALGORITHMS + ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported jwt_algorithm: {value}")
+        return value
+
+    @root_validator(skip_on_failure=True)
+    def check_jwt_keys(cls, values: dict) -> dict:
+        """Check that key material matching JWT algorithm is configured.
+
+        :param values: Settings values.
+        :type values: dict
+        :returns: Settings values.
+        :rtype: dict
+        """
+
+        if values["jwt_algorithm"] in HMAC_ALGORITHMS:
+            if not values["jwt_secret"]:
+                raise ValueError("jwt_secret is required by HMAC algorithms")
+        elif not values["jwt_jwks_path"]:
+            raise ValueError("jwt_jwks_path is required by asymmetric algorithms")
+        return values
+
+
+def load_secrets(use_cache: bool = True) -> dict:
+    """Retrieve secrets listed in ``azure_secrets`` from Azure Key Vault.
+
+    Secrets are fetched concurrently. When ``secret_cache_path`` is set,
+    fetched secrets are written to a cache file encrypted with
+    ``secret_cache_key`` and reused until ``secret_cache_ttl`` seconds pass.
+
+    :param use_cache: Read secrets from cache file when it is fresh. Default: True.
+    :type use_cache: bool
+    :returns: Settings values keyed by field name.
+    :rtype: dict[str, str]
+    """
+
+    from src.azure.key_vault import AzureVault
+    from src.azure.secret_cache import SecretCache
+
+    secret_names = json.loads(os.environ.get("azure_secrets"))
+    cache = None
+    if cache_path := os.environ.get("secret_cache_path"):
+        if not (cache_key := os.environ.get("secret_cache_key")):
+            raise ValueError("secret_cache_key is required by secret cache")
+        cache = SecretCache(
+            cache_path, cache_key, int(os.environ.get("secret_cache_ttl", 3600))
+        )
+    secrets = cache.load(secret_names) if cache and use_cache else None
+    if secrets is None:
+        key_vault = AzureVault(os.environ.get("key_vault_url"))
+        secrets = key_vault.get_secrets(
+            secret_names, int(os.environ.get("key_vault_max_workers", 8))
+        )
+        if cache:
+            cache.save(secrets)
+    return {name.replace("-", "_"): value for name, value in secrets.items()}
 
 
 def prepare_settings() -> Settings:
@@ -55,15 +227,60 @@ def prepare_settings() -> Settings:
 
     credential_type = os.environ.get("credential_type")
     if credential_type == "cloud":
-        key_vault = AzureVault(os.environ.get("key_vault_url"))
-        secrets = json.loads(os.environ.get("azure_secrets"))
-        return Settings(
-            **{
-                secret.replace("-", "_"): key_vault.get_secret(secret)
-                for secret in secrets
-            }
-        )
+        return Settings(**load_secrets())
     return Settings()
 
 
-settings = prepare_settings()
+def refresh_settings() -> set[str]:
+    """Fetch Azure Key Vault secrets again and apply rotated values to settings.
+
+    :returns: Names of settings fields whose values changed.
+    :rtype: set[str]
+    """
+
+    if os.environ.get("credential_type") != "cloud":
+        return set()
+    secrets = load_secrets(use_cache=False)
+    fresh, current = Settings(**secrets), get_settings()
+    changed = {
+        name for name in secrets if getattr(fresh, name) != getattr(current, name)
+    }
+    for name in changed:
+        setattr(current, name, getattr(fresh, name))
+    return changed
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Retrieve base API configuration, prepared once on first call.
+
+    :returns: Base API configuration.
+    :rtype: Settings
+    """
+
+    return prepare_settings()
+
+
+class LazySettings:
+    """
+    LazySettings object forwards attribute access to Settings object
+    retrieved by ``get_settings`` on first use.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+settings = LazySettings()
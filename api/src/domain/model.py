@@ -2,17 +2,28 @@
 Module stores ORM models.
 """
 
-from sqlalchemy import Boolean, Column, Integer, String
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import BigInteger, Boolean, Column, Computed, Index, Integer, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import declarative_base, deferred
 from src.config.settings import settings
 
 Base = declarative_base()
 
+TEXT_SEARCH_CONFIG = "english"
+
+ITEM_COLUMNS = ("id", "title", "description", "completed")
+
+DEFAULT_SORT = (("id", "asc"),)
+
 
 class Item(Base):
     """
     Item object creates ORM model for record in Items table.
 
+    Composite indexes of each sortable column followed by id serve sorted
+    pages with index scans, in either direction. Sortable columns are not
+    nullable, so next page is sought by row comparison on the index.
+
     :param id: Id column record value. Id column is primary key.
     :type id: Column
     :param title: Title column record value.
@@ -21,11 +32,84 @@ class Item(Base):
     :type description: Column
     :param completed: Completed column record value.
     :type completed: Column
+    :param title_search: Generated full-text search vector of title. Loaded on demand.
+    :type title_search: Column
+    :param description_search: Generated full-text search vector of description. Loaded on demand.
+    :type description_search: Column
     """
 
     __tablename__ = settings.db_table_name
+    __table_args__ = (
+        Index(f"ix_{settings.db_table_name}_completed_id", "completed", "id"),
+        Index(f"ix_{settings.db_table_name}_title_id", "title", "id"),
+        Index(f"ix_{settings.db_table_name}_description_id", "description", "id"),
+        Index(
+            f"ix_{settings.db_table_name}_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            f"ix_{settings.db_table_name}_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        Index(
+            f"ix_{settings.db_table_name}_title_search",
+            "title_search",
+            postgresql_using="gin",
+        ),
+        Index(
+            f"ix_{settings.db_table_name}_description_search",
+            "description_search",
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
-    description = Column(String, index=True)
-    completed = Column(Boolean, index=True, default=False)
+    title = Column(String(50), nullable=False)
+    description = Column(String(255), nullable=False)
+    completed = Column(Boolean, nullable=False, default=False)
+    title_search = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(title, ''))",
+                persisted=True,
+            ),
+        )
+    )
+    description_search = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(description, ''))",
+                persisted=True,
+            ),
+        )
+    )
+
+
+class ItemCount(Base):
+    """
+    ItemCount object creates ORM model for change of number of Items by completion state.
+
+    Statement-level triggers on Items table append one row per changed state,
+    see ``sql/prepare_data.sql``, so concurrent writers never update the same
+    counter row. Counts are sums of rows per state, which are periodically
+    rolled up into a single row each, so reads stay constant time.
+
+    :param id: Id column record value. Id column is primary key.
+    :type id: Column
+    :param completed: Completion state.
+    :type completed: Column
+    :param count: Change of number of Items in completion state.
+    :type count: Column
+    """
+
+    __tablename__ = f"{settings.db_table_name}_counts"
+
+    id = Column(BigInteger, primary_key=True)
+    completed = Column(Boolean, nullable=False)
+    count = Column(BigInteger, nullable=False)
@@ -2,7 +2,35 @@
 Module stores models schema.
 """
 
-from pydantic import BaseModel
+from enum import Enum
+
+from pydantic import BaseModel, validator
+
+
+class FilterMode(str, Enum):
+    """
+    FilterMode object defines how text filters are matched.
+
+    :param SUBSTRING: Match value anywhere in the text, backed by trigram index.
+    :param FULLTEXT: Match all words of value, backed by full-text search index.
+    :param PREFIX: Match text starting with value, backed by trigram index.
+    """
+
+    SUBSTRING = "substring"
+    FULLTEXT = "fulltext"
+    PREFIX = "prefix"
+
+
+class DataFormat(str, Enum):
+    """
+    DataFormat object defines serialization format of exported and imported Items.
+
+    :param NDJSON: Newline delimited JSON, one Item object per line.
+    :param CSV: Comma separated values with header row.
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
 
 
 class ItemBaseSchema(BaseModel):
@@ -22,6 +50,158 @@ class ItemBaseSchema(BaseModel):
     completed: bool = False
 
 
+class ItemBulkUpdateSchema(ItemBaseSchema):
+    """
+    ItemBulkUpdateSchema object creates model schema for record updated in bulk request.
+
+    :param id: Id of record to update.
+    :type id: int
+    :param title: Title column record value.
+    :type title: str
+    :param description: Description column record value.
+    :type description: str
+    :param completed: Completed column record value. Default: False.
+    :type completed: bool
+    """
+
+    id: int
+
+
+class ItemPatchSchema(BaseModel):
+    """
+    ItemPatchSchema object creates model schema for partial update of record.
+
+    Only provided fields are written, omitted ones keep their current values.
+
+    :param title: Title column record value. Default: None, unchanged.
+    :type title: str | None
+    :param description: Description column record value. Default: None, unchanged.
+    :type description: str | None
+    :param completed: Completed column record value. Default: None, unchanged.
+    :type completed: bool | None
+    """
+
+    title: str | None = None
+    description: str | None = None
+    completed: bool | None = None
+
+    @validator("title", "description", "completed")
+    def check_not_null(cls, value):
+        """Reject explicit null, fields are left unchanged by omitting them.
+
+        :param value: Field value.
+        :type value: Any
+        :returns: Field value.
+        :rtype: Any
+        """
+
+        if value is None:
+            raise ValueError("field may be omitted but not null")
+        return value
+
+
+class BulkOperationStatus(str, Enum):
+    """
+    BulkOperationStatus object defines outcome of single record in bulk request.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class BulkOperationResultSchema(BaseModel):
+    """
+    BulkOperationResultSchema object creates model schema for single record result of bulk request.
+
+    :param id: Id of record.
+    :type id: int
+    :param status: Outcome of operation for record.
+    :type status: BulkOperationStatus
+    """
+
+    id: int
+    status: BulkOperationStatus
+
+
+class ImportResultSchema(BaseModel):
+    """
+    ImportResultSchema object creates model schema for summary of Items import.
+
+    :param accepted: Number of rows validated and stored.
+    :type accepted: int
+    :param rejected: Number of rows which failed validation.
+    :type rejected: int
+    """
+
+    accepted: int
+    rejected: int
+
+
+class ItemStatsSchema(BaseModel):
+    """
+    ItemStatsSchema object creates model schema for number of Items by completion state.
+
+    :param total: Number of Items.
+    :type total: int
+    :param completed: Number of completed Items.
+    :type completed: int
+    :param pending: Number of Items which are not completed.
+    :type pending: int
+    """
+
+    total: int
+    completed: int
+    pending: int
+
+
+class CacheStatsSchema(BaseModel):
+    """
+    CacheStatsSchema object creates model schema for cache counters.
+
+    :param hits: Number of lookups served from cache.
+    :type hits: int
+    :param misses: Number of lookups not found in cache or expired.
+    :type misses: int
+    :param evictions: Number of entries dropped because of size bound or expiration.
+    :type evictions: int
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+
+
+class SlowQuerySchema(BaseModel):
+    """
+    SlowQuerySchema object creates model schema for statement recorded by slow query log.
+
+    :param call_site: Repository method which executed statement.
+    :type call_site: str
+    :param statement: SQL statement.
+    :type statement: str
+    :param count: Number of slow executions.
+    :type count: int
+    :param total_duration: Summed duration of slow executions in seconds.
+    :type total_duration: float
+    :param max_duration: Longest execution in seconds.
+    :type max_duration: float
+    :param parameters: Types of bound parameters of latest execution.
+    :type parameters: dict | list | None
+    :param plan: Latest captured execution plan. Default: None.
+    :type plan: list | None
+    """
+
+    call_site: str
+    statement: str
+    count: int
+    total_duration: float
+    max_duration: float
+    parameters: dict | list | None
+    plan: list | None = None
+
+
 class ItemSchema(ItemBaseSchema):
     """
     ItemSchema object creates based model schema for record retrieved from table.
@@ -2,11 +2,107 @@
 Module contains FastAPI configuration.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 
+import anyio
 from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from src.adapters.session import (
+    AsyncPostgreSqlSession,
+    PostgreSqlSession,
+    engine_registry,
+)
 from src.auth.token import JWTToken
-from src.entrypoints.routers import items, token
+from src.auth.token_handler import verified_tokens
+from src.config.settings import refresh_settings, settings
+from src.entrypoints.routers import admin, items, metrics, token
+from src.service_layer import async_services, services
+from src.service_layer.unit_of_work import (
+    AsyncPostgreSqlUnitOfWork,
+    PostgreSqlUnitOfWork,
+)
 from src.utils.exception_handlers import exception_handlers
+from src.utils.metrics import MetricsMiddleware
+from src.utils.tracing import TracingMiddleware, tracer
+
+
+async def refresh_secrets(interval: float):
+    """Periodically pick up rotated Azure Key Vault secrets.
+
+    Engines are disposed when database credentials change, so pools reconnect
+    with new ones, and verified tokens are forgotten when JWT secret changes.
+
+    :param interval: Seconds between refreshes.
+    :type interval: float
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = await anyio.to_thread.run_sync(refresh_settings)
+        except Exception as err:
+            logging.error(f"Caught exception during secrets refresh: {err}")
+            continue
+        if changed:
+            logging.info(f"Rotated secrets applied: {sorted(changed)}")
+        if any(name.startswith("db_") for name in changed):
+            engine_registry.dispose()
+            await engine_registry.async_dispose()
+        if "jwt_secret" in changed and verified_tokens is not None:
+            verified_tokens.clear()
+
+
+async def rollup_counts(interval: float):
+    """Periodically roll up Items counter rows appended by writes.
+
+    Rollup keeps number of counter rows summed by counting reads small.
+
+    :param interval: Seconds between rollups.
+    :type interval: float
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if settings.db_async_mode:
+                await async_services.rollup_counts(
+                    AsyncPostgreSqlUnitOfWork(AsyncPostgreSqlSession())
+                )
+            else:
+                await anyio.to_thread.run_sync(
+                    services.rollup_counts, PostgreSqlUnitOfWork(PostgreSqlSession())
+                )
+        except Exception as err:
+            logging.error(f"Caught exception during Items counts rollup: {err}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create shared database engine on startup and release its pool on shutdown.
+    Refresh secrets and roll up Items counts in background when their
+    intervals are configured.
+    """
+
+    if settings.db_async_mode:
+        engine_registry.get_async_engine(AsyncPostgreSqlSession().url)
+    else:
+        engine_registry.get_engine(PostgreSqlSession().url)
+    refresh = None
+    if settings.secret_refresh_interval:
+        refresh = asyncio.create_task(refresh_secrets(settings.secret_refresh_interval))
+    rollup = None
+    if settings.counts_rollup_interval:
+        rollup = asyncio.create_task(rollup_counts(settings.counts_rollup_interval))
+    yield
+    for task in (refresh, rollup):
+        if task is not None:
+            task.cancel()
+    engine_registry.dispose()
+    await engine_registry.async_dispose()
+
 
 app = FastAPI(
     title="Todo Items REST API",
@@ -18,6 +114,8 @@ app = FastAPI(
     },
     docs_url="/docs",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if settings.fast_json else JSONResponse,
 )
 
 
@@ -25,3 +123,11 @@ exception_handlers(app)
 
 app.include_router(token.router)
 app.include_router(items.router, dependencies=[Depends(JWTToken())])
+app.include_router(admin.router, dependencies=[Depends(JWTToken())])
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
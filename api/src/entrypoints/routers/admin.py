@@ -0,0 +1,52 @@
+"""
+Module contains FastAPI administration routes.
+"""
+
+from fastapi import APIRouter
+from src.adapters.cache import item_cache, list_cache
+from src.adapters.query_log import slow_query_log
+from src.auth.token_handler import verified_tokens
+from src.domain.schema import CacheStatsSchema, SlowQuerySchema
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get(
+    "/cache",
+    response_model=dict[str, CacheStatsSchema],
+    description="Retrieve hit, miss and eviction counters of enabled caches.",
+    responses={
+        403: {"description": "Invalid token"},
+    },
+)
+def get_cache_stats() -> dict[str, CacheStatsSchema]:
+    """Retrieve counters of enabled caches.
+
+    :returns: Counters keyed by cache name.
+    :rtype: dict[str, CacheStatsSchema]
+    """
+
+    caches = {"items": item_cache, "lists": list_cache, "tokens": verified_tokens}
+    return {
+        name: CacheStatsSchema(**cache.stats.as_dict())
+        for name, cache in caches.items()
+        if cache is not None
+    }
+
+
+@router.get(
+    "/slow-queries",
+    response_model=list[SlowQuerySchema],
+    description="Retrieve slowest database statements recorded by slow query log.",
+    responses={
+        403: {"description": "Invalid token"},
+    },
+)
+def get_slow_queries() -> list[SlowQuerySchema]:
+    """Retrieve slowest statements, empty when slow query log is disabled.
+
+    :returns: Statements per repository method, slowest first.
+    :rtype: list[SlowQuerySchema]
+    """
+
+    return [SlowQuerySchema(**entry) for entry in slow_query_log.top()]
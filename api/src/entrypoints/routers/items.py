@@ -2,43 +2,203 @@
 Module contains FastAPI items routes.
 """
 
+import hashlib
+from collections.abc import AsyncIterator, Iterator
 
-from fastapi import APIRouter, Depends, Query, Response
-from src.adapters.session import PostgreSqlSession
-from src.domain.model import Item
-from src.domain.schema import ItemBaseSchema, ItemSchema
-from src.service_layer import services
-from src.service_layer.unit_of_work import PostgreSqlUnitOfWork
+from anyio import from_thread
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from src.adapters.cache import item_cache, list_cache
+from src.adapters.session import (
+    AsyncPostgreSqlSession,
+    PostgreSqlSession,
+    replica_router,
+)
+from src.config.settings import settings
+from src.domain.model import DEFAULT_SORT, ITEM_COLUMNS, Item
+from src.domain.schema import (
+    BulkOperationResultSchema,
+    DataFormat,
+    FilterMode,
+    ImportResultSchema,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+    ItemSchema,
+    ItemStatsSchema,
+)
+from src.service_layer import async_services, services
+from src.service_layer.unit_of_work import (
+    AsyncAbstractUnitOfWork,
+    AsyncPostgreSqlUnitOfWork,
+    PostgreSqlUnitOfWork,
+)
+from src.utils.etags import conditional_response
+from src.utils.formatters import (
+    MEDIA_TYPES,
+    parse_fields,
+    parse_filter_value,
+    parse_sort,
+    rows_to_objects,
+)
+from src.utils.pagination import cursor_sort_key, decode_position, encode_cursor
+from src.utils.tracing import tracer
 
 router = APIRouter(tags=["items"], prefix="/items")
 
 
-def uow():
+def client_key(request: Request) -> str | None:
+    """Identify client for read-your-writes stickiness.
+
+    Clients are told apart by digest of their bearer token, falling back to
+    their address.
+
+    :param request: Incoming request.
+    :type request: Request
+
+    :returns: Client identifier.
+    :rtype: str | None
+    """
+
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return request.client.host if request.client else None
+
+
+def uow(request: Request):
     """
     Unit of work dependency.
+
+    Returns asynchronous Unit of Work when ``db_async_mode`` setting is enabled.
+    Routes using it write to the primary database, so subsequent reads of the
+    same client are served by the primary for the read-your-writes window.
+    """
+    try:
+        with tracer.start_as_current_span("uow.create", {"uow.read_only": False}):
+            replica_router.record_write(client_key(request))
+            if settings.db_async_mode:
+                return AsyncPostgreSqlUnitOfWork(
+                    AsyncPostgreSqlSession(), item_cache, list_cache
+                )
+            return PostgreSqlUnitOfWork(PostgreSqlSession(), item_cache, list_cache)
+    except Exception as err:
+        raise err
+
+
+def read_only_uow(request: Request):
+    """
+    Read-only Unit of work dependency.
+
+    Repository reads return rows instead of ORM entities, so it serves routes
+    that do not modify Items. Session is bound to a read replica when replicas
+    are configured and the client did not write recently. Replica reads shortly
+    after a write do not fill caches.
     """
     try:
-        session = PostgreSqlSession()
-        return PostgreSqlUnitOfWork(session)
+        with tracer.start_as_current_span("uow.create", {"uow.read_only": True}):
+            if settings.db_async_mode:
+                session = replica_router.read_session(
+                    AsyncPostgreSqlSession, client_key(request)
+                )
+                return AsyncPostgreSqlUnitOfWork(
+                    session,
+                    replica_router.read_cache(item_cache, session),
+                    replica_router.read_cache(list_cache, session),
+                    read_only=True,
+                )
+            session = replica_router.read_session(
+                PostgreSqlSession, client_key(request)
+            )
+            return PostgreSqlUnitOfWork(
+                session,
+                replica_router.read_cache(item_cache, session),
+                replica_router.read_cache(list_cache, session),
+                read_only=True,
+            )
     except Exception as err:
         raise err
 
 
+async def run_service(service, async_service, *args, uow, **kwargs):
+    """Execute service matching Unit of Work mode.
+
+    Synchronous services run in the thread pool, asynchronous ones are awaited
+    directly on the event loop.
+
+    :param service: Synchronous service function.
+    :type service: Callable
+    :param async_service: Asynchronous service function.
+    :type async_service: Callable
+    :param uow: Unit of Work.
+    :type uow: AbstractUnitOfWork | AsyncAbstractUnitOfWork
+
+    :returns: Service result.
+    :rtype: Any
+    """
+
+    if isinstance(uow, AsyncAbstractUnitOfWork):
+        return await async_service(*args, uow=uow, **kwargs)
+    return await run_in_threadpool(service, *args, uow=uow, **kwargs)
+
+
+def iterate_in_event_loop(iterator: AsyncIterator) -> Iterator:
+    """Consume asynchronous iterator from worker thread.
+
+    Every item is awaited on the event loop, so synchronous services running
+    in the thread pool can read request body as it arrives.
+
+    :param iterator: Asynchronous iterator, e.g. request body stream.
+    :type iterator: AsyncIterator
+
+    :returns: Synchronous iterator over the same items.
+    :rtype: Iterator
+    """
+
+    while True:
+        try:
+            yield from_thread.run(iterator.__anext__)
+        except StopAsyncIteration:
+            return
+
+
 @router.get(
     "",
     response_model=list[ItemSchema],
     description="Retrieve todo items based on the provided filters.",
     responses={
         204: {"description": "No Content"},
+        304: {"description": "Not Modified"},
+        400: {"description": "Invalid cursor, fields, sort or filter"},
         403: {"description": "Invalid token"},
     },
 )
-def get_items(
+async def get_items(
+    request: Request,
     limit: int = Query(20, ge=0, description="Limit page items size."),
     offset: int = Query(0, ge=0, description="Page number."),
     filter_field: str | None = Query(None, description="Filtering field name."),
     filter_value: str | bool | None = Query(None, description="Filter value."),
-    uow_session=Depends(uow),
+    filter_mode: FilterMode = Query(
+        FilterMode.SUBSTRING, description="Text filter matching mode."
+    ),
+    cursor: str | None = Query(
+        None, description="Pagination cursor taken from the next page Link header."
+    ),
+    fields: str | None = Query(
+        None,
+        description="Comma separated Item fields to return, e.g. id,title. Id is always returned.",
+    ),
+    sort: str | None = Query(
+        None,
+        description="Comma separated sort fields with optional direction, e.g. completed,title:desc. Sort fields are always returned.",
+    ),
+    total_count: bool = Query(
+        False,
+        description="Return number of Items matching filters in X-Total-Count header.",
+    ),
+    uow_session=Depends(read_only_uow),
 ) -> list[Item]:
     """Retrieve Items based on provided parameters.
 
@@ -50,17 +210,307 @@ def get_items(
     :type filter_field: str | None
     :param filter_value: Filter value.
     :type filter_value: str | bool | None
+    :param filter_mode: Text filter matching mode. Default: substring.
+    :type filter_mode: FilterMode
+    :param cursor: Pagination cursor. Items after the cursor position are returned.
+    :type cursor: str | None
+    :param fields: Comma separated Item fields to return.
+    :type fields: str | None
+    :param sort: Comma separated sort fields with optional asc or desc direction. Default: id ascending.
+    :type sort: str | None
+    :param total_count: Return number of Items matching filters in X-Total-Count header. Default: False.
+    :type total_count: bool
 
     :returns: List of Item objects.
     :rtype: list[Item]
     """
 
-    return services.get_items(
+    filter_value = parse_filter_value(filter_field, filter_value)
+    order = parse_sort(sort) if sort else DEFAULT_SORT
+    sort_key = cursor_sort_key(order)
+    if fields is not None:
+        columns = parse_fields(fields, [name for name, _ in order])
+    else:
+        columns = ITEM_COLUMNS if settings.fast_json else None
+    after_id, after_values = decode_position(cursor, sort_key) if cursor else (None, ())
+    results = await run_service(
+        services.get_items,
+        async_services.get_items,
         limit,
         offset,
         filter_field,
         filter_value,
         uow=uow_session,
+        after_id=after_id,
+        filter_mode=filter_mode,
+        columns=columns,
+        sort=order,
+        after_values=after_values,
+    )
+    headers = {}
+    if total_count:
+        stats = await run_service(
+            services.get_stats,
+            async_services.get_stats,
+            filter_field,
+            filter_value,
+            uow=uow_session,
+            filter_mode=filter_mode,
+        )
+        headers["X-Total-Count"] = str(stats["total"])
+    if not isinstance(results, list):
+        results.headers.update(headers)
+        return results
+    with tracer.start_as_current_span("serialize"):
+        if columns:
+            content = rows_to_objects(results, columns)
+        else:
+            content = [ItemSchema.from_orm(result).dict() for result in results]
+    if limit and len(results) == limit:
+        next_url = request.url.remove_query_params("offset").include_query_params(
+            cursor=encode_cursor(
+                content[-1]["id"],
+                sort_key,
+                [content[-1][name] for name, _ in order[:-1]],
+            )
+        )
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return conditional_response(request, content, headers)
+
+
+@router.get(
+    "/stats",
+    response_model=ItemStatsSchema,
+    description="Count todo items matching the provided filters by completion state.",
+    responses={
+        400: {"description": "Invalid filter"},
+        403: {"description": "Invalid token"},
+    },
+)
+async def get_stats(
+    filter_field: str | None = Query(None, description="Filtering field name."),
+    filter_value: str | bool | None = Query(None, description="Filter value."),
+    filter_mode: FilterMode = Query(
+        FilterMode.SUBSTRING, description="Text filter matching mode."
+    ),
+    uow_session=Depends(read_only_uow),
+) -> dict[str, int]:
+    """Count Items matching provided filters.
+
+    Unfiltered and completion filtered counts are read from counter table, so
+    they do not scan Items.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text filter matching mode. Default: substring.
+    :type filter_mode: FilterMode
+
+    :returns: Total, completed and pending number of Items.
+    :rtype: dict[str, int]
+    """
+
+    filter_value = parse_filter_value(filter_field, filter_value)
+    return await run_service(
+        services.get_stats,
+        async_services.get_stats,
+        filter_field,
+        filter_value,
+        uow=uow_session,
+        filter_mode=filter_mode,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    description="Stream all todo items matching the provided filters as NDJSON or CSV.",
+    responses={
+        200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}},
+        400: {"description": "Invalid filter"},
+        403: {"description": "Invalid token"},
+    },
+)
+async def export_items(
+    export_format: DataFormat = Query(
+        DataFormat.NDJSON, alias="format", description="Export format."
+    ),
+    filter_field: str | None = Query(None, description="Filtering field name."),
+    filter_value: str | bool | None = Query(None, description="Filter value."),
+    filter_mode: FilterMode = Query(
+        FilterMode.SUBSTRING, description="Text filter matching mode."
+    ),
+    uow_session=Depends(read_only_uow),
+) -> StreamingResponse:
+    """Stream Items based on provided filters.
+
+    :param export_format: Export format. Default: ndjson.
+    :type export_format: DataFormat
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param filter_mode: Text filter matching mode. Default: substring.
+    :type filter_mode: FilterMode
+
+    :returns: Streamed Items.
+    :rtype: StreamingResponse
+    """
+
+    filter_value = parse_filter_value(filter_field, filter_value)
+    service = (
+        async_services.export_items
+        if isinstance(uow_session, AsyncAbstractUnitOfWork)
+        else services.export_items
+    )
+    return StreamingResponse(
+        service(
+            export_format,
+            filter_field,
+            filter_value,
+            uow=uow_session,
+            filter_mode=filter_mode,
+            batch_size=settings.export_batch_size,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="items.{export_format.value}"'
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ImportResultSchema,
+    status_code=201,
+    description="Load todo items from chunked NDJSON or CSV upload with PostgreSQL COPY.",
+    openapi_extra={
+        "requestBody": {
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+            "required": True,
+        }
+    },
+    responses={
+        201: {"description": "Created"},
+        403: {"description": "Invalid token"},
+    },
+)
+async def import_items(
+    request: Request,
+    import_format: DataFormat = Query(
+        DataFormat.NDJSON, alias="format", description="Import format."
+    ),
+    uow_session=Depends(uow),
+) -> ImportResultSchema:
+    """Load Items from uploaded body.
+
+    :param import_format: Import format. Default: ndjson.
+    :type import_format: DataFormat
+
+    :returns: Number of accepted and rejected rows.
+    :rtype: ImportResultSchema
+    """
+
+    if isinstance(uow_session, AsyncAbstractUnitOfWork):
+        return await async_services.import_items(
+            request.stream(),
+            import_format,
+            uow=uow_session,
+            batch_size=settings.import_batch_size,
+        )
+    return await run_in_threadpool(
+        services.import_items,
+        iterate_in_event_loop(request.stream()),
+        import_format,
+        uow=uow_session,
+        batch_size=settings.import_batch_size,
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=list[BulkOperationResultSchema],
+    status_code=201,
+    description="Upload list of todo items in a single transaction.",
+    responses={
+        201: {"description": "Created"},
+        403: {"description": "Invalid token"},
+    },
+)
+async def post_items(
+    items: list[ItemBaseSchema] = Body(
+        ..., min_items=1, max_items=settings.bulk_max_batch_size
+    ),
+    uow_session=Depends(uow),
+) -> list[BulkOperationResultSchema]:
+    """Insert Items based on provided schemas.
+
+    :param items: Bodies of Items to insert.
+    :type items: list[ItemBaseSchema]
+
+    :returns: Result with created Id for every Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    return await run_service(
+        services.insert_items, async_services.insert_items, items, uow=uow_session
+    )
+
+
+@router.patch(
+    "/bulk",
+    response_model=list[BulkOperationResultSchema],
+    description="Update list of todo items in a single transaction.",
+    responses={
+        403: {"description": "Invalid token"},
+    },
+)
+async def patch_items(
+    items: list[ItemBulkUpdateSchema] = Body(
+        ..., min_items=1, max_items=settings.bulk_max_batch_size
+    ),
+    uow_session=Depends(uow),
+) -> list[BulkOperationResultSchema]:
+    """Update Items based on provided schemas.
+
+    :param items: Bodies of Items to update with their Ids.
+    :type items: list[ItemBulkUpdateSchema]
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    return await run_service(
+        services.update_items, async_services.update_items, items, uow=uow_session
+    )
+
+
+@router.delete(
+    "/bulk",
+    response_model=list[BulkOperationResultSchema],
+    description="Delete list of todo items in a single transaction.",
+    responses={
+        403: {"description": "Invalid token"},
+    },
+)
+async def delete_items(
+    item_ids: list[int] = Body(
+        ..., min_items=1, max_items=settings.bulk_max_batch_size
+    ),
+    uow_session=Depends(uow),
+) -> list[BulkOperationResultSchema]:
+    """Delete Items based on provided Ids.
+
+    :param item_ids: Ids of Items in table to delete.
+    :type item_ids: list[int]
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    return await run_service(
+        services.delete_items, async_services.delete_items, item_ids, uow=uow_session
     )
 
 
@@ -69,11 +519,14 @@ def get_items(
     response_model=ItemSchema,
     description="Retrieve todo item based on the provided ID.",
     responses={
+        304: {"description": "Not Modified"},
         403: {"description": "Invalid token"},
         404: {"description": "ID not found!"},
     },
 )
-def get_item(item_id: int, uow_session=Depends(uow)) -> Item:
+async def get_item(
+    item_id: int, request: Request, uow_session=Depends(read_only_uow)
+) -> Item:
     """Retrieve Item based on provided Id.
 
     :param item_id: Id of Item in table.
@@ -83,52 +536,76 @@ def get_item(item_id: int, uow_session=Depends(uow)) -> Item:
     :rtype: Item
     """
 
-    return services.get_item(item_id, uow=uow_session)
+    result = await run_service(
+        services.get_item, async_services.get_item, item_id, uow=uow_session
+    )
+    return conditional_response(request, ItemSchema.from_orm(result).dict())
 
 
 @router.post(
     "",
     description="Upload todo item with provided title, description and completed flag.",
     responses={
-        201: {"description": "Created"},
+        201: {"description": "Created, Location header points to the new item"},
         403: {"description": "Invalid token"},
     },
 )
-def post_item(item: ItemBaseSchema, uow_session=Depends(uow)):
+async def post_item(item: ItemBaseSchema, request: Request, uow_session=Depends(uow)):
     """Insert Item based on provided schema.
 
     :param item: Body of Item to insert.
     :type item: ItemBaseSchema
 
-    :returns: Response code.
+    :returns: Response code with Location of created Item.
     :rtype: Response
     """
 
-    services.insert_item(item, uow=uow_session)
-    return Response(status_code=201)
+    item_id = await run_service(
+        services.insert_item, async_services.insert_item, item, uow=uow_session
+    )
+    return Response(
+        status_code=201,
+        headers={"Location": str(request.url_for("get_item", item_id=item_id))},
+    )
 
 
 @router.patch(
     "/{item_id}",
-    description="Update todo item based on ID.",
+    description="Update provided fields of todo item based on ID.",
     responses={
         204: {"description": "Not Content"},
         403: {"description": "Invalid token"},
+        404: {"description": "ID not found"},
+        412: {"description": "Precondition failed"},
     },
 )
-def patch_item(item_id: int, item: ItemBaseSchema, uow_session=Depends(uow)):
-    """Update Item based on provided Id and schema.
+async def patch_item(
+    item_id: int,
+    item: ItemPatchSchema,
+    if_match: str | None = Header(None, description="Expected ETag of Item."),
+    uow_session=Depends(uow),
+):
+    """Update provided fields of Item, leaving omitted ones unchanged.
 
     :param item_id: Id of Item in table to update.
     :type item_id: int
-    :param item: Body of Item to update.
-    :type item: ItemBaseSchema
+    :param item: Fields of Item to update.
+    :type item: ItemPatchSchema
+    :param if_match: Update only when Item still has this ETag.
+    :type if_match: str | None
 
     :returns: Response code.
     :rtype: Response
     """
 
-    services.update_item(item_id, item, uow=uow_session)
+    await run_service(
+        services.update_item,
+        async_services.update_item,
+        item_id,
+        item,
+        uow=uow_session,
+        if_match=if_match,
+    )
     return Response(status_code=204)
 
 
@@ -138,17 +615,31 @@ def patch_item(item_id: int, item: ItemBaseSchema, uow_session=Depends(uow)):
     responses={
         204: {"description": "Not Content"},
         403: {"description": "Invalid token"},
+        404: {"description": "ID not found"},
+        412: {"description": "Precondition failed"},
     },
 )
-def delete_item(item_id: int, uow_session=Depends(uow)):
+async def delete_item(
+    item_id: int,
+    if_match: str | None = Header(None, description="Expected ETag of Item."),
+    uow_session=Depends(uow),
+):
     """Delete Item based on provided Id.
 
     :param item_id: Id of Item in table to update.
     :type item_id: int
+    :param if_match: Delete only when Item still has this ETag.
+    :type if_match: str | None
 
     :returns: Response code.
     :rtype: Response
     """
 
-    services.delete_item(item_id, uow=uow_session)
+    await run_service(
+        services.delete_item,
+        async_services.delete_item,
+        item_id,
+        uow=uow_session,
+        if_match=if_match,
+    )
     return Response(status_code=204)
@@ -0,0 +1,24 @@
+"""
+Module contains FastAPI metrics route.
+"""
+
+from fastapi import APIRouter, Response
+from src.utils.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    description="Retrieve request, database and authentication metrics in Prometheus text format.",
+    responses={200: {"content": {CONTENT_TYPE: {}}}},
+)
+def get_metrics() -> Response:
+    """Render collected metrics for scraping.
+
+    :returns: Metrics in Prometheus text exposition format.
+    :rtype: Response
+    """
+
+    return Response(registry.render(), media_type=CONTENT_TYPE)
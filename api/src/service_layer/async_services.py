@@ -0,0 +1,431 @@
+"""
+Module contains asynchronous service layer implementation.
+
+Functions mirror :mod:`src.service_layer.services` for asynchronous Unit of Work.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
+from fastapi import Response
+from src.adapters.cache import (
+    ITEMS_NAMESPACE,
+    item_cache_key,
+    items_page_key,
+    items_stats_key,
+)
+from src.domain.model import DEFAULT_SORT, Item
+from src.domain.schema import (
+    BulkOperationResultSchema,
+    BulkOperationStatus,
+    DataFormat,
+    FilterMode,
+    ImportResultSchema,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+)
+from src.service_layer.services import (
+    bulk_results,
+    cacheable_page,
+    check_precondition,
+    items_stats,
+)
+from src.service_layer.unit_of_work import AsyncAbstractUnitOfWork
+from src.utils.exceptions import IdNotFound
+from src.utils.formatters import ItemsStreamParser, format_header, format_rows
+
+
+async def invalidate_items(item_ids: list[int], uow: AsyncAbstractUnitOfWork):
+    """Remove cached Items after they were changed and expire cached Items pages.
+
+    :param item_ids: Ids of changed Items, empty for inserts.
+    :type item_ids: list[int]
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    """
+
+    if uow.cache is not None and item_ids:
+        await uow.cache.async_delete(*(item_cache_key(item_id) for item_id in item_ids))
+    if uow.list_cache is not None:
+        await uow.list_cache.async_bump_generation(ITEMS_NAMESPACE)
+
+
+async def get_item(item_id: int, uow: AsyncAbstractUnitOfWork) -> Item:
+    """Retrieve Item based on provided Id.
+
+    :param item_id: Id of Item in table.
+    :type item_id: int
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+
+    :returns: Item object.
+    :rtype: Item
+    """
+
+    async with uow:
+        result = await uow.repository.get_item(item_id)
+        if not result:
+            raise IdNotFound
+        return result
+
+
+async def get_items(
+    limit: int,
+    offset: int,
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    uow: AsyncAbstractUnitOfWork,
+    after_id: int | None = None,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+    columns: Sequence[str] | None = None,
+    sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+    after_values: Sequence = (),
+) -> list[Item] | list[tuple]:
+    """Retrieve Items based on provided parameters.
+
+    :param limit: Limit page items size.
+    :type limit: int
+    :param offset: Page number.
+    :type offset: int
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param after_id: Return only Items following Item with provided Id in sort order.
+    :type after_id: int | None
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+    :param columns: Return rows of provided columns instead of Item objects. Default: None.
+    :type columns: Sequence[str] | None
+    :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+    :type sort: Sequence[tuple[str, str]]
+    :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+    :type after_values: Sequence
+
+    :returns: List of Item objects or rows.
+    :rtype: list[Item] | list[tuple]
+    """
+
+    async with uow:
+        cache_key, cached = None, None
+        if (
+            uow.list_cache is not None
+            and (generation := await uow.list_cache.async_generation(ITEMS_NAMESPACE))
+            is not None
+        ):
+            cache_key = items_page_key(
+                generation,
+                limit,
+                offset,
+                filter_field,
+                filter_value,
+                after_id,
+                filter_mode,
+                columns,
+                sort,
+                after_values,
+            )
+            cached = await uow.list_cache.async_get(cache_key)
+        if cached is not None:
+            results = cached if columns else [Item(**item) for item in cached]
+        else:
+            if columns:
+                results = await uow.repository.get_item_rows(
+                    limit,
+                    offset,
+                    filter_field,
+                    filter_value,
+                    after_id,
+                    filter_mode,
+                    columns,
+                    sort,
+                    after_values,
+                )
+            else:
+                results = await uow.repository.get_items(
+                    limit,
+                    offset,
+                    filter_field,
+                    filter_value,
+                    after_id,
+                    filter_mode,
+                    sort,
+                    after_values,
+                )
+            if (
+                cache_key is not None
+                and (page := cacheable_page(results, bool(columns))) is not None
+            ):
+                await uow.list_cache.async_set(cache_key, page)
+        return Response(status_code=204) if not results else results
+
+
+async def get_stats(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    uow: AsyncAbstractUnitOfWork,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+) -> dict[str, int]:
+    """Count Items matching provided filter.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+
+    :returns: Total, completed and pending number of Items.
+    :rtype: dict[str, int]
+    """
+
+    async with uow:
+        cache_key = None
+        if (
+            uow.list_cache is not None
+            and (generation := await uow.list_cache.async_generation(ITEMS_NAMESPACE))
+            is not None
+        ):
+            cache_key = items_stats_key(
+                generation,
+                filter_field,
+                filter_value,
+                filter_mode,
+            )
+            if (cached := await uow.list_cache.async_get(cache_key)) is not None:
+                return cached
+        stats = items_stats(
+            await uow.repository.count_items(filter_field, filter_value, filter_mode)
+        )
+        if cache_key is not None:
+            await uow.list_cache.async_set(cache_key, stats)
+        return stats
+
+
+async def rollup_counts(uow: AsyncAbstractUnitOfWork):
+    """Roll up Items counter rows appended by writes into a row per completion state.
+
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    """
+
+    async with uow:
+        await uow.repository.rollup_counts()
+
+
+async def insert_item(item: ItemBaseSchema, uow: AsyncAbstractUnitOfWork) -> int:
+    """Insert Item based on provided schema.
+
+    :param item: Body of Item to insert.
+    :type item: ItemBaseSchema
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+
+    :returns: Id of created Item.
+    :rtype: int
+    """
+
+    async with uow:
+        result = await uow.repository.insert_item(item)
+        await invalidate_items([], uow)
+        return result
+
+
+async def update_item(
+    item_id: int,
+    item: ItemPatchSchema,
+    uow: AsyncAbstractUnitOfWork,
+    if_match: str | None = None,
+) -> bool:
+    """Update provided fields of Item, leaving omitted ones unchanged.
+
+    :param item_id: Id of Item in table to update.
+    :type item_id: int
+    :param item: Fields of Item to update.
+    :type item: ItemPatchSchema
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param if_match: ETag Item must have to be changed. Default: None, unconditional.
+    :type if_match: str | None
+
+    :returns: Operation result.
+    :rtype: bool
+    """
+
+    async with uow:
+        if if_match is not None:
+            check_precondition(await uow.repository.lock_item(item_id), if_match)
+        if not await uow.repository.update_item(item_id, item):
+            raise IdNotFound
+        await invalidate_items([item_id], uow)
+        return True
+
+
+async def delete_item(
+    item_id: int, uow: AsyncAbstractUnitOfWork, if_match: str | None = None
+) -> bool:
+    """Delete Item based on provided Id.
+
+    :param item_id: Id of Item in table to delete.
+    :type item_id: int
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param if_match: ETag Item must have to be changed. Default: None, unconditional.
+    :type if_match: str | None
+
+    :returns: Operation result.
+    :rtype: bool
+    """
+
+    async with uow:
+        if if_match is not None:
+            check_precondition(await uow.repository.lock_item(item_id), if_match)
+        if not await uow.repository.delete_item(item_id):
+            raise IdNotFound
+        await invalidate_items([item_id], uow)
+        return True
+
+
+async def insert_items(
+    items: list[ItemBaseSchema], uow: AsyncAbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Insert Items based on provided schemas in a single transaction.
+
+    :param items: Bodies of Items to insert.
+    :type items: list[ItemBaseSchema]
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+
+    :returns: Result with created Id for every Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    async with uow:
+        item_ids = await uow.repository.insert_items(items)
+        await invalidate_items([], uow)
+    return bulk_results(item_ids, item_ids, BulkOperationStatus.CREATED)
+
+
+async def update_items(
+    items: list[ItemBulkUpdateSchema], uow: AsyncAbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Update Items based on provided schemas in a single transaction.
+
+    When Id is repeated, the last body provided for it is applied.
+
+    :param items: Bodies of Items to update with their Ids.
+    :type items: list[ItemBulkUpdateSchema]
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    unique_items = list({item.id: item for item in items}.values())
+    async with uow:
+        updated_ids = await uow.repository.update_items(unique_items)
+        await invalidate_items(updated_ids, uow)
+    return bulk_results(
+        [item.id for item in items], updated_ids, BulkOperationStatus.UPDATED
+    )
+
+
+async def delete_items(
+    item_ids: list[int], uow: AsyncAbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Delete Items based on provided Ids in a single transaction.
+
+    :param item_ids: Ids of Items in table to delete.
+    :type item_ids: list[int]
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    async with uow:
+        deleted_ids = await uow.repository.delete_items(list(dict.fromkeys(item_ids)))
+        await invalidate_items(deleted_ids, uow)
+    return bulk_results(item_ids, deleted_ids, BulkOperationStatus.DELETED)
+
+
+async def export_items(
+    export_format: DataFormat,
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    uow: AsyncAbstractUnitOfWork,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+    batch_size: int = 1000,
+) -> AsyncIterator[str]:
+    """Stream serialized Items matching provided filters.
+
+    :param export_format: Serialization format.
+    :type export_format: DataFormat
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+    :param batch_size: Number of rows serialized per chunk. Default: 1000.
+    :type batch_size: int
+
+    :returns: Serialized chunks.
+    :rtype: AsyncIterator[str]
+    """
+
+    async with uow:
+        yield format_header(export_format)
+        async for rows in uow.repository.stream_items(
+            filter_field, filter_value, filter_mode, batch_size
+        ):
+            yield format_rows(rows, export_format)
+
+
+async def import_items(
+    chunks: AsyncIterable[bytes],
+    data_format: DataFormat,
+    uow: AsyncAbstractUnitOfWork,
+    batch_size: int = 5000,
+) -> ImportResultSchema:
+    """Load uploaded NDJSON or CSV body into Items table with PostgreSQL COPY.
+
+    Body is parsed and validated chunk by chunk, valid Items are loaded and
+    committed in batches, so the whole payload is never held in memory.
+
+    :param chunks: Uploaded body chunks.
+    :type chunks: AsyncIterable[bytes]
+    :param data_format: Serialization format of uploaded body.
+    :type data_format: DataFormat
+    :param uow: Asynchronous Unit of Work.
+    :type: AsyncAbstractUnitOfWork
+    :param batch_size: Number of Items loaded per COPY statement. Default: 5000.
+    :type batch_size: int
+
+    :returns: Number of accepted and rejected rows.
+    :rtype: ImportResultSchema
+    """
+
+    parser = ItemsStreamParser(data_format)
+    accepted, batch = 0, []
+    async with uow:
+        try:
+            async for chunk in chunks:
+                batch.extend(parser.feed(chunk))
+                while len(batch) >= batch_size:
+                    accepted += await uow.repository.copy_items(batch[:batch_size])
+                    batch = batch[batch_size:]
+            batch.extend(parser.close())
+            if batch:
+                accepted += await uow.repository.copy_items(batch)
+        finally:
+            await invalidate_items([], uow)
+    return ImportResultSchema(accepted=accepted, rejected=parser.rejected)
@@ -2,11 +2,95 @@
 Module contains service layer implementation.
 """
 
+from collections.abc import Iterable, Iterator, Sequence
+
 from fastapi import Response
-from src.domain.model import Item
-from src.domain.schema import ItemBaseSchema
+from src.adapters.cache import (
+    ITEMS_NAMESPACE,
+    item_cache_key,
+    items_page_key,
+    items_stats_key,
+)
+from src.config.settings import settings
+from src.domain.model import DEFAULT_SORT, Item
+from src.domain.schema import (
+    BulkOperationResultSchema,
+    BulkOperationStatus,
+    DataFormat,
+    FilterMode,
+    ImportResultSchema,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+    ItemSchema,
+)
 from src.service_layer.unit_of_work import AbstractUnitOfWork
-from src.utils.exceptions import IdNotFound
+from src.utils.etags import etag_matches, item_etag
+from src.utils.exceptions import IdNotFound, PreconditionFailedError
+from src.utils.formatters import ItemsStreamParser, format_header, format_rows
+
+
+def invalidate_items(item_ids: list[int], uow: AbstractUnitOfWork):
+    """Remove cached Items after they were changed and expire cached Items pages.
+
+    :param item_ids: Ids of changed Items, empty for inserts.
+    :type item_ids: list[int]
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+    """
+
+    if uow.cache is not None and item_ids:
+        uow.cache.delete(*(item_cache_key(item_id) for item_id in item_ids))
+    if uow.list_cache is not None:
+        uow.list_cache.bump_generation(ITEMS_NAMESPACE)
+
+
+def check_precondition(current: Item | None, if_match: str):
+    """Verify If-Match header against current state of Item.
+
+    :param current: Current Item or None when Id does not exist.
+    :type current: Item | None
+    :param if_match: Value of If-Match header.
+    :type if_match: str
+
+    :raises PreconditionFailedError: When header does not match current Item.
+    """
+
+    if not etag_matches(if_match, None if current is None else item_etag(current)):
+        raise PreconditionFailedError
+
+
+def cacheable_page(results: list, as_rows: bool = False) -> list | None:
+    """Prepare Items page to be stored in cache.
+
+    :param results: Items page.
+    :type results: list[Item] | list[Row]
+    :param as_rows: Page consists of column rows instead of Item objects. Default: False.
+    :type as_rows: bool
+
+    :returns: Serialized Items or None when page is too large to be cached.
+    :rtype: list | None
+    """
+
+    if len(results) > settings.list_cache_max_page_size:
+        return None
+    if as_rows:
+        return [tuple(result) for result in results]
+    return [ItemSchema.from_orm(result).dict() for result in results]
+
+
+def items_stats(counts: dict[bool, int]) -> dict[str, int]:
+    """Summarize Items counts by completion state.
+
+    :param counts: Number of Items keyed by completion state.
+    :type counts: dict[bool, int]
+
+    :returns: Total, completed and pending number of Items.
+    :rtype: dict[str, int]
+    """
+
+    completed, pending = counts.get(True, 0), counts.get(False, 0)
+    return {"total": completed + pending, "completed": completed, "pending": pending}
 
 
 def get_item(item_id: int, uow: AbstractUnitOfWork) -> Item:
@@ -34,7 +118,12 @@ def get_items(
     filter_field: str | None,
     filter_value: str | bool | None,
     uow: AbstractUnitOfWork,
-) -> list[Item]:
+    after_id: int | None = None,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+    columns: Sequence[str] | None = None,
+    sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+    after_values: Sequence = (),
+) -> list[Item] | list[tuple]:
     """Retrieve Items based on provided parameters.
 
     :param limit: Limit page items size.
@@ -47,17 +136,129 @@ def get_items(
     :type filter_value: str | bool | None
     :param uow: Unit of Work.
     :type: AbstractUnitOfWork
+    :param after_id: Return only Items following Item with provided Id in sort order.
+    :type after_id: int | None
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+    :param columns: Return rows of provided columns instead of Item objects. Default: None.
+    :type columns: Sequence[str] | None
+    :param sort: Pairs of column name and direction, ending with id. Default: id ascending.
+    :type sort: Sequence[tuple[str, str]]
+    :param after_values: Values of sort columns preceding id in Item with after_id. Default: none.
+    :type after_values: Sequence
 
-    :returns: List of Item objects.
-    :rtype: list[Item]
+    :returns: List of Item objects or rows.
+    :rtype: list[Item] | list[tuple]
     """
 
     with uow:
-        results = uow.repository.get_items(limit, offset, filter_field, filter_value)
+        cache_key, cached = None, None
+        if (
+            uow.list_cache is not None
+            and (generation := uow.list_cache.generation(ITEMS_NAMESPACE)) is not None
+        ):
+            cache_key = items_page_key(
+                generation,
+                limit,
+                offset,
+                filter_field,
+                filter_value,
+                after_id,
+                filter_mode,
+                columns,
+                sort,
+                after_values,
+            )
+            cached = uow.list_cache.get(cache_key)
+        if cached is not None:
+            results = cached if columns else [Item(**item) for item in cached]
+        else:
+            if columns:
+                results = uow.repository.get_item_rows(
+                    limit,
+                    offset,
+                    filter_field,
+                    filter_value,
+                    after_id,
+                    filter_mode,
+                    columns,
+                    sort,
+                    after_values,
+                )
+            else:
+                results = uow.repository.get_items(
+                    limit,
+                    offset,
+                    filter_field,
+                    filter_value,
+                    after_id,
+                    filter_mode,
+                    sort,
+                    after_values,
+                )
+            if (
+                cache_key is not None
+                and (page := cacheable_page(results, bool(columns))) is not None
+            ):
+                uow.list_cache.set(cache_key, page)
         return Response(status_code=204) if not results else results
 
 
-def insert_item(item: ItemBaseSchema, uow: AbstractUnitOfWork) -> bool:
+def get_stats(
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    uow: AbstractUnitOfWork,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+) -> dict[str, int]:
+    """Count Items matching provided filter.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+
+    :returns: Total, completed and pending number of Items.
+    :rtype: dict[str, int]
+    """
+
+    with uow:
+        cache_key = None
+        if (
+            uow.list_cache is not None
+            and (generation := uow.list_cache.generation(ITEMS_NAMESPACE)) is not None
+        ):
+            cache_key = items_stats_key(
+                generation,
+                filter_field,
+                filter_value,
+                filter_mode,
+            )
+            if (cached := uow.list_cache.get(cache_key)) is not None:
+                return cached
+        stats = items_stats(
+            uow.repository.count_items(filter_field, filter_value, filter_mode)
+        )
+        if cache_key is not None:
+            uow.list_cache.set(cache_key, stats)
+        return stats
+
+
+def rollup_counts(uow: AbstractUnitOfWork):
+    """Roll up Items counter rows appended by writes into a row per completion state.
+
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+    """
+
+    with uow:
+        uow.repository.rollup_counts()
+
+
+def insert_item(item: ItemBaseSchema, uow: AbstractUnitOfWork) -> int:
     """Insert Item based on provided schema.
 
     :param item: Body of Item to insert.
@@ -65,43 +266,236 @@ def insert_item(item: ItemBaseSchema, uow: AbstractUnitOfWork) -> bool:
     :param uow: Unit of Work.
     :type: AbstractUnitOfWork
 
-    :returns: Operation result.
-    :rtype: bool
+    :returns: Id of created Item.
+    :rtype: int
     """
 
     with uow:
-        return uow.repository.insert_item(item)
+        result = uow.repository.insert_item(item)
+        invalidate_items([], uow)
+        return result
 
 
-def update_item(item_id: int, item: ItemBaseSchema, uow: AbstractUnitOfWork) -> bool:
-    """Update Item based on provided Id and schema.
+def update_item(
+    item_id: int,
+    item: ItemPatchSchema,
+    uow: AbstractUnitOfWork,
+    if_match: str | None = None,
+) -> bool:
+    """Update provided fields of Item, leaving omitted ones unchanged.
 
     :param item_id: Id of Item in table to update.
     :type item_id: int
-    :param item: Body of Item to update.
-    :type item: ItemBaseSchema
+    :param item: Fields of Item to update.
+    :type item: ItemPatchSchema
     :param uow: Unit of Work.
     :type: AbstractUnitOfWork
+    :param if_match: ETag Item must have to be changed. Default: None, unconditional.
+    :type if_match: str | None
 
     :returns: Operation result.
     :rtype: bool
     """
 
     with uow:
-        return uow.repository.update_item(item_id, item)
+        if if_match is not None:
+            check_precondition(uow.repository.lock_item(item_id), if_match)
+        if not uow.repository.update_item(item_id, item):
+            raise IdNotFound
+        invalidate_items([item_id], uow)
+        return True
 
 
-def delete_item(item_id: int, uow: AbstractUnitOfWork) -> bool:
+def delete_item(
+    item_id: int, uow: AbstractUnitOfWork, if_match: str | None = None
+) -> bool:
     """Delete Item based on provided Id.
 
-    :param item_id: Id of Item in table to update.
+    :param item_id: Id of Item in table to delete.
     :type item_id: int
     :param uow: Unit of Work.
     :type: AbstractUnitOfWork
+    :param if_match: ETag Item must have to be changed. Default: None, unconditional.
+    :type if_match: str | None
 
     :returns: Operation result.
     :rtype: bool
     """
 
     with uow:
-        return uow.repository.delete_item(item_id)
+        if if_match is not None:
+            check_precondition(uow.repository.lock_item(item_id), if_match)
+        if not uow.repository.delete_item(item_id):
+            raise IdNotFound
+        invalidate_items([item_id], uow)
+        return True
+
+
+def bulk_results(
+    item_ids: list[int], affected_ids: list[int], status: BulkOperationStatus
+) -> list[BulkOperationResultSchema]:
+    """Prepare per-item results of bulk operation.
+
+    :param item_ids: Ids of Items requested in bulk operation.
+    :type item_ids: list[int]
+    :param affected_ids: Ids of Items affected by bulk operation.
+    :type affected_ids: list[int]
+    :param status: Status of affected Items.
+    :type status: BulkOperationStatus
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    affected = set(affected_ids)
+    return [
+        BulkOperationResultSchema(
+            id=item_id,
+            status=status if item_id in affected else BulkOperationStatus.NOT_FOUND,
+        )
+        for item_id in item_ids
+    ]
+
+
+def insert_items(
+    items: list[ItemBaseSchema], uow: AbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Insert Items based on provided schemas in a single transaction.
+
+    :param items: Bodies of Items to insert.
+    :type items: list[ItemBaseSchema]
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+
+    :returns: Result with created Id for every Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    with uow:
+        item_ids = uow.repository.insert_items(items)
+        invalidate_items([], uow)
+    return bulk_results(item_ids, item_ids, BulkOperationStatus.CREATED)
+
+
+def update_items(
+    items: list[ItemBulkUpdateSchema], uow: AbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Update Items based on provided schemas in a single transaction.
+
+    When Id is repeated, the last body provided for it is applied.
+
+    :param items: Bodies of Items to update with their Ids.
+    :type items: list[ItemBulkUpdateSchema]
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    unique_items = list({item.id: item for item in items}.values())
+    with uow:
+        updated_ids = uow.repository.update_items(unique_items)
+        invalidate_items(updated_ids, uow)
+    return bulk_results(
+        [item.id for item in items], updated_ids, BulkOperationStatus.UPDATED
+    )
+
+
+def delete_items(
+    item_ids: list[int], uow: AbstractUnitOfWork
+) -> list[BulkOperationResultSchema]:
+    """Delete Items based on provided Ids in a single transaction.
+
+    :param item_ids: Ids of Items in table to delete.
+    :type item_ids: list[int]
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+
+    :returns: Result for every requested Item.
+    :rtype: list[BulkOperationResultSchema]
+    """
+
+    with uow:
+        deleted_ids = uow.repository.delete_items(list(dict.fromkeys(item_ids)))
+        invalidate_items(deleted_ids, uow)
+    return bulk_results(item_ids, deleted_ids, BulkOperationStatus.DELETED)
+
+
+def export_items(
+    export_format: DataFormat,
+    filter_field: str | None,
+    filter_value: str | bool | None,
+    uow: AbstractUnitOfWork,
+    filter_mode: FilterMode = FilterMode.SUBSTRING,
+    batch_size: int = 1000,
+) -> Iterator[str]:
+    """Stream serialized Items matching provided filters.
+
+    Unit of Work stays open while the stream is consumed, so memory usage
+    depends only on batch size.
+
+    :param export_format: Serialization format.
+    :type export_format: DataFormat
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+    :param filter_mode: Text matching mode. Default: substring.
+    :type filter_mode: FilterMode
+    :param batch_size: Number of rows serialized per chunk. Default: 1000.
+    :type batch_size: int
+
+    :returns: Serialized chunks.
+    :rtype: Iterator[str]
+    """
+
+    with uow:
+        yield format_header(export_format)
+        for rows in uow.repository.stream_items(
+            filter_field, filter_value, filter_mode, batch_size
+        ):
+            yield format_rows(rows, export_format)
+
+
+def import_items(
+    chunks: Iterable[bytes],
+    data_format: DataFormat,
+    uow: AbstractUnitOfWork,
+    batch_size: int = 5000,
+) -> ImportResultSchema:
+    """Load uploaded NDJSON or CSV body into Items table with PostgreSQL COPY.
+
+    Body is parsed and validated chunk by chunk, valid Items are loaded and
+    committed in batches, so the whole payload is never held in memory.
+
+    :param chunks: Uploaded body chunks.
+    :type chunks: Iterable[bytes]
+    :param data_format: Serialization format of uploaded body.
+    :type data_format: DataFormat
+    :param uow: Unit of Work.
+    :type: AbstractUnitOfWork
+    :param batch_size: Number of Items loaded per COPY statement. Default: 5000.
+    :type batch_size: int
+
+    :returns: Number of accepted and rejected rows.
+    :rtype: ImportResultSchema
+    """
+
+    parser = ItemsStreamParser(data_format)
+    accepted, batch = 0, []
+    with uow:
+        try:
+            for chunk in chunks:
+                batch.extend(parser.feed(chunk))
+                while len(batch) >= batch_size:
+                    accepted += uow.repository.copy_items(batch[:batch_size])
+                    batch = batch[batch_size:]
+            batch.extend(parser.close())
+            if batch:
+                accepted += uow.repository.copy_items(batch)
+        finally:
+            invalidate_items([], uow)
+    return ImportResultSchema(accepted=accepted, rejected=parser.rejected)
@@ -5,13 +5,23 @@ Module contains Unit Of Work logic.
 import logging
 from abc import ABC
 
-from src.adapters.repository import AbstractRepository, PostgreSqlRepository
+from src.adapters.cache import AbstractCache, AsyncCachedRepository, CachedRepository
+from src.adapters.repository import (
+    AbstractRepository,
+    AsyncAbstractRepository,
+    AsyncPostgreSqlRepository,
+    PostgreSqlRepository,
+)
+from src.adapters.session import AbstractSession
+from src.utils.tracing import tracer
 
 
 class AbstractUnitOfWork(ABC):
     """Base object for Unit Of Work logic."""
 
     repository: AbstractRepository
+    cache: AbstractCache | None = None
+    list_cache: AbstractCache | None = None
 
     def __enter__(self):
         return self
@@ -21,16 +31,43 @@ class AbstractUnitOfWork(ABC):
 
 
 class PostgreSqlUnitOfWork(AbstractUnitOfWork):
-    """Unit Of Work logic for PostgreSQL database."""
+    """
+    Unit Of Work logic for PostgreSQL database.
 
-    def __init__(self, session):
-        self.session = session
+    Each context entry borrows a new session from the shared engine pool and
+    returns its connection to the pool on exit.
+
+    :param session: Session provider for PostgreSQL database.
+    :type session: AbstractSession
+    :param cache: Cache serving Item lookups. Default: None, caching disabled.
+    :type cache: AbstractCache | None
+    :param list_cache: Cache serving Items pages. Default: None, caching disabled.
+    :type list_cache: AbstractCache | None
+    :param read_only: Repository returns rows instead of ORM entities from reads. Default: False.
+    :type read_only: bool
+    """
+
+    def __init__(
+        self,
+        session: AbstractSession,
+        cache: AbstractCache | None = None,
+        list_cache: AbstractCache | None = None,
+        read_only: bool = False,
+    ):
+        self.session_provider = session
+        self.session = None
+        self.cache = cache
+        self.list_cache = list_cache
+        self.read_only = read_only
 
     def __enter__(self):
         try:
-            self.session = self.session.create_session()
-            self.repository = PostgreSqlRepository(self.session)
-            super().__enter__()
+            with tracer.start_as_current_span("uow.enter"):
+                self.session = self.session_provider.create_session()
+                self.repository = PostgreSqlRepository(self.session, self.read_only)
+                if self.cache is not None:
+                    self.repository = CachedRepository(self.repository, self.cache)
+                return super().__enter__()
         except Exception as err:
             if self.session is not None:
                 self.session.close()
@@ -42,3 +79,67 @@ class PostgreSqlUnitOfWork(AbstractUnitOfWork):
             self.session.close()
         except Exception as err:
             raise err
+
+
+class AsyncAbstractUnitOfWork(ABC):
+    """Base object for asynchronous Unit Of Work logic."""
+
+    repository: AsyncAbstractRepository
+    cache: AbstractCache | None = None
+    list_cache: AbstractCache | None = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        logging.debug("Exiting context. Closing connection to database.")
+
+
+class AsyncPostgreSqlUnitOfWork(AsyncAbstractUnitOfWork):
+    """
+    Asynchronous Unit Of Work logic for PostgreSQL database.
+
+    :param session: Asynchronous session provider for PostgreSQL database.
+    :type session: AbstractSession
+    :param cache: Cache serving Item lookups. Default: None, caching disabled.
+    :type cache: AbstractCache | None
+    :param list_cache: Cache serving Items pages. Default: None, caching disabled.
+    :type list_cache: AbstractCache | None
+    :param read_only: Repository returns rows instead of ORM entities from reads. Default: False.
+    :type read_only: bool
+    """
+
+    def __init__(
+        self,
+        session: AbstractSession,
+        cache: AbstractCache | None = None,
+        list_cache: AbstractCache | None = None,
+        read_only: bool = False,
+    ):
+        self.session_provider = session
+        self.session = None
+        self.cache = cache
+        self.list_cache = list_cache
+        self.read_only = read_only
+
+    async def __aenter__(self):
+        try:
+            with tracer.start_as_current_span("uow.enter"):
+                self.session = self.session_provider.create_session()
+                self.repository = AsyncPostgreSqlRepository(
+                    self.session, self.read_only
+                )
+                if self.cache is not None:
+                    self.repository = AsyncCachedRepository(self.repository, self.cache)
+                return await super().__aenter__()
+        except Exception as err:
+            if self.session is not None:
+                await self.session.close()
+            raise err
+
+    async def __aexit__(self, *args):
+        await super().__aexit__(*args)
+        try:
+            await self.session.close()
+        except Exception as err:
+            raise err
@@ -0,0 +1,140 @@
+"""
+Module contains entity tags (ETag) logic for conditional requests.
+
+Strong ETag is a digest of the compact JSON representation, so the same body
+always yields the same tag regardless of the process serving it. Tag of a list
+is a digest of its entries' tags, which are memoized by entry values, so it is
+known before the body is serialized and a 304 response skips serialization.
+Enabling ``fast_json`` setting switches serialization to orjson, which changes
+bodies byte-wise, so tags issued before the switch no longer match.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+
+from fastapi import Request, Response
+from src.config.settings import settings
+from src.domain.model import Item
+from src.domain.schema import ItemSchema
+from src.utils.tracing import tracer
+
+ETAG_CACHE_SIZE = 10000
+
+
+def serialize_json(content) -> bytes:
+    """Serialize content to compact JSON, with orjson when ``fast_json`` setting is enabled.
+
+    :param content: JSON compatible content.
+    :type content: Any
+    :returns: JSON body.
+    :rtype: bytes
+    """
+
+    if settings.fast_json:
+        import orjson
+
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute strong ETag of response body.
+
+    :param body: Response body.
+    :type body: bytes
+    :returns: Quoted entity tag.
+    :rtype: str
+    """
+
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+@lru_cache(maxsize=ETAG_CACHE_SIZE)
+def entry_etag(entry: tuple[tuple[str, object], ...]) -> str:
+    """Compute ETag of JSON object, memoized by its fields.
+
+    :param entry: Pairs of field name and value, in body order.
+    :type entry: tuple[tuple[str, object], ...]
+    :returns: Quoted entity tag.
+    :rtype: str
+    """
+
+    return compute_etag(serialize_json(dict(entry)))
+
+
+def content_etag(content: dict | list[dict]) -> str:
+    """Compute ETag of JSON object or list of objects without serializing it.
+
+    :param content: JSON object or list of objects.
+    :type content: dict | list[dict]
+    :returns: Quoted entity tag.
+    :rtype: str
+    """
+
+    if isinstance(content, dict):
+        return entry_etag(tuple(content.items()))
+    return compute_etag(
+        "".join(entry_etag(tuple(entry.items())) for entry in content).encode()
+    )
+
+
+def item_etag(item: Item) -> str:
+    """Compute ETag of Item representation returned by the API.
+
+    :param item: Item object.
+    :type item: Item
+    :returns: Quoted entity tag.
+    :rtype: str
+    """
+
+    return content_etag(ItemSchema.from_orm(item).dict())
+
+
+def etag_matches(header: str | None, etag: str | None, weak: bool = False) -> bool:
+    """Check whether conditional header lists provided ETag.
+
+    :param header: Value of If-Match or If-None-Match header.
+    :type header: str | None
+    :param etag: Current entity tag, None when resource does not exist.
+    :type etag: str | None
+    :param weak: Use weak comparison, as required by If-None-Match. Default: False.
+    :type weak: bool
+    :returns: Information that header matches current entity tag.
+    :rtype: bool
+    """
+
+    if header is None or etag is None:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    if "*" in tags:
+        return True
+    if weak:
+        tags = [tag.removeprefix("W/") for tag in tags]
+    return etag in tags
+
+
+def conditional_response(
+    request: Request, content: dict | list[dict], headers: dict[str, str] | None = None
+) -> Response:
+    """Prepare JSON response with ETag, or 304 when client copy is current.
+
+    Body is serialized only when tag does not match.
+
+    :param request: Incoming request with optional If-None-Match header.
+    :type request: Request
+    :param content: JSON object or list of objects.
+    :type content: dict | list[dict]
+    :param headers: Additional response headers.
+    :type headers: dict[str, str] | None
+    :returns: Response object.
+    :rtype: Response
+    """
+
+    etag = content_etag(content)
+    headers = {**(headers or {}), "ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag, weak=True):
+        return Response(status_code=304, headers=headers)
+    with tracer.start_as_current_span("serialize"):
+        body = serialize_json(content)
+    return Response(body, media_type="application/json", headers=headers)
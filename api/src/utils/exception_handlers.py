@@ -2,7 +2,12 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from src.utils.exceptions import (
     IdNotFound,
+    InvalidCursorError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    InvalidSortError,
     InvalidTokenError,
+    PreconditionFailedError,
     TokenAuthenticationCodeError,
     TokenAuthenticationSchemaError,
     TokenDecodingError,
@@ -12,6 +17,13 @@ from src.utils.exceptions import (
 def exception_handlers(app: FastAPI):
     app.add_exception_handler(Exception, internal_server_error_handler)
     app.add_exception_handler(IdNotFound, id_not_found_error_handler)
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_error_handler)
+    app.add_exception_handler(InvalidFieldsError, invalid_fields_error_handler)
+    app.add_exception_handler(InvalidSortError, invalid_sort_error_handler)
+    app.add_exception_handler(InvalidFilterError, invalid_filter_error_handler)
+    app.add_exception_handler(
+        PreconditionFailedError, precondition_failed_error_handler
+    )
     app.add_exception_handler(TokenDecodingError, decoding_token_error_handler)
     app.add_exception_handler(
         TokenAuthenticationSchemaError, token_authentication_schema_error_handler
@@ -36,6 +48,41 @@ def id_not_found_error_handler(request: Request, exc: IdNotFound):
     )
 
 
+def invalid_cursor_error_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content="Invalid cursor",
+    )
+
+
+def invalid_fields_error_handler(request: Request, exc: InvalidFieldsError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content="Invalid fields",
+    )
+
+
+def invalid_sort_error_handler(request: Request, exc: InvalidSortError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content="Invalid sort",
+    )
+
+
+def invalid_filter_error_handler(request: Request, exc: InvalidFilterError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content="Invalid filter",
+    )
+
+
+def precondition_failed_error_handler(request: Request, exc: PreconditionFailedError):
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content="Precondition failed",
+    )
+
+
 def decoding_token_error_handler(request: Request, exc: TokenDecodingError):
     return JSONResponse(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -29,3 +29,27 @@ class InvalidTokenError(Exception):
 
 class TokenAuthenticationCodeError(Exception):
     """Raised when JWT token code authentication fails."""
+
+
+class KeySetError(Exception):
+    """Raised when JWT signing or verification key cannot be found."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when pagination cursor cannot be decoded."""
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when requested projection contains unknown Item fields."""
+
+
+class InvalidSortError(ValueError):
+    """Raised when requested sort contains unknown Item fields or directions."""
+
+
+class InvalidFilterError(ValueError):
+    """Raised when filter value does not match type of filtered Item field."""
+
+
+class PreconditionFailedError(Exception):
+    """Raised when If-Match header does not match current Item."""
@@ -0,0 +1,258 @@
+"""
+Module contains serialization of Items rows to streaming formats and parsing them back.
+"""
+
+import codecs
+import csv
+import io
+import json
+from collections.abc import Sequence
+
+from pydantic import ValidationError, parse_obj_as
+from src.domain.model import ITEM_COLUMNS, Item
+from src.domain.schema import DataFormat, ItemBaseSchema
+from src.utils.exceptions import (
+    InvalidFieldsError,
+    InvalidFilterError,
+    InvalidSortError,
+)
+
+MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv",
+}
+
+SORT_DIRECTIONS = ("asc", "desc")
+
+
+def parse_fields(fields: str, required: Sequence[str] = ("id",)) -> tuple[str, ...]:
+    """Parse comma separated projection of Item fields.
+
+    Id is always included, because it positions the next page cursor. Fields
+    are returned in table order, so equal projections share cache entries.
+
+    :param fields: Comma separated field names, e.g. title,id.
+    :type fields: str
+    :param required: Fields included even when not requested, e.g. sort keys. Default: id.
+    :type required: Sequence[str]
+    :raises InvalidFieldsError: When unknown field is requested.
+    :returns: Column names starting with id.
+    :rtype: tuple[str, ...]
+    """
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if not requested.issubset(ITEM_COLUMNS):
+        raise InvalidFieldsError(sorted(requested.difference(ITEM_COLUMNS)))
+    requested.update(required)
+    return tuple(
+        column for column in ITEM_COLUMNS if column == "id" or column in requested
+    )
+
+
+def parse_sort(sort: str) -> tuple[tuple[str, str], ...]:
+    """Parse comma separated sort keys of Items page, e.g. completed,title:desc.
+
+    Keys are ascending unless ``desc`` direction is given. Id is appended as
+    the last key unless requested, so order is unique and the next page can be
+    positioned by cursor. It takes direction of the preceding key, which lets
+    a single backward scan of the (column, id) index serve the order. Keys
+    following id cannot change order.
+
+    :param sort: Comma separated field names with optional direction.
+    :type sort: str
+    :raises InvalidSortError: When unknown field or direction is requested,
+        or field is repeated.
+    :returns: Pairs of column name and direction, ending with id.
+    :rtype: tuple[tuple[str, str], ...]
+    """
+
+    keys = []
+    for key in filter(None, (key.strip() for key in sort.split(","))):
+        field, _, direction = key.partition(":")
+        field, direction = field.strip(), direction.strip().lower() or "asc"
+        if (
+            field not in ITEM_COLUMNS
+            or direction not in SORT_DIRECTIONS
+            or field in (name for name, _ in keys)
+        ):
+            raise InvalidSortError(key)
+        keys.append((field, direction))
+        if field == "id":
+            return tuple(keys)
+    return (*keys, ("id", keys[-1][1] if keys else "asc"))
+
+
+def parse_filter_value(
+    filter_field: str | None, filter_value: str | bool | None
+) -> str | bool | None:
+    """Parse filter value to type of filtered field, e.g. true to completed flag.
+
+    :param filter_field: Filtering field name.
+    :type filter_field: str | None
+    :param filter_value: Filter value.
+    :type filter_value: str | bool | None
+    :raises InvalidFilterError: When completion state filter value is not boolean.
+    :returns: Filter value, boolean for completion state filter.
+    :rtype: str | bool | None
+    """
+
+    if filter_field != "completed":
+        return filter_value
+    try:
+        return parse_obj_as(bool, filter_value)
+    except ValidationError as err:
+        raise InvalidFilterError(filter_value) from err
+
+
+def rows_to_objects(
+    rows: Sequence[Sequence], columns: Sequence[str] = ITEM_COLUMNS
+) -> list[dict]:
+    """Map column rows to JSON objects keyed by column name.
+
+    :param rows: Batch of rows.
+    :type rows: Sequence[Sequence]
+    :param columns: Names of row columns. Default: id, title, description, completed.
+    :type columns: Sequence[str]
+    :returns: JSON compatible objects.
+    :rtype: list[dict]
+    """
+
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def format_header(export_format: DataFormat) -> str:
+    """Prepare header preceding exported rows.
+
+    :param export_format: Serialization format.
+    :type export_format: DataFormat
+    :returns: Header chunk, empty for formats without header.
+    :rtype: str
+    """
+
+    if export_format == DataFormat.CSV:
+        return format_rows([ITEM_COLUMNS], export_format)
+    return ""
+
+
+def format_rows(rows: Sequence[Sequence], export_format: DataFormat) -> str:
+    """Serialize batch of (id, title, description, completed) rows.
+
+    :param rows: Batch of rows.
+    :type rows: Sequence[Sequence]
+    :param export_format: Serialization format.
+    :type export_format: DataFormat
+    :returns: Serialized chunk with trailing newline per row.
+    :rtype: str
+    """
+
+    if export_format == DataFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(item, separators=(",", ":")) + "\n" for item in rows_to_objects(rows)
+    )
+
+
+def check_column_lengths(item: ItemBaseSchema) -> ItemBaseSchema:
+    """Check that text fields of Item fit their table columns.
+
+    :param item: Validated Item body.
+    :type item: ItemBaseSchema
+    :raises ValueError: When text is longer than its column allows.
+    :returns: Unchanged Item body.
+    :rtype: ItemBaseSchema
+    """
+
+    for name, value in item.dict().items():
+        length = getattr(Item.__table__.c[name].type, "length", None)
+        if length is not None and len(value) > length:
+            raise ValueError(f"{name} exceeds {length} characters")
+    return item
+
+
+class ItemsStreamParser:
+    """
+    ItemsStreamParser object incrementally parses uploaded NDJSON or CSV body.
+
+    Chunks are fed as they arrive, only the unfinished last record is buffered.
+    Every complete record is validated against ItemBaseSchema and lengths of
+    table columns; invalid records are counted and skipped, so a single row
+    cannot fail COPY of whole batch. CSV body must start with header row naming columns.
+
+    :param data_format: Serialization format of uploaded body.
+    :type data_format: DataFormat
+    """
+
+    def __init__(self, data_format: DataFormat):
+        self.data_format = data_format
+        self.rejected = 0
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__pending = ""
+        self.__columns = None
+
+    def feed(self, chunk: bytes) -> list[ItemBaseSchema]:
+        """Parse chunk of uploaded body.
+
+        :param chunk: Part of uploaded body.
+        :type chunk: bytes
+        :returns: Valid Items completed by the chunk.
+        :rtype: list[ItemBaseSchema]
+        """
+
+        self.__pending += self.__decoder.decode(chunk)
+        records, self.__pending = self.__split_records(self.__pending)
+        return self.__parse_records(records)
+
+    def close(self) -> list[ItemBaseSchema]:
+        """Parse remaining buffered record at the end of uploaded body.
+
+        :returns: Valid Items from remaining record.
+        :rtype: list[ItemBaseSchema]
+        """
+
+        remaining = self.__pending + self.__decoder.decode(b"", final=True)
+        self.__pending = ""
+        return self.__parse_records([remaining])
+
+    def __split_records(self, text: str) -> tuple[list[str], str]:
+        lines = text.split("\n")
+        pending = lines.pop()
+        if self.data_format != DataFormat.CSV:
+            return lines, pending
+        records, record = [], None
+        for line in lines:
+            record = line if record is None else f"{record}\n{line}"
+            if record.count('"') % 2 == 0:
+                records.append(record)
+                record = None
+        if record is not None:
+            pending = f"{record}\n{pending}"
+        return records, pending
+
+    def __parse_records(self, records: list[str]) -> list[ItemBaseSchema]:
+        items = []
+        for record in records:
+            if not record.strip():
+                continue
+            try:
+                values = self.__parse_record(record)
+                if values is not None:
+                    items.append(check_column_lengths(ItemBaseSchema(**values)))
+            except (ValueError, TypeError, csv.Error):
+                self.rejected += 1
+        return items
+
+    def __parse_record(self, record: str) -> dict | None:
+        if self.data_format == DataFormat.CSV:
+            row = next(csv.reader([record]))
+            if self.__columns is None:
+                self.__columns = [column.strip() for column in row]
+                return None
+            if len(row) != len(self.__columns):
+                raise ValueError("Row length does not match header")
+            return dict(zip(self.__columns, row))
+        values = json.loads(record)
+        if not isinstance(values, dict):
+            raise ValueError("Record is not an object")
+        return values
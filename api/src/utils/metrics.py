@@ -0,0 +1,442 @@
+"""
+Module contains Prometheus-style metrics collected in process memory.
+
+Metrics are rendered in Prometheus text exposition format by ``/metrics``
+endpoint. Collection is switched on with ``metrics_enabled`` setting; when it
+is off, recording calls return immediately and neither request middleware nor
+database event hooks are installed.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, event
+from src.config.settings import settings
+from src.utils.operations import instrument_operations
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format label set of single sample.
+
+    :param names: Label names.
+    :type names: Sequence[str]
+    :param values: Label values.
+    :type values: Sequence[str]
+    :returns: Label set in curly braces, empty string without labels.
+    :rtype: str
+    """
+
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    """Format sample value, e.g. bucket bound or observations sum.
+
+    :param value: Sample value.
+    :type value: float
+    :returns: Float literal, +Inf for infinite value.
+    :rtype: str
+    """
+
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Histogram:
+    """
+    Histogram object counts observations in cumulative buckets per label values.
+
+    :param registry: Registry which decides whether observations are recorded.
+    :type registry: MetricsRegistry
+    :param name: Metric name.
+    :type name: str
+    :param description: Metric help text.
+    :type description: str
+    :param labels: Label names. Default: no labels.
+    :type labels: Sequence[str]
+    :param buckets: Upper bounds of buckets in seconds. Default: 1 ms to 10 s.
+    :type buckets: Sequence[float]
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.__registry = registry
+        self.__series: dict[tuple, list] = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """Record single observation.
+
+        :param value: Observed value, e.g. duration in seconds.
+        :type value: float
+        :param label_values: Values of labels in declaration order.
+        :type label_values: str
+        """
+
+        if not self.__registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(label_values)
+            if series is None:
+                series = self.__series[label_values] = [[0] * len(self.buckets), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self) -> list[str]:
+        """Render samples of every label set.
+
+        :returns: Exposition format lines.
+        :rtype: list[str]
+        """
+
+        with self.__lock:
+            series = {
+                key: (list(counts), total)
+                for key, (counts, total) in self.__series.items()
+            }
+        lines = []
+        for label_values, (counts, total) in series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(
+                    self.labels + ("le",), label_values + (format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self):
+        """
+        Forget all observations.
+        """
+
+        with self.__lock:
+            self.__series.clear()
+
+
+class Gauge:
+    """
+    Gauge object reports current values read by callback at scrape time.
+
+    :param name: Metric name.
+    :type name: str
+    :param description: Metric help text.
+    :type description: str
+    :param labels: Label names.
+    :type labels: Sequence[str]
+    :param collect: Callable returning values keyed by tuple of label values.
+    :type collect: Callable
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str],
+        collect: Callable[[], dict[tuple, float]],
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def samples(self) -> list[str]:
+        """Render samples of every label set.
+
+        :returns: Exposition format lines.
+        :rtype: list[str]
+        """
+
+        return [
+            f"{self.name}{format_labels(self.labels, label_values)} {format_value(value)}"
+            for label_values, value in self.collect().items()
+        ]
+
+    def clear(self):
+        """
+        Gauges keep no state, values are read on every scrape.
+        """
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry object keeps metrics and renders them for scraping.
+
+    :param enabled: Record observations. Default: False.
+    :type enabled: bool
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.__metrics: dict[str, Histogram | Gauge] = {}
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register histogram.
+
+        :param name: Metric name.
+        :type name: str
+        :param description: Metric help text.
+        :type description: str
+        :param labels: Label names. Default: no labels.
+        :type labels: Sequence[str]
+        :param buckets: Upper bounds of buckets. Default: 1 ms to 10 s.
+        :type buckets: Sequence[float]
+        :returns: Registered histogram.
+        :rtype: Histogram
+        """
+
+        return self.__register(Histogram(self, name, description, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str],
+        collect: Callable[[], dict[tuple, float]],
+    ) -> Gauge:
+        """Register gauge read by callback at scrape time.
+
+        :param name: Metric name.
+        :type name: str
+        :param description: Metric help text.
+        :type description: str
+        :param labels: Label names.
+        :type labels: Sequence[str]
+        :param collect: Callable returning values keyed by tuple of label values.
+        :type collect: Callable
+        :returns: Registered gauge.
+        :rtype: Gauge
+        """
+
+        return self.__register(Gauge(name, description, labels, collect))
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format.
+
+        :returns: Exposition format document.
+        :rtype: str
+        """
+
+        lines = []
+        for metric in self.__metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """
+        Forget all recorded observations.
+        """
+
+        for metric in self.__metrics.values():
+            metric.clear()
+
+    def __register(self, metric):
+        if metric.name in self.__metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self.__metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry(settings.metrics_enabled)
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status code.",
+    ("method", "route", "status"),
+)
+query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Database statement latency by repository method.",
+    ("operation",),
+)
+auth_duration = registry.histogram(
+    "auth_verification_duration_seconds",
+    "JWT token verification latency by outcome.",
+    ("outcome",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency of HTTP requests.
+
+    Requests are labelled with route path template instead of raw path, so
+    Item ids do not create a label set each. Unknown paths share
+    ``unmatched`` route label.
+
+    :param app: Wrapped ASGI application.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route_template(scope),
+                str(status),
+            )
+
+
+def route_template(scope: Scope) -> str:
+    """Find path template of route serving request.
+
+    :param scope: ASGI connection scope.
+    :type scope: Scope
+    :returns: Route path, e.g. /items/{item_id}, or unmatched.
+    :rtype: str
+    """
+
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+def instrument_engine(engine: Engine):
+    """Record latency of every statement executed by engine.
+
+    Statements are labelled with repository method running them, see
+    ``track_operations``.
+
+    :param engine: Synchronous engine, or ``sync_engine`` of asynchronous one.
+    :type engine: Engine
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None:
+            context.metrics_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        started = getattr(context, "metrics_query_started", None)
+        if started is not None:
+            query_duration.observe(
+                time.perf_counter() - started, current_operation.get()
+            )
+
+
+def track_operations(cls: type) -> type:
+    """Label statements executed by public methods of class with method name.
+
+    Methods called by another labelled method keep the outer method's label.
+
+    :param cls: Repository class.
+    :type cls: type
+    :returns: The same class with wrapped methods.
+    :rtype: type
+    """
+
+    return instrument_operations(cls, operation_label)
+
+
+def operation_label(name: str) -> AbstractContextManager | None:
+    """Open scope labelling statements with operation name.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    :returns: Context manager providing factory of label scopes, None when
+        metrics are disabled or outer operation is labelled.
+    :rtype: AbstractContextManager | None
+    """
+
+    if not registry.enabled or current_operation.get() != "other":
+        return None
+    return nullcontext(functools.partial(labelled, name))
+
+
+@contextmanager
+def labelled(name: str) -> Iterator[None]:
+    """Label statements executed in enclosed block with operation name.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    """
+
+    token = current_operation.set(name)
+    try:
+        yield
+    finally:
+        current_operation.reset(token)
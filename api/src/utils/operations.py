@@ -0,0 +1,157 @@
+"""
+Module contains instrumentation of public methods of repository classes.
+
+Metrics label and tracing span of repository method are both scopes opened
+around its calls. This module wraps functions, coroutine functions and
+generators alike, so instrumentations only describe their scope. Generators
+activate scope while they run only, so code consuming yielded values between
+iterations is not attributed to the method.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+
+Step = Callable[[], AbstractContextManager]
+Operation = Callable[[str], AbstractContextManager[Step] | None]
+
+
+def instrument_operations(cls: type, operation: Operation) -> type:
+    """Wrap public methods of class in scope of operation named after method.
+
+    :param cls: Repository class.
+    :type cls: type
+    :param operation: Callable returning context manager open for whole call,
+        which provides context manager factory activating scope while method
+        runs, or None when method is not instrumented.
+    :type operation: Callable[[str], AbstractContextManager | None]
+    :returns: The same class with wrapped methods.
+    :rtype: type
+    """
+
+    for name, function in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(function):
+            continue
+        if inspect.isasyncgenfunction(function):
+            wrapper = async_generator_operation(name, function, operation)
+        elif inspect.isgeneratorfunction(function):
+            wrapper = generator_operation(name, function, operation)
+        elif inspect.iscoroutinefunction(function):
+            wrapper = coroutine_operation(name, function, operation)
+        else:
+            wrapper = function_operation(name, function, operation)
+        setattr(cls, name, functools.wraps(function)(wrapper))
+    return cls
+
+
+def function_operation(name: str, function: Callable, operation: Operation) -> Callable:
+    """Run function in scope of operation.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    :param function: Repository method, a function.
+    :type function: Callable
+    :param operation: Callable opening scope of operation.
+    :type operation: Callable[[str], AbstractContextManager | None]
+    :returns: Function opening operation scope around each call.
+    :rtype: Callable
+    """
+
+    def wrapper(*args, **kwargs):
+        scope = operation(name)
+        if scope is None:
+            return function(*args, **kwargs)
+        with scope as step, step():
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def coroutine_operation(
+    name: str, function: Callable, operation: Operation
+) -> Callable:
+    """Await coroutine function in scope of operation.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    :param function: Repository method, a coroutine function.
+    :type function: Callable
+    :param operation: Callable opening scope of operation.
+    :type operation: Callable[[str], AbstractContextManager | None]
+    :returns: Coroutine function opening operation scope around each call.
+    :rtype: Callable
+    """
+
+    async def wrapper(*args, **kwargs):
+        scope = operation(name)
+        if scope is None:
+            return await function(*args, **kwargs)
+        with scope as step, step():
+            return await function(*args, **kwargs)
+
+    return wrapper
+
+
+def generator_operation(
+    name: str, function: Callable, operation: Operation
+) -> Callable:
+    """Iterate generator in scope of operation, active while generator runs.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    :param function: Repository method, a generator function.
+    :type function: Callable
+    :param operation: Callable opening scope of operation.
+    :type operation: Callable[[str], AbstractContextManager | None]
+    :returns: Generator function opening operation scope around each step.
+    :rtype: Callable
+    """
+
+    def wrapper(*args, **kwargs):
+        iterator = function(*args, **kwargs)
+        with operation(name) or nullcontext(nullcontext) as step:
+            try:
+                while True:
+                    with step():
+                        try:
+                            value = next(iterator)
+                        except StopIteration:
+                            return
+                    yield value
+            finally:
+                iterator.close()
+
+    return wrapper
+
+
+def async_generator_operation(
+    name: str, function: Callable, operation: Operation
+) -> Callable:
+    """Iterate asynchronous generator in scope of operation, active while it runs.
+
+    :param name: Operation name, e.g. repository method name.
+    :type name: str
+    :param function: Repository method, an asynchronous generator function.
+    :type function: Callable
+    :param operation: Callable opening scope of operation.
+    :type operation: Callable[[str], AbstractContextManager | None]
+    :returns: Asynchronous generator function opening operation scope around each step.
+    :rtype: Callable
+    """
+
+    async def wrapper(*args, **kwargs):
+        iterator = function(*args, **kwargs)
+        with operation(name) or nullcontext(nullcontext) as step:
+            try:
+                while True:
+                    with step():
+                        try:
+                            value = await iterator.__anext__()
+                        except StopAsyncIteration:
+                            return
+                    yield value
+            finally:
+                await iterator.aclose()
+
+    return wrapper
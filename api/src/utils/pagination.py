@@ -0,0 +1,99 @@
+"""
+Module contains keyset pagination cursor logic.
+
+Cursor is an opaque URL-safe token holding the sort key and the last seen value,
+so the next page can be retrieved with an index seek instead of an offset scan.
+Pages sorted by other columns than id also hold last seen values of these columns.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from src.utils.exceptions import InvalidCursorError
+
+CURSOR_SORT_KEY = "id"
+
+CURSOR_VALUE_TYPES = (str, int, bool)
+
+
+def cursor_sort_key(sort: Sequence[tuple[str, str]]) -> str:
+    """Prepare sort key of pagination cursor.
+
+    Pages ordered by id only keep plain id key, so their cursors stay valid
+    regardless of how sort is spelled.
+
+    :param sort: Pairs of column name and direction, ending with id.
+    :type sort: Sequence[tuple[str, str]]
+    :returns: Sort key, e.g. completed:asc,id:asc.
+    :rtype: str
+    """
+
+    if tuple(sort) == (("id", "asc"),):
+        return CURSOR_SORT_KEY
+    return ",".join(f"{column}:{direction}" for column, direction in sort)
+
+
+def encode_cursor(
+    last_id: int, sort_key: str = CURSOR_SORT_KEY, values: Sequence = ()
+) -> str:
+    """Encode pagination cursor.
+
+    :param last_id: Id of last Item on the current page.
+    :type last_id: int
+    :param sort_key: Name of the column pages are sorted by. Default: id.
+    :type sort_key: str
+    :param values: Values of sort columns preceding id in last Item. Default: none.
+    :type values: Sequence
+    :returns: Opaque pagination cursor.
+    :rtype: str
+    """
+
+    position = {"key": sort_key, "id": last_id}
+    if values:
+        position["values"] = list(values)
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_position(cursor: str, sort_key: str = CURSOR_SORT_KEY) -> tuple[int, tuple]:
+    """Decode position of last Item on the previous page from pagination cursor.
+
+    :param cursor: Opaque pagination cursor.
+    :type cursor: str
+    :param sort_key: Name of the column pages are sorted by. Default: id.
+    :type sort_key: str
+    :returns: Id and values of sort columns preceding id in last Item.
+    :rtype: tuple[int, tuple]
+    """
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        last_id, values = payload["id"], payload.get("values", [])
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError) as err:
+        raise InvalidCursorError from err
+    if (
+        payload.get("key") != sort_key
+        or not isinstance(last_id, int)
+        or not isinstance(values, list)
+        or len(values) != sort_key.count(",")
+        or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values)
+    ):
+        raise InvalidCursorError
+    return last_id, tuple(values)
+
+
+def decode_cursor(cursor: str, sort_key: str = CURSOR_SORT_KEY) -> int:
+    """Decode pagination cursor.
+
+    :param cursor: Opaque pagination cursor.
+    :type cursor: str
+    :param sort_key: Name of the column pages are sorted by. Default: id.
+    :type sort_key: str
+    :returns: Id of last Item on the previous page.
+    :rtype: int
+    """
+
+    return decode_position(cursor, sort_key)[0]
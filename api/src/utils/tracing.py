@@ -0,0 +1,476 @@
+"""
+Module contains request tracing with a span per application layer.
+
+Tracer follows OpenTelemetry API shape (``start_as_current_span``,
+``set_attribute``), so spans can be forwarded to OpenTelemetry SDK or kept in
+memory for tests. Tracing is switched on with ``tracing_exporter`` setting;
+when it is ``none``, spans are not created and neither request middleware nor
+database event hooks are installed.
+
+Durations of spans are summed per phase, the span name part before the first
+dot, and returned to clients in ``Server-Timing`` response header, e.g.
+``auth;dur=0.1, uow;dur=0.2, repository;dur=1.9, db;dur=1.5, serialize;dur=0.3``.
+"""
+
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, event
+from src.config.settings import settings
+from src.utils.operations import instrument_operations
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+EXPORTERS = ("none", "memory", "opentelemetry")
+
+
+class Span:
+    """
+    Span object measures single operation of request.
+
+    :param name: Span name, prefixed with phase, e.g. repository.get_items.
+    :type name: str
+    :param attributes: Span attributes. Default: None.
+    :type attributes: dict | None
+    :param parent: Enclosing span. Default: None, root span.
+    :type parent: Span | None
+    """
+
+    def __init__(
+        self, name: str, attributes: dict | None = None, parent: "Span | None" = None
+    ):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.status = "unset"
+        self.start_time = time.time_ns()
+        self.end_time: int | None = None
+
+    @property
+    def phase(self) -> str:
+        """
+        Phase of request the span belongs to.
+        """
+
+        return self.name.split(".", 1)[0]
+
+    @property
+    def duration(self) -> float:
+        """
+        Span duration in seconds, up to now when span did not end yet.
+        """
+
+        return ((self.end_time or time.time_ns()) - self.start_time) / 1e9
+
+    def set_attribute(self, key: str, value):
+        """Set span attribute.
+
+        :param key: Attribute name, e.g. db.statement.
+        :type key: str
+        :param value: Attribute value.
+        :type value: Any
+        """
+
+        self.attributes[key] = value
+
+    def is_recording(self) -> bool:
+        """Check whether span is still open.
+
+        :returns: Information that span did not end yet.
+        :rtype: bool
+        """
+
+        return self.end_time is None
+
+    def end(self):
+        """
+        Mark span as finished.
+        """
+
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+
+
+class NoopSpan(Span):
+    """
+    NoopSpan object is returned when tracing is disabled and records nothing.
+    """
+
+    def __init__(self):
+        super().__init__("noop")
+        self.end_time = self.start_time
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+request_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class SpanProcessor(ABC):
+    """
+    Base object receiving spans when they start and end.
+    """
+
+    def on_start(self, span: Span):
+        """Handle started span.
+
+        :param span: Started span.
+        :type span: Span
+        """
+
+    @abstractmethod
+    def on_end(self, span: Span):
+        """Handle finished span.
+
+        :param span: Finished span.
+        :type span: Span
+        """
+
+        raise NotImplementedError
+
+
+class InMemorySpanExporter(SpanProcessor):
+    """
+    InMemorySpanExporter object keeps finished spans in memory, e.g. for tests.
+    """
+
+    def __init__(self):
+        self.__spans: list[Span] = []
+        self.__lock = threading.Lock()
+
+    def on_end(self, span: Span):
+        with self.__lock:
+            self.__spans.append(span)
+
+    def get_finished_spans(self) -> list[Span]:
+        """Retrieve finished spans in order they ended.
+
+        :returns: Finished spans.
+        :rtype: list[Span]
+        """
+
+        with self.__lock:
+            return list(self.__spans)
+
+    def clear(self):
+        """
+        Forget finished spans.
+        """
+
+        with self.__lock:
+            self.__spans.clear()
+
+
+class OpenTelemetrySpanProcessor(SpanProcessor):
+    """
+    OpenTelemetrySpanProcessor object mirrors spans with OpenTelemetry API.
+
+    Requires optional ``opentelemetry-api`` package. Spans are exported by
+    whichever tracer provider the deployment configures.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace
+
+        self.__trace = trace
+        self.__tracer = trace.get_tracer("todos_rest_api")
+        self.__spans = {}
+
+    def on_start(self, span: Span):
+        parent = self.__spans.get(id(span.parent)) if span.parent else None
+        self.__spans[id(span)] = self.__tracer.start_span(
+            span.name,
+            context=self.__trace.set_span_in_context(parent) if parent else None,
+            attributes=span.attributes,
+            start_time=span.start_time,
+        )
+
+    def on_end(self, span: Span):
+        native = self.__spans.pop(id(span), None)
+        if native is None:
+            return
+        native.set_attributes(span.attributes)
+        if span.status == "error":
+            native.set_status(self.__trace.Status(self.__trace.StatusCode.ERROR))
+        native.end(end_time=span.end_time)
+
+
+class Tracer:
+    """
+    Tracer object creates spans and hands them to processor.
+
+    :param processor: Processor of spans. Default: None, tracing disabled.
+    :type processor: SpanProcessor | None
+    """
+
+    def __init__(self, processor: SpanProcessor | None = None):
+        self.processor = processor
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Information that spans are recorded.
+        """
+
+        return self.processor is not None
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: dict | None = None
+    ) -> Iterator[Span]:
+        """Measure enclosed block as span, parent of spans started inside it.
+
+        :param name: Span name, prefixed with phase, e.g. repository.get_items.
+        :type name: str
+        :param attributes: Span attributes. Default: None.
+        :type attributes: dict | None
+        :returns: Started span, no-op span when tracing is disabled.
+        :rtype: Iterator[Span]
+        """
+
+        if self.processor is None:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+    def start_span(
+        self, name: str, attributes: dict | None = None, parent: Span | None = None
+    ) -> Span:
+        """Start span without making it current.
+
+        :param name: Span name, prefixed with phase, e.g. db.query.
+        :type name: str
+        :param attributes: Span attributes. Default: None.
+        :type attributes: dict | None
+        :param parent: Enclosing span. Default: None, current span.
+        :type parent: Span | None
+        :returns: Started span.
+        :rtype: Span
+        """
+
+        span = Span(name, attributes, parent or current_span.get())
+        self.processor.on_start(span)
+        return span
+
+    def end_span(self, span: Span):
+        """End span and add its duration to request timings.
+
+        Spans nested in span of the same phase are not added, so the phase is
+        not counted twice.
+
+        :param span: Started span.
+        :type span: Span
+        """
+
+        span.end()
+        timings = request_timings.get()
+        if timings is not None and span.parent is not None:
+            if span.parent.phase != span.phase:
+                timings[span.phase] = timings.get(span.phase, 0.0) + span.duration
+        self.processor.on_end(span)
+
+
+def create_processor(exporter: str) -> SpanProcessor | None:
+    """Create span processor for exporter name.
+
+    :param exporter: Exporter name, one of none, memory or opentelemetry.
+    :type exporter: str
+    :returns: Span processor, None when tracing is disabled.
+    :rtype: SpanProcessor | None
+    """
+
+    if exporter not in EXPORTERS:
+        raise ValueError(f"Unknown tracing exporter: {exporter}")
+    if exporter == "memory":
+        return InMemorySpanExporter()
+    if exporter == "opentelemetry":
+        return OpenTelemetrySpanProcessor()
+    return None
+
+
+tracer = Tracer(create_processor(settings.tracing_exporter))
+
+
+def server_timing(timings: dict[str, float], total: float) -> str:
+    """Format phase durations as Server-Timing header value.
+
+    :param timings: Durations in seconds keyed by phase.
+    :type timings: dict[str, float]
+    :param total: Duration of whole request in seconds.
+    :type total: float
+    :returns: Header value with durations in milliseconds.
+    :rtype: str
+    """
+
+    metrics = [
+        f"{phase};dur={duration * 1e3:.3f}" for phase, duration in timings.items()
+    ]
+    metrics.append(f"total;dur={total * 1e3:.3f}")
+    return ", ".join(metrics)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening root span of request and adding Server-Timing header.
+
+    Header summarises phases finished before response started, so body
+    streamed afterwards, e.g. export, is not included.
+
+    :param app: Wrapped ASGI application.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        timings = {}
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    server_timing(dict(timings), time.perf_counter() - started),
+                )
+                span.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        try:
+            with tracer.start_as_current_span(
+                "request",
+                {"http.method": scope["method"], "http.target": scope["path"]},
+            ) as span:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+
+
+def instrument_engine(engine: Engine):
+    """Record every statement executed by engine as db.query span.
+
+    Spans are children of span current when statement runs, usually
+    repository method span, and carry SQL in ``db.statement`` attribute.
+
+    :param engine: Synchronous engine, or ``sync_engine`` of asynchronous one.
+    :type engine: Engine
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None and tracer.enabled:
+            context.trace_span = tracer.start_span(
+                "db.query",
+                {"db.system": engine.dialect.name, "db.statement": statement},
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        span = getattr(context, "trace_span", None)
+        if span is not None:
+            tracer.end_span(span)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        span = getattr(exception_context.execution_context, "trace_span", None)
+        if span is not None:
+            span.status = "error"
+            tracer.end_span(span)
+
+
+def trace_operations(prefix: str) -> Callable[[type], type]:
+    """Trace public methods of class as spans named after prefix and method.
+
+    :param prefix: Span name prefix, e.g. repository.
+    :type prefix: str
+    :returns: Class decorator.
+    :rtype: Callable[[type], type]
+    """
+
+    def decorator(cls: type) -> type:
+        return instrument_operations(
+            cls, lambda name: operation_span(f"{prefix}.{name}")
+        )
+
+    return decorator
+
+
+def operation_span(name: str) -> AbstractContextManager | None:
+    """Open span of operation, when tracing is enabled.
+
+    :param name: Span name, prefixed with phase, e.g. repository.get_items.
+    :type name: str
+    :returns: Context manager providing factory of scopes making the span
+        current, None when tracing is disabled.
+    :rtype: AbstractContextManager | None
+    """
+
+    return span_scope(name) if tracer.enabled else None
+
+
+@contextmanager
+def span_scope(name: str) -> Iterator[Callable[[], AbstractContextManager]]:
+    """Measure enclosed block as span, marked as error when block raises.
+
+    Generator closed before exhaustion is not an error.
+
+    :param name: Span name, prefixed with phase, e.g. repository.get_items.
+    :type name: str
+    :returns: Factory of scopes making the span current.
+    :rtype: Iterator[Callable[[], AbstractContextManager]]
+    """
+
+    span = tracer.start_span(name)
+    try:
+        yield functools.partial(current, span)
+    except GeneratorExit:
+        raise
+    except BaseException:
+        span.status = "error"
+        raise
+    finally:
+        tracer.end_span(span)
+
+
+@contextmanager
+def current(span: Span) -> Iterator[None]:
+    """Make span parent of spans started in enclosed block.
+
+    :param span: Started span.
+    :type span: Span
+    """
+
+    token = current_span.set(span)
+    try:
+        yield
+    finally:
+        current_span.reset(token)
@@ -1,11 +1,32 @@
+import fnmatch
+from collections import Counter, namedtuple
+from collections.abc import Sequence
+from operator import attrgetter
+
 import pytest
-from src.adapters.repository import AbstractRepository
-from src.adapters.session import PostgreSqlSession
-from src.auth.token_handler import create_token
+from sqlalchemy import Insert, Select
+from src.adapters.cache import CacheStats, item_cache, list_cache
+from src.adapters.repository import AbstractRepository, AsyncAbstractRepository
+from src.adapters.session import AsyncPostgreSqlSession, PostgreSqlSession
+from src.auth.token_handler import create_token, verified_tokens
 from src.azure import key_vault
-from src.domain.model import Item
-from src.domain.schema import ItemBaseSchema
-from src.service_layer.unit_of_work import AbstractUnitOfWork
+from src.config.settings import settings
+from src.domain.model import DEFAULT_SORT, ITEM_COLUMNS, Item
+from src.domain.schema import (
+    FilterMode,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+)
+from src.service_layer.unit_of_work import AbstractUnitOfWork, AsyncAbstractUnitOfWork
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in (item_cache, list_cache, verified_tokens):
+        if cache is not None:
+            cache.clear()
+            cache.stats = CacheStats()
 
 
 @pytest.fixture
@@ -45,6 +66,11 @@ def fake_uow(test_items):
     return FakeUnitOfWork(test_items)
 
 
+@pytest.fixture
+def fake_async_uow(test_items):
+    return FakeAsyncUnitOfWork(test_items)
+
+
 @pytest.fixture
 def mock_postgres_connection(monkeypatch, session_fixture):
     def mock_connection(*args, **kwargs):
@@ -61,6 +87,24 @@ def mock_postgres_error_connection(monkeypatch, error_session_fixture):
     monkeypatch.setattr(PostgreSqlSession, "create_session", mock_connection)
 
 
+@pytest.fixture
+def mock_async_postgres_connection(monkeypatch, session_fixture):
+    def mock_connection(*args, **kwargs):
+        return FakeAsyncSession(session_fixture)
+
+    monkeypatch.setattr(AsyncPostgreSqlSession, "create_session", mock_connection)
+    monkeypatch.setattr(settings, "db_async_mode", True)
+
+
+@pytest.fixture
+def mock_async_postgres_error_connection(monkeypatch, error_session_fixture):
+    def mock_connection(*args, **kwargs):
+        return FakeAsyncSession(error_session_fixture)
+
+    monkeypatch.setattr(AsyncPostgreSqlSession, "create_session", mock_connection)
+    monkeypatch.setattr(settings, "db_async_mode", True)
+
+
 @pytest.fixture
 def auth_header():
     token = create_token()
@@ -96,6 +140,12 @@ class FakeCursor:
     def filter(self, *args, **kwargs):
         return self
 
+    def order_by(self, *args):
+        return self
+
+    def with_for_update(self):
+        return self
+
     def offset(self, *args):
         return self
 
@@ -118,13 +168,85 @@ class FakeCursor:
         return True
 
 
+class FakeResult:
+    def __init__(self, values: list):
+        self.values = values
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list:
+        return self.values
+
+    def first(self):
+        return self.values[0] if self.values else None
+
+    def scalar_one(self):
+        return self.values[0]
+
+    def partitions(self):
+        yield self.values
+
+    async def async_partitions(self):
+        yield self.values
+
+
+class FakeCopyCursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql: str, file):
+        self.copies.append((sql, file.read()))
+
+
+class FakeConnection:
+    def __init__(self):
+        self.connection = self
+        self.cursor_object = FakeCopyCursor()
+
+    def cursor(self) -> FakeCopyCursor:
+        return self.cursor_object
+
+
 class FakeSession:
     def __init__(self, results: list[FakeItemBaseSchema]):
         self.results = results
+        self.statements = []
+        self.round_trips = 0
+        self.raw_connection = FakeConnection()
+
+    def connection(self) -> FakeConnection:
+        return self.raw_connection
 
     def query(self, *args, **kwargs) -> FakeCursor:
+        self.round_trips += 1
         return FakeCursor(self.results)
 
+    def execute(self, statement, params=None) -> FakeResult:
+        self.statements.append(statement)
+        self.round_trips += 1
+        if isinstance(statement, Select):
+            columns = [column.name for column in statement.selected_columns]
+            row = namedtuple("Row", columns)
+            if columns == ["completed", "count"]:
+                counts = Counter(
+                    result._asdict()["completed"] is True for result in self.results
+                )
+                return FakeResult([row(*count) for count in counts.items()])
+            return FakeResult(
+                [
+                    row(*(result._asdict()[column] for column in columns))
+                    for result in self.results
+                ]
+            )
+        if params:
+            return FakeResult(
+                list(range(len(self.results) + 1, len(self.results) + 1 + len(params)))
+            )
+        if isinstance(statement, Insert):
+            return FakeResult([len(self.results) + 1])
+        return FakeResult([result._asdict()["id"] for result in self.results])
+
     def close(self) -> bool:
         return True
 
@@ -146,10 +268,48 @@ class FakeErrorSession:
     def query(self, *args, **kwargs) -> Exception:
         raise self.exception
 
+    def execute(self, *args, **kwargs) -> Exception:
+        raise self.exception
+
     def close(self) -> bool:
         return True
 
 
+class FakeAsyncConnection:
+    def __init__(self):
+        self.driver_connection = self
+        self.copies = []
+
+    async def get_raw_connection(self):
+        return self
+
+    async def copy_records_to_table(self, table_name: str, records, columns):
+        self.copies.append((table_name, list(records), columns))
+
+
+class FakeAsyncSession:
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+        self.raw_connection = FakeAsyncConnection()
+
+    async def connection(self) -> FakeAsyncConnection:
+        return self.raw_connection
+
+    async def commit(self) -> bool:
+        return True
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+    async def stream(self, statement):
+        result = self.sync_session.execute(statement)
+        result.partitions = result.async_partitions
+        return result
+
+    async def close(self) -> bool:
+        return True
+
+
 class FakeRepository(AbstractRepository):
     def __init__(self, records: list[FakeItemBaseSchema]):
         self.records = records
@@ -160,28 +320,261 @@ class FakeRepository(AbstractRepository):
         offset: int,
         filter_field: str | None,
         filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
     ) -> list[Item]:
-        return [
+        items = [
             Item(**FakeItemBaseSchema._asdict()) for FakeItemBaseSchema in self.records
         ]
+        for name, direction in reversed(sort):
+            items.sort(key=attrgetter(name), reverse=direction == "desc")
+        if after_id is not None:
+            position = [item.id for item in items].index(after_id) + 1
+            items = items[position:]
+        return items[offset : offset + limit]
+
+    def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[tuple]:
+        return [
+            tuple(getattr(item, column) for column in columns)
+            for item in self.get_items(
+                limit,
+                offset,
+                filter_field,
+                filter_value,
+                after_id,
+                filter_mode,
+                sort,
+                after_values,
+            )
+        ]
+
+    def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        return dict(Counter(record._asdict()["completed"] for record in self.records))
+
+    def rollup_counts(self) -> None:
+        pass
 
     def get_item(self, item_id: int) -> Item:
         return Item(**self.records[item_id - 1]._asdict())
 
-    def insert_item(self, item: ItemBaseSchema):
-        self.records.append(FakeItemBaseSchema(item.__dict__))
+    def lock_item(self, item_id: int) -> Item | None:
+        for record in self.records:
+            if record._asdict().get("id") == item_id:
+                return Item(**record._asdict())
+        return None
+
+    def insert_item(self, item: ItemBaseSchema) -> int:
+        return self.insert_items([item])[0]
+
+    def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
+        for record in self.records:
+            if record._asdict().get("id") == item_id:
+                record.data.update(item.dict(exclude_unset=True))
+                return True
+        return False
+
+    def delete_item(self, item_id: int) -> bool:
+        return bool(self.delete_items([item_id]))
+
+    def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        item_ids = []
+        for item in items:
+            item_ids.append(len(self.records) + 1)
+            self.records.append(FakeItemBaseSchema({"id": item_ids[-1], **item.dict()}))
+        return item_ids
+
+    def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        existing_ids = {record._asdict()["id"] for record in self.records}
+        for item in items:
+            if item.id in existing_ids:
+                self.records[item.id - 1] = FakeItemBaseSchema(item.dict())
+        return [item.id for item in items if item.id in existing_ids]
+
+    def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ):
+        rows = [tuple(record._asdict().values()) for record in self.records]
+        for start in range(0, len(rows), batch_size):
+            yield rows[start : start + batch_size]
+
+    def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        return len(self.insert_items(items))
+
+    def delete_items(self, item_ids: list[int]) -> list[int]:
+        deleted_ids = [
+            record._asdict()["id"]
+            for record in self.records
+            if record._asdict()["id"] in item_ids
+        ]
+        self.records[:] = [
+            record for record in self.records if record._asdict()["id"] not in item_ids
+        ]
+        return deleted_ids
 
-    def update_item(self, item_id: int, item: ItemBaseSchema):
-        self.records[item_id - 1] = FakeItemBaseSchema(item.__dict__)
 
-    def delete_item(self, item_id: int):
-        self.records.pop(item_id - 1)
+class FakeUnitOfWork(AbstractUnitOfWork):
+    def __init__(self, records: list[FakeItemBaseSchema]):
+        self.repository = FakeRepository(records)
 
 
-class FakeUnitOfWork(AbstractUnitOfWork):
+class FakeAsyncRepository(AsyncAbstractRepository):
     def __init__(self, records: list[FakeItemBaseSchema]):
         self.repository = FakeRepository(records)
 
+    async def get_items(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[Item]:
+        return self.repository.get_items(
+            limit,
+            offset,
+            filter_field,
+            filter_value,
+            after_id,
+            filter_mode,
+            sort,
+            after_values,
+        )
+
+    async def get_item_rows(
+        self,
+        limit: int,
+        offset: int,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        after_id: int | None = None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        columns: Sequence[str] = ITEM_COLUMNS,
+        sort: Sequence[tuple[str, str]] = DEFAULT_SORT,
+        after_values: Sequence = (),
+    ) -> list[tuple]:
+        return self.repository.get_item_rows(
+            limit,
+            offset,
+            filter_field,
+            filter_value,
+            after_id,
+            filter_mode,
+            columns,
+            sort,
+            after_values,
+        )
+
+    async def count_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+    ) -> dict[bool, int]:
+        return self.repository.count_items(filter_field, filter_value, filter_mode)
+
+    async def rollup_counts(self) -> None:
+        return self.repository.rollup_counts()
+
+    async def get_item(self, item_id: int) -> Item:
+        return self.repository.get_item(item_id)
+
+    async def lock_item(self, item_id: int) -> Item | None:
+        return self.repository.lock_item(item_id)
+
+    async def insert_item(self, item: ItemBaseSchema) -> int:
+        return self.repository.insert_item(item)
+
+    async def update_item(self, item_id: int, item: ItemPatchSchema) -> bool:
+        return self.repository.update_item(item_id, item)
+
+    async def delete_item(self, item_id: int) -> bool:
+        return self.repository.delete_item(item_id)
+
+    async def insert_items(self, items: list[ItemBaseSchema]) -> list[int]:
+        return self.repository.insert_items(items)
+
+    async def update_items(self, items: list[ItemBulkUpdateSchema]) -> list[int]:
+        return self.repository.update_items(items)
+
+    async def delete_items(self, item_ids: list[int]) -> list[int]:
+        return self.repository.delete_items(item_ids)
+
+    async def copy_items(self, items: list[ItemBaseSchema]) -> int:
+        return self.repository.copy_items(items)
+
+    async def stream_items(
+        self,
+        filter_field: str | None,
+        filter_value: str | bool | None,
+        filter_mode: FilterMode = FilterMode.SUBSTRING,
+        batch_size: int = 1000,
+    ):
+        for rows in self.repository.stream_items(
+            filter_field, filter_value, filter_mode, batch_size
+        ):
+            yield rows
+
+
+class FakeAsyncUnitOfWork(AsyncAbstractUnitOfWork):
+    def __init__(self, records: list[FakeItemBaseSchema]):
+        self.repository = FakeAsyncRepository(records)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.expirations = {}
+
+    def get(self, name: str):
+        return self.values.get(name)
+
+    def set(self, name: str, value: str, ex: int | None = None):
+        self.values[name] = value.encode()
+        self.expirations[name] = ex
+
+    def incr(self, name: str):
+        self.values[name] = str(int(self.values.get(name, 0)) + 1).encode()
+
+    def delete(self, *names: str):
+        for name in names:
+            self.values.pop(name, None)
+
+    def scan_iter(self, match: str):
+        return [name for name in self.values if fnmatch.fnmatch(name, match)]
+
+
+class FailingRedis:
+    def __getattr__(self, name: str):
+        def fail(*args, **kwargs):
+            raise ConnectionError("Redis is unavailable")
+
+        return fail
+
 
 class FakeKeyVaultSecret:
     def __init__(self, value) -> None:
@@ -194,6 +587,7 @@ class FakeSecretClient:
         self.secrets = {
             "fake_secret_1": FakeKeyVaultSecret("fake_value_1"),
             "fake_secret_2": FakeKeyVaultSecret("fake_value_2"),
+            "db-name": FakeKeyVaultSecret("vault_db"),
         }
 
     def get_secret(self, secret_name: str) -> FakeKeyVaultSecret:
@@ -1,5 +1,10 @@
+import threading
+import time
+
 import pytest
+from cryptography.fernet import Fernet
 from src.azure.key_vault import AzureVault
+from src.azure.secret_cache import SecretCache
 from src.utils.exceptions import KeyVaultConnectionError, SecretError
 
 
@@ -19,3 +24,49 @@ def test_get_secret_value_raise_secret_error(fake_key_vault_client):
     with pytest.raises(SecretError):
         key_vault = AzureVault("https://test_url")
         key_vault.get_secret("fake_secret_3")
+
+
+def test_get_secrets_fetches_concurrently(monkeypatch, fake_key_vault_client):
+    barrier = threading.Barrier(2, timeout=5)
+    get_secret = AzureVault.get_secret
+
+    def wait_for_each_other(self, secret_name):
+        barrier.wait()
+        return get_secret(self, secret_name)
+
+    monkeypatch.setattr(AzureVault, "get_secret", wait_for_each_other)
+    key_vault = AzureVault("https://test_url")
+    assert key_vault.get_secrets(["fake_secret_1", "fake_secret_2"]) == {
+        "fake_secret_1": "fake_value_1",
+        "fake_secret_2": "fake_value_2",
+    }
+    assert key_vault.get_secrets([]) == {}
+
+
+def test_get_secrets_raise_secret_error(fake_key_vault_client):
+    with pytest.raises(SecretError):
+        AzureVault("https://test_url").get_secrets(["fake_secret_1", "fake_secret_3"])
+
+
+def test_secret_cache_round_trip(tmp_path):
+    path = tmp_path / "secrets"
+    cache = SecretCache(str(path), Fernet.generate_key())
+    assert cache.load(["db-name"]) is None
+    cache.save({"db-name": "vault_db"})
+    assert b"vault_db" not in path.read_bytes()
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert cache.load(["db-name"]) == {"db-name": "vault_db"}
+    assert cache.load(["db-name", "db-user"]) is None
+    assert SecretCache(str(path), Fernet.generate_key()).load(["db-name"]) is None
+
+
+def test_secret_cache_expires(tmp_path):
+    path, key = tmp_path / "secrets", Fernet.generate_key()
+    token = Fernet(key).encrypt_at_time(
+        b'{"db-name": "vault_db"}', int(time.time()) - 120
+    )
+    path.write_bytes(token)
+    assert SecretCache(str(path), key, ttl=60).load(["db-name"]) is None
+    assert SecretCache(str(path), key, ttl=600).load(["db-name"]) == {
+        "db-name": "vault_db"
+    }
@@ -0,0 +1,281 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from src.adapters.cache import (
+    AsyncCachedRepository,
+    CachedRepository,
+    InMemoryCache,
+    RedisCache,
+    create_cache,
+    item_cache,
+    items_page_key,
+    items_stats_key,
+    list_cache,
+)
+from src.adapters.repository import AsyncPostgreSqlRepository, PostgreSqlRepository
+from src.domain.model import ITEM_COLUMNS
+from src.domain.schema import ItemBaseSchema, ItemBulkUpdateSchema
+from src.config.settings import settings
+from src.entrypoints.fastapi_app import app
+from src.service_layer import async_services, services
+from tests.conftest import FailingRedis, FakeAsyncSession, FakeRedis
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(max_size=2, ttl=60)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+    assert cache.get("second") is None
+    assert (cache.get("first"), cache.get("third")) == (1, 3)
+    assert cache.stats.as_dict() == {"hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_in_memory_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.adapters.cache.time.monotonic", lambda: now[0])
+    cache = InMemoryCache(max_size=10, ttl=5)
+    cache.set("key", "value")
+    now[0] = 104.9
+    assert cache.get("key") == "value"
+    now[0] = 105.0
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 1}
+
+
+def test_redis_cache():
+    client = FakeRedis()
+    cache = RedisCache(client, ttl=30)
+    cache.set("item:1", {"id": 1})
+    assert client.expirations == {"todos:item:1": 30}
+    assert cache.get("item:1") == {"id": 1}
+    cache.delete("item:1")
+    assert cache.get("item:1") is None
+    cache.set("item:2", {"id": 2})
+    cache.clear()
+    assert client.values == {}
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_redis_cache_degrades_when_server_fails():
+    cache = RedisCache(FailingRedis(), ttl=30)
+    cache.set("item:1", {"id": 1})
+    assert cache.get("item:1") is None
+    cache.delete("item:1")
+    cache.clear()
+    cache.bump_generation("items")
+    assert cache.generation("items") is None
+    assert cache.stats.as_dict() == {"hits": 0, "misses": 1, "evictions": 0}
+
+
+def test_services_work_when_cache_server_fails(fake_uow):
+    fake_uow.cache = RedisCache(FailingRedis(), ttl=60)
+    fake_uow.list_cache = RedisCache(FailingRedis(), ttl=60)
+    assert len(services.get_items(10, 0, None, None, uow=fake_uow)) == 2
+    assert services.get_stats(None, None, uow=fake_uow)["total"] == 2
+    assert services.get_item(1, fake_uow).id == 1
+    services.delete_item(2, fake_uow)
+    assert len(services.get_items(10, 0, None, None, uow=fake_uow)) == 1
+
+
+def test_async_services_work_when_cache_server_fails(fake_async_uow):
+    fake_async_uow.cache = RedisCache(FailingRedis(), ttl=60)
+    fake_async_uow.list_cache = RedisCache(FailingRedis(), ttl=60)
+    asyncio.run(async_services.delete_item(2, fake_async_uow))
+    results = asyncio.run(
+        async_services.get_items(10, 0, None, None, uow=fake_async_uow)
+    )
+    assert len(results) == 1
+    stats = asyncio.run(async_services.get_stats(None, None, uow=fake_async_uow))
+    assert stats["total"] == 1
+
+
+def test_create_cache():
+    assert isinstance(create_cache("memory", 10, 30), InMemoryCache)
+    assert create_cache("none", 10, 30) is None
+
+
+def test_cache_generations():
+    for cache in (InMemoryCache(max_size=10, ttl=60), RedisCache(FakeRedis(), ttl=60)):
+        assert cache.generation("items") == 0
+        cache.bump_generation("items")
+        cache.bump_generation("items")
+        assert (cache.generation("items"), cache.generation("other")) == (2, 0)
+        assert cache.stats.as_dict() == {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def test_items_page_key_normalizes_parameters():
+    key = items_page_key(0, 10, 0, None, None, None, "substring")
+    assert key.startswith("items:0:")
+    assert key == items_page_key(0, 10, 0, "title", None, None, "prefix")
+    assert key != items_page_key(1, 10, 0, None, None, None, "substring")
+    assert items_page_key(0, 10, 0, "completed", True, None, "substring") == (
+        items_page_key(0, 10, 0, "completed", "true", None, "substring")
+    )
+
+
+def test_cached_repository_serves_repeated_lookups(session_fixture):
+    cache = InMemoryCache(max_size=10, ttl=60)
+    repository = CachedRepository(PostgreSqlRepository(session_fixture), cache)
+    first = repository.get_item(1)
+    session_fixture.results[0].data["title"] = "changed"
+    second = repository.get_item(1)
+    assert first.title == second.title == "test title"
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+    assert repository.get_items(10, 0, None, None)[0].title == "changed"
+
+
+def test_async_cached_repository_serves_repeated_lookups(session_fixture):
+    cache = RedisCache(FakeRedis(), ttl=60)
+    repository = AsyncCachedRepository(
+        AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture)), cache
+    )
+    asyncio.run(repository.get_item(1))
+    result = asyncio.run(repository.get_item(1))
+    assert result.title == "test title"
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_services_invalidate_changed_items(fake_uow):
+    fake_uow.cache = InMemoryCache(max_size=10, ttl=60)
+    for item_id in (1, 2):
+        fake_uow.cache.set(f"item:{item_id}", {"id": item_id})
+    item = ItemBaseSchema(title="new", description="new")
+    services.update_items([ItemBulkUpdateSchema(id=2, **item.dict())], fake_uow)
+    assert fake_uow.cache.get("item:2") is None
+    fake_uow.cache.set("item:2", {"id": 2})
+    services.delete_items([2], fake_uow)
+    assert fake_uow.cache.get("item:2") is None
+    services.update_item(1, item, fake_uow)
+    assert fake_uow.cache.get("item:1") is None
+
+
+def test_async_services_invalidate_changed_items(fake_async_uow):
+    fake_async_uow.cache = RedisCache(FakeRedis(), ttl=60)
+    fake_async_uow.cache.set("item:1", {"id": 1})
+    asyncio.run(async_services.delete_item(1, fake_async_uow))
+    assert fake_async_uow.cache.get("item:1") is None
+
+
+def test_get_items_is_cached_until_write(fake_uow):
+    fake_uow.list_cache = InMemoryCache(max_size=10, ttl=60)
+    first = services.get_items(10, 0, None, None, uow=fake_uow)
+    fake_uow.repository.records[0].data["title"] = "changed"
+    second = services.get_items(10, 0, None, None, uow=fake_uow)
+    services.insert_items([ItemBaseSchema(title="new", description="new")], fake_uow)
+    third = services.get_items(10, 0, None, None, uow=fake_uow)
+    assert [item.title for item in first] == [item.title for item in second]
+    assert [item.title for item in third] == ["changed", "dummy title", "new"]
+    assert fake_uow.list_cache.stats.as_dict() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_get_items_skips_large_pages(fake_uow, monkeypatch):
+    monkeypatch.setattr(settings, "list_cache_max_page_size", 1)
+    fake_uow.list_cache = InMemoryCache(max_size=10, ttl=60)
+    services.get_items(10, 0, None, None, uow=fake_uow)
+    services.get_items(1, 0, None, None, uow=fake_uow)
+    assert len(fake_uow.list_cache) == 1
+
+
+def test_get_items_rows_are_cached_separately(fake_uow):
+    fake_uow.list_cache = InMemoryCache(max_size=10, ttl=60)
+    items = services.get_items(10, 0, None, None, uow=fake_uow)
+    rows = services.get_items(10, 0, None, None, uow=fake_uow, columns=ITEM_COLUMNS)
+    cached = services.get_items(10, 0, None, None, uow=fake_uow, columns=ITEM_COLUMNS)
+    assert [item.id for item in items] == [1, 2]
+    assert (
+        rows
+        == cached
+        == [
+            (1, "test title", "test description", False),
+            (2, "dummy title", "dummy description", True),
+        ]
+    )
+    assert fake_uow.list_cache.stats.as_dict() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_get_stats_is_cached_until_write(fake_uow):
+    fake_uow.list_cache = InMemoryCache(max_size=10, ttl=60)
+    services.get_stats(None, None, uow=fake_uow)
+    services.get_stats(None, None, uow=fake_uow)
+    services.insert_items([ItemBaseSchema(title="new", description="new")], fake_uow)
+    stats = services.get_stats(None, None, uow=fake_uow)
+    assert stats == {"total": 3, "completed": 1, "pending": 2}
+    assert fake_uow.list_cache.stats.as_dict() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_items_page_key_depends_on_sort():
+    key = items_page_key(0, 10, 0, None, None, None, "substring")
+    sort = (("title", "desc"), ("id", "asc"))
+    sorted_key = items_page_key(0, 10, 0, None, None, None, "substring", sort=sort)
+    assert key != sorted_key
+    assert sorted_key != items_page_key(
+        0, 10, 0, None, None, 1, "substring", sort=sort, after_values=["a"]
+    )
+
+
+def test_items_stats_key_normalizes_parameters():
+    key = items_stats_key(0, None, None, "substring")
+    assert key == items_stats_key(0, "title", None, "prefix")
+    assert key != items_stats_key(0, "completed", True, "substring")
+    assert items_stats_key(0, "completed", True, "substring") == items_stats_key(
+        0, "completed", "true", "substring"
+    )
+    assert key != items_page_key(0, 10, 0, None, None, None, "substring")
+
+
+def test_async_get_items_is_cached_until_write(fake_async_uow):
+    fake_async_uow.list_cache = RedisCache(FakeRedis(), ttl=60)
+    asyncio.run(async_services.get_items(10, 0, None, None, uow=fake_async_uow))
+    asyncio.run(async_services.get_items(10, 0, None, None, uow=fake_async_uow))
+    asyncio.run(async_services.delete_item(2, fake_async_uow))
+    results = asyncio.run(
+        async_services.get_items(10, 0, None, None, uow=fake_async_uow)
+    )
+    assert len(results) == 1
+    assert fake_async_uow.list_cache.stats.as_dict() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_endpoint_get_items_is_cached(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    client.get("/items?limit=5", headers=auth_header)
+    client.get("/items?offset=0&limit=5", headers=auth_header)
+    client.request("DELETE", "/items/bulk", json=[2], headers=auth_header)
+    client.get("/items?limit=5", headers=auth_header)
+    result = client.get("/admin/cache", headers=auth_header)
+    assert result.json()["lists"] == {"hits": 1, "misses": 2, "evictions": 0}
+    assert list_cache.generation("items") == 1
+
+
+def test_endpoint_get_item_is_cached(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    client.get("/items/1", headers=auth_header)
+    client.get("/items/1", headers=auth_header)
+    client.patch(
+        "/items/1",
+        json={"title": "new", "description": "new"},
+        headers=auth_header,
+    )
+    client.get("/items/1", headers=auth_header)
+    result = client.get("/admin/cache", headers=auth_header)
+    assert result.status_code == 200
+    assert result.json()["items"] == {"hits": 1, "misses": 2, "evictions": 0}
+    assert item_cache.get("item:1")["title"] == "test title"
@@ -0,0 +1,70 @@
+import json
+
+import orjson
+import pytest
+from fastapi import Request
+from src.config.settings import settings
+from src.domain.model import Item
+from src.utils import etags
+from src.utils.etags import (
+    compute_etag,
+    conditional_response,
+    content_etag,
+    etag_matches,
+    item_etag,
+    serialize_json,
+)
+
+
+def test_compute_etag_is_strong_and_stable():
+    etag = compute_etag(serialize_json({"id": 1}))
+    assert etag == compute_etag(b'{"id":1}')
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != compute_etag(b'{"id":2}')
+
+
+def test_serialize_json_fast_json(monkeypatch):
+    content = [{"id": 1, "title": "zażółć", "completed": False}]
+    expected = json.loads(serialize_json(content))
+    monkeypatch.setattr(settings, "fast_json", True)
+    assert serialize_json(content) == orjson.dumps(content)
+    assert json.loads(serialize_json(content)) == expected
+
+
+def test_item_etag_matches_response_body():
+    item = Item(id=1, title="title", description="description", completed=False)
+    body = b'{"title":"title","description":"description","completed":false,"id":1}'
+    assert item_etag(item) == compute_etag(body)
+
+
+def test_content_etag_changes_with_entries():
+    first, second = {"id": 1, "title": "a"}, {"id": 2, "title": "b"}
+    assert content_etag(first) == compute_etag(serialize_json(first))
+    assert content_etag([first, second]) == content_etag([dict(first), dict(second)])
+    assert content_etag([first, second]) != content_etag([second, first])
+    assert content_etag([first]) != content_etag([{"id": 1, "title": "c"}])
+
+
+def test_conditional_response_skips_serialization_when_not_modified(monkeypatch):
+    content = [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    etag = conditional_response(
+        Request({"type": "http", "headers": []}), content
+    ).headers["etag"]
+
+    def serialize(content):
+        raise AssertionError("Body serialized")
+
+    monkeypatch.setattr(etags, "serialize_json", serialize)
+    request = Request({"type": "http", "headers": [(b"if-none-match", etag.encode())]})
+    assert conditional_response(request, content).status_code == 304
+    with pytest.raises(AssertionError):
+        conditional_response(Request({"type": "http", "headers": []}), content)
+
+
+def test_etag_matches():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches("*", None)
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('W/"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"', weak=True)
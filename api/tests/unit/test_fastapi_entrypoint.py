@@ -2,8 +2,10 @@ import json
 
 import pytest
 from fastapi.testclient import TestClient
+from src.config.settings import settings
 from src.entrypoints.fastapi_app import app
 from src.utils.exceptions import IdNotFound
+from src.utils.pagination import encode_cursor
 
 
 def test_endpoint_get_item(mock_postgres_connection, auth_header):
@@ -75,6 +77,140 @@ def test_endpoint_get_items(mock_postgres_connection, auth_header):
     assert json_response[1].get("completed") == True
 
 
+def test_endpoint_get_items_next_page_link(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?limit=2&offset=0", headers=auth_header)
+    assert result.status_code == 200
+    assert result.links["next"]["url"].endswith(f"?limit=2&cursor={encode_cursor(2)}")
+
+
+def test_endpoint_get_items_last_page_without_link(
+    mock_postgres_connection, auth_header
+):
+    client = TestClient(app)
+    result = client.get("/items?limit=5", headers=auth_header)
+    assert "Link" not in result.headers
+
+
+def test_endpoint_get_items_total_count(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?limit=1&total_count=true", headers=auth_header)
+    assert result.status_code == 200
+    assert result.headers["X-Total-Count"] == "2"
+    assert "X-Total-Count" not in client.get("/items", headers=auth_header).headers
+
+
+def test_endpoint_get_stats(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get(
+        "/items/stats?filter_field=title&filter_value=test", headers=auth_header
+    )
+    assert result.status_code == 200
+    assert result.json() == {"total": 2, "completed": 1, "pending": 1}
+    assert client.get("/items/stats").status_code == 403
+
+
+def test_endpoint_get_items_fast_json(
+    mock_postgres_connection, auth_header, monkeypatch
+):
+    client = TestClient(app)
+    expected = client.get("/items?limit=2", headers=auth_header)
+    monkeypatch.setattr(settings, "fast_json", True)
+    result = client.get("/items?limit=2", headers=auth_header)
+    assert result.status_code == 200
+    assert result.json() == expected.json()
+    assert result.links["next"]["url"].endswith(f"?limit=2&cursor={encode_cursor(2)}")
+
+
+def test_endpoint_get_items_fields(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?limit=2&fields=title, completed", headers=auth_header)
+    assert result.status_code == 200
+    assert result.json() == [
+        {"id": 1, "title": "test title", "completed": False},
+        {"id": 2, "title": "dummy title", "completed": True},
+    ]
+    assert result.links["next"]["url"].endswith(f"cursor={encode_cursor(2)}")
+
+
+def test_endpoint_get_items_invalid_fields(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?fields=id,title_search", headers=auth_header)
+    assert result.status_code == 400
+    assert result.json() == "Invalid fields"
+
+
+def test_endpoint_get_items_sorted(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get(
+        "/items?limit=2&sort=completed:desc&fields=title", headers=auth_header
+    )
+    assert result.json() == [
+        {"id": 1, "title": "test title", "completed": False},
+        {"id": 2, "title": "dummy title", "completed": True},
+    ]
+    next_url = result.links["next"]["url"]
+    cursor = encode_cursor(2, "completed:desc,id:desc", [True])
+    assert next_url.endswith(f"sort=completed%3Adesc&fields=title&cursor={cursor}")
+    assert client.get(next_url, headers=auth_header).status_code == 200
+
+
+def test_endpoint_get_items_invalid_sort(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?sort=secret", headers=auth_header)
+    assert result.status_code == 400
+    assert result.json() == "Invalid sort"
+    result = client.get(
+        f"/items?sort=title&cursor={encode_cursor(1)}", headers=auth_header
+    )
+    assert result.json() == "Invalid cursor"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/items?filter_field=completed&filter_value=foo",
+        "/items/stats?filter_field=completed&filter_value=foo",
+        "/items/export?filter_field=completed",
+    ],
+)
+def test_endpoint_invalid_completed_filter(mock_postgres_connection, auth_header, url):
+    result = TestClient(app).get(url, headers=auth_header)
+    assert result.status_code == 400
+    assert result.json() == "Invalid filter"
+
+
+def test_endpoint_get_items_with_cursor(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get(f"/items?cursor={encode_cursor(1)}", headers=auth_header)
+    assert result.status_code == 200
+
+
+def test_endpoint_get_items_invalid_cursor(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?cursor=invalid", headers=auth_header)
+    assert result.status_code == 400
+    assert result.json() == "Invalid cursor"
+
+
+@pytest.mark.parametrize("filter_mode", ["substring", "fulltext", "prefix"])
+def test_endpoint_get_items_filter_mode(
+    mock_postgres_connection, auth_header, filter_mode
+):
+    client = TestClient(app)
+    result = client.get(
+        f"/items?filter_field=title&filter_value=test&filter_mode={filter_mode}",
+        headers=auth_header,
+    )
+    assert result.status_code == 200
+
+
+def test_endpoint_get_items_invalid_filter_mode(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?filter_mode=regex", headers=auth_header)
+    assert result.status_code == 422
+
+
 def test_endpoint_get_items_missing_token(mock_postgres_connection):
     client = TestClient(app)
     result = client.get("/items")
@@ -112,6 +248,14 @@ def test_endpoint_post_item(mock_postgres_connection, auth_header):
     assert result.status_code == 201
 
 
+def test_endpoint_post_item_location(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    item = {"title": "new", "description": "new"}
+    result = client.post("/items", content=json.dumps(item), headers=auth_header)
+    assert result.status_code == 201
+    assert result.headers["Location"] == "http://testserver/items/3"
+
+
 def test_endpoint_post_invalid_item(mock_postgres_connection, auth_header):
     client = TestClient(app)
     item = {"title": "new", "completed": True}
@@ -160,6 +304,7 @@ def test_endpoint_post_item_raise_exception(
         result = client.post("/items", content=json.dumps(item), headers=auth_header)
         assert result.status_code == 500
 
+
 def test_endpoint_patch_item(mock_postgres_connection, auth_header):
     client = TestClient(app)
     item = {"title": "updated", "description": "updated", "completed": False}
@@ -169,11 +314,18 @@ def test_endpoint_patch_item(mock_postgres_connection, auth_header):
 
 def test_endpoint_patch_invalid_item(mock_postgres_connection, auth_header):
     client = TestClient(app)
-    item = {"description": "updated", "completed": False}
+    item = {"title": None, "completed": False}
     result = client.patch("/items/1", content=json.dumps(item), headers=auth_header)
     assert result.status_code == 422
 
 
+def test_endpoint_patch_partial_item(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    item = {"completed": True}
+    result = client.patch("/items/1", content=json.dumps(item), headers=auth_header)
+    assert result.status_code == 204
+
+
 def test_endpoint_patch_item_missing_token(mock_postgres_connection):
     client = TestClient(app)
     item = {"description": "updated", "completed": False}
@@ -279,8 +431,247 @@ def test_endpoint_delete_item_raise_id_not_found_error(
     assert result.status_code == 404
 
 
+def test_endpoint_export_items_ndjson(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/export", headers=auth_header)
+    lines = [json.loads(line) for line in result.text.splitlines()]
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/x-ndjson"
+    assert [line["id"] for line in lines] == [1, 2]
+
+
+def test_endpoint_export_items_csv(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/export?format=csv", headers=auth_header)
+    assert result.status_code == 200
+    assert result.headers["content-type"].startswith("text/csv")
+    assert 'filename="items.csv"' in result.headers["content-disposition"]
+    assert result.text.splitlines()[0] == "id,title,description,completed"
+    assert len(result.text.splitlines()) == 3
+
+
+def test_endpoint_export_items_invalid_format(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/export?format=xml", headers=auth_header)
+    assert result.status_code == 422
+
+
+def test_endpoint_async_mode_export_items(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/export?format=csv", headers=auth_header)
+    assert result.status_code == 200
+    assert len(result.text.splitlines()) == 3
+
+
+def test_endpoint_import_items_ndjson(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    body = b'{"title": "first", "description": "first"}\n{"title": 1}\n'
+    result = client.post("/items/import", content=body, headers=auth_header)
+    assert result.status_code == 201
+    assert result.json() == {"accepted": 1, "rejected": 1}
+
+
+def test_endpoint_import_items_csv(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    body = b"title,description\nfirst,first\nsecond,second\n"
+    result = client.post("/items/import?format=csv", content=body, headers=auth_header)
+    assert result.status_code == 201
+    assert result.json() == {"accepted": 2, "rejected": 0}
+
+
+def test_endpoint_import_items_rejects_values_exceeding_columns(
+    mock_postgres_connection, auth_header
+):
+    client = TestClient(app)
+    body = json.dumps({"title": "t" * 51, "description": "first"}).encode()
+    body += b'\n{"title": "", "description": ""}\n'
+    result = client.post("/items/import", content=body, headers=auth_header)
+    assert result.status_code == 201
+    assert result.json() == {"accepted": 1, "rejected": 1}
+
+
+def test_endpoint_async_mode_import_items(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    body = b'{"title": "first", "description": "first"}\n'
+    result = client.post("/items/import", content=body, headers=auth_header)
+    assert result.status_code == 201
+    assert result.json() == {"accepted": 1, "rejected": 0}
+
+
+def test_endpoint_post_items(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    items = [
+        {"title": "first", "description": "first"},
+        {"title": "second", "description": "second", "completed": True},
+    ]
+    result = client.post("/items/bulk", content=json.dumps(items), headers=auth_header)
+    assert result.status_code == 201
+    assert result.json() == [
+        {"id": 3, "status": "created"},
+        {"id": 4, "status": "created"},
+    ]
+
+
+def test_endpoint_post_items_exceeds_batch_size(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    items = [{"title": "new", "description": "new"}] * (
+        settings.bulk_max_batch_size + 1
+    )
+    result = client.post("/items/bulk", content=json.dumps(items), headers=auth_header)
+    assert result.status_code == 422
+
+
+def test_endpoint_post_items_empty(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.post("/items/bulk", content="[]", headers=auth_header)
+    assert result.status_code == 422
+
+
+def test_endpoint_patch_items(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    items = [{"id": 1, "title": "updated", "description": "updated"}]
+    result = client.patch("/items/bulk", content=json.dumps(items), headers=auth_header)
+    assert result.status_code == 200
+    assert result.json() == [{"id": 1, "status": "updated"}]
+
+
+def test_endpoint_delete_items(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.request(
+        "DELETE", "/items/bulk", content=json.dumps([1, 9]), headers=auth_header
+    )
+    assert result.status_code == 200
+    assert result.json() == [
+        {"id": 1, "status": "deleted"},
+        {"id": 9, "status": "not_found"},
+    ]
+
+
+def test_endpoint_bulk_missing_token(mock_postgres_connection):
+    client = TestClient(app)
+    result = client.post("/items/bulk", content="[]")
+    assert result.status_code == 403
+
+
+def test_endpoint_async_mode_get_item(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/1", headers=auth_header)
+    assert result.status_code == 200
+    assert result.json().get("id") == 1
+
+
+def test_endpoint_async_mode_get_items(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items", headers=auth_header)
+    assert result.status_code == 200
+    assert [item.get("id") for item in result.json()] == [1, 2]
+
+
+def test_endpoint_async_mode_get_items_fast_json(
+    mock_async_postgres_connection, auth_header, monkeypatch
+):
+    monkeypatch.setattr(settings, "fast_json", True)
+    client = TestClient(app)
+    result = client.get("/items", headers=auth_header)
+    assert result.status_code == 200
+    assert [item.get("id") for item in result.json()] == [1, 2]
+
+
+def test_endpoint_async_mode_get_items_fields(
+    mock_async_postgres_connection, auth_header
+):
+    client = TestClient(app)
+    result = client.get("/items?fields=title", headers=auth_header)
+    assert result.status_code == 200
+    assert result.json() == [
+        {"id": 1, "title": "test title"},
+        {"id": 2, "title": "dummy title"},
+    ]
+
+
+def test_endpoint_async_mode_post_item(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    item = {"title": "new", "description": "new", "completed": True}
+    result = client.post("/items", content=json.dumps(item), headers=auth_header)
+    assert result.status_code == 201
+
+
+def test_endpoint_async_mode_patch_item(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    item = {"title": "updated", "description": "updated", "completed": False}
+    result = client.patch("/items/1", content=json.dumps(item), headers=auth_header)
+    assert result.status_code == 204
+
+
+def test_endpoint_async_mode_delete_item(mock_async_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.delete("/items/1", headers=auth_header)
+    assert result.status_code == 204
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [IdNotFound], indirect=["error_session_fixture"]
+)
+def test_endpoint_async_mode_get_item_raise_id_not_found_error(
+    error_session_fixture, mock_async_postgres_error_connection, auth_header
+):
+    client = TestClient(app)
+    result = client.get("/items/1", headers=auth_header)
+    assert result.status_code == 404
+
+
 def test_get_token(fake_token):
     client = TestClient(app)
     result = client.get("/token")
     assert result.status_code == 200
     assert result.json()["access_token"] == "fake.token.generated"
+
+
+def test_endpoint_get_item_not_modified(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items/1", headers=auth_header)
+    etag = result.headers["etag"]
+    cached = client.get("/items/1", headers={**auth_header, "If-None-Match": etag})
+    changed = client.get("/items/1", headers={**auth_header, "If-None-Match": '"x"'})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert changed.json()["id"] == 1
+
+
+def test_endpoint_get_items_not_modified(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    result = client.get("/items?limit=2", headers=auth_header)
+    cached = client.get(
+        "/items?limit=2",
+        headers={**auth_header, "If-None-Match": f"W/{result.headers['etag']}"},
+    )
+    assert result.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers["link"] == result.headers["link"]
+
+
+def test_endpoint_patch_item_if_match(mock_postgres_connection, auth_header):
+    client = TestClient(app)
+    etag = client.get("/items/1", headers=auth_header).headers["etag"]
+    item = {"title": "new", "description": "new"}
+    stale = client.patch(
+        "/items/1", json=item, headers={**auth_header, "If-Match": '"stale"'}
+    )
+    current = client.patch(
+        "/items/1", json=item, headers={**auth_header, "If-Match": etag}
+    )
+    assert stale.status_code == 412
+    assert current.status_code == 204
+
+
+def test_endpoint_async_mode_delete_item_if_match(
+    mock_async_postgres_connection, auth_header
+):
+    client = TestClient(app)
+    etag = client.get("/items/1", headers=auth_header).headers["etag"]
+    stale = client.delete("/items/1", headers={**auth_header, "If-Match": '"stale"'})
+    current = client.delete("/items/1", headers={**auth_header, "If-Match": etag})
+    assert stale.status_code == 412
+    assert current.status_code == 204
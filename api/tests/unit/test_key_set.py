@@ -0,0 +1,151 @@
+import json
+import os
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+from src.auth import token_handler
+from src.auth.key_set import JsonWebKeySet
+from src.config.settings import Settings, settings
+from src.utils.exceptions import KeySetError, TokenDecodingError
+
+
+def private_jwk(algorithm: str, kid: str) -> dict:
+    match algorithm:
+        case "RS256":
+            key = RSAAlgorithm.to_jwk(
+                rsa.generate_private_key(public_exponent=65537, key_size=2048),
+                as_dict=True,
+            )
+        case "ES256":
+            key = ECAlgorithm.to_jwk(
+                ec.generate_private_key(ec.SECP256R1()), as_dict=True
+            )
+        case _:
+            key = OKPAlgorithm.to_jwk(
+                ed25519.Ed25519PrivateKey.generate(), as_dict=True
+            )
+    return {**key, "kid": kid}
+
+
+def public_jwk(jwk: dict) -> dict:
+    return {
+        name: value
+        for name, value in jwk.items()
+        if name not in ("d", "p", "q", "dp", "dq", "qi")
+    }
+
+
+def write_key_set(path, *keys: dict):
+    path.write_text(json.dumps({"keys": list(keys)}))
+    modified = os.stat(path).st_mtime_ns + 1_000_000
+    os.utime(path, ns=(modified, modified))
+
+
+@pytest.fixture
+def use_key_set(monkeypatch, tmp_path):
+    def configure(algorithm: str, *keys: dict, signing_kid: str | None = None):
+        path = tmp_path / "jwks.json"
+        write_key_set(path, *keys)
+        key_set = JsonWebKeySet(
+            str(path),
+            algorithm,
+            reload_interval=0,
+            on_reload=token_handler.verified_tokens.clear,
+        )
+        monkeypatch.setattr(settings, "jwt_algorithm", algorithm)
+        monkeypatch.setattr(settings, "jwt_signing_kid", signing_kid)
+        monkeypatch.setattr(token_handler, "key_set", key_set)
+        return path
+
+    return configure
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_asymmetric_token_round_trip(use_key_set, algorithm):
+    use_key_set(algorithm, private_jwk(algorithm, "first"))
+    token = token_handler.create_token()["access_token"]
+    assert jwt.get_unverified_header(token) == {
+        "alg": algorithm,
+        "kid": "first",
+        "typ": "JWT",
+    }
+    assert token_handler.decode_token(token)["expires"] > 0
+
+
+def test_asymmetric_token_verified_with_public_key_only(use_key_set, tmp_path):
+    key = private_jwk("ES256", "first")
+    path = use_key_set("ES256", key)
+    token = token_handler.create_token()["access_token"]
+    write_key_set(path, public_jwk(key))
+    assert token_handler.decode_token(token)
+    with pytest.raises(KeySetError):
+        token_handler.create_token()
+
+
+def test_key_rotation_keeps_old_keys_verifying(use_key_set):
+    old, new = private_jwk("RS256", "old"), private_jwk("RS256", "new")
+    path = use_key_set("RS256", old)
+    old_token = token_handler.create_token()["access_token"]
+    write_key_set(path, public_jwk(old), new)
+    new_token = token_handler.create_token()["access_token"]
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert token_handler.decode_token(old_token)
+    assert token_handler.decode_token_cached(old_token)
+    write_key_set(path, new)
+    with pytest.raises(TokenDecodingError):
+        token_handler.decode_token_cached(old_token)
+    assert len(token_handler.verified_tokens) == 0
+    assert token_handler.decode_token(new_token)
+
+
+def test_signing_kid_selects_key(use_key_set):
+    use_key_set(
+        "EdDSA",
+        private_jwk("EdDSA", "first"),
+        private_jwk("EdDSA", "second"),
+        signing_kid="second",
+    )
+    token = token_handler.create_token()["access_token"]
+    assert jwt.get_unverified_header(token)["kid"] == "second"
+
+
+def test_unknown_kid_is_rejected(use_key_set):
+    use_key_set("RS256", private_jwk("RS256", "first"))
+    token = jwt.encode(
+        {"expires": 0},
+        RSAAlgorithm.from_jwk(private_jwk("RS256", "other")),
+        algorithm="RS256",
+        headers={"kid": "other"},
+    )
+    with pytest.raises(TokenDecodingError):
+        token_handler.decode_token(token)
+
+
+def test_hmac_token_rejected_by_asymmetric_configuration(use_key_set):
+    use_key_set("RS256", private_jwk("RS256", "first"))
+    token = jwt.encode({"expires": 0}, "secret", algorithm="HS256")
+    with pytest.raises(TokenDecodingError):
+        token_handler.decode_token(token)
+
+
+def test_missing_key_set_file(tmp_path):
+    key_set = JsonWebKeySet(str(tmp_path / "missing.json"), "RS256")
+    with pytest.raises(KeySetError):
+        key_set.get_key("first")
+
+
+def test_settings_require_key_material():
+    with pytest.raises(ValueError):
+        Settings(jwt_algorithm="RS256")
+    with pytest.raises(ValueError):
+        Settings(jwt_secret="", jwt_algorithm="HS256")
+
+
+@pytest.mark.parametrize("algorithm", ["PS256", "hs256", "none"])
+def test_settings_reject_unsupported_algorithm(algorithm):
+    with pytest.raises(ValueError):
+        Settings(
+            jwt_secret="secret", jwt_jwks_path="keys.json", jwt_algorithm=algorithm
+        )
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from src.adapters.session import EngineRegistry
+from src.auth.token import JWTToken
+from src.auth.token_handler import create_token
+from src.entrypoints.fastapi_app import app
+from src.entrypoints.routers import metrics as metrics_router
+from src.utils import metrics
+from src.utils.metrics import (
+    MetricsMiddleware,
+    MetricsRegistry,
+    current_operation,
+    format_labels,
+    track_operations,
+)
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    monkeypatch.setattr(metrics.registry, "enabled", True)
+    metrics.registry.clear()
+    yield metrics.registry
+    metrics.registry.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram("latency", "Latency.", ("route",), (0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value, "/items")
+    assert registry.render().splitlines() == [
+        "# HELP latency Latency.",
+        "# TYPE latency histogram",
+        'latency_bucket{route="/items",le="0.1"} 1',
+        'latency_bucket{route="/items",le="1.0"} 3',
+        'latency_bucket{route="/items",le="+Inf"} 4',
+        'latency_sum{route="/items"} 6.05',
+        'latency_count{route="/items"} 4',
+    ]
+
+
+def test_disabled_registry_does_not_record():
+    registry = MetricsRegistry()
+    registry.histogram("latency", "Latency.").observe(1)
+    assert "latency_count" not in registry.render()
+
+
+def test_registry_rejects_duplicated_metric():
+    registry = MetricsRegistry()
+    registry.histogram("latency", "Latency.")
+    with pytest.raises(ValueError):
+        registry.gauge("latency", "Latency.", (), dict)
+
+
+def test_format_labels_escapes_values():
+    assert format_labels(("a", "b"), ('say "hi"', "x\\y\n")) == (
+        '{a="say \\"hi\\"",b="x\\\\y\\n"}'
+    )
+    assert format_labels((), ()) == ""
+
+
+def test_middleware_labels_requests_with_route_template(enabled_metrics):
+    metrics_app = FastAPI()
+    metrics_app.add_middleware(MetricsMiddleware)
+    metrics_app.include_router(metrics_router.router)
+
+    @metrics_app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return Response(status_code=204 if item_id else 404)
+
+    client = TestClient(metrics_app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/0")
+    client.get("/unknown")
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    for sample in (
+        'method="GET",route="/items/{item_id}",status="204"} 2',
+        'method="GET",route="/items/{item_id}",status="404"} 1',
+        'method="GET",route="unmatched",status="404"} 1',
+    ):
+        assert f"http_request_duration_seconds_count{{{sample}" in lines
+
+
+def test_metrics_endpoint_disabled_by_default():
+    assert TestClient(app).get("/metrics").status_code == 404
+
+
+def test_track_operations_labels_statements(enabled_metrics, tmp_path):
+    engine = EngineRegistry().get_engine(f"sqlite:///{tmp_path}/metrics.db")
+
+    @track_operations
+    class Repository:
+        def get_item(self):
+            with engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar_one()
+
+        def stream_items(self):
+            with engine.connect() as connection:
+                yield current_operation.get()
+                yield connection.execute(text("SELECT 2")).scalar_one()
+
+        async def count_items(self):
+            return current_operation.get()
+
+    repository = Repository()
+    assert repository.get_item() == 1
+    assert list(repository.stream_items()) == ["stream_items", 2]
+    assert asyncio.run(repository.count_items()) == "count_items"
+    assert current_operation.get() == "other"
+    rendered = enabled_metrics.render()
+    assert 'db_query_duration_seconds_count{operation="get_item"} 1' in rendered
+    assert 'db_query_duration_seconds_count{operation="stream_items"} 1' in rendered
+    engine.dispose()
+
+
+def test_failed_statement_leaves_no_start_time(enabled_metrics, tmp_path):
+    engine = EngineRegistry().get_engine(f"sqlite:///{tmp_path}/failed.db")
+    with engine.connect() as connection:
+        with pytest.raises(Exception):
+            connection.execute(text("SELECT * FROM missing"))
+        connection.rollback()
+        assert connection.execute(text("SELECT 1")).scalar_one() == 1
+        assert "query_started" not in connection.info
+    assert 'db_query_duration_seconds_count{operation="other"} 1' in (
+        enabled_metrics.render()
+    )
+    engine.dispose()
+
+
+def test_nested_operations_keep_outer_label(enabled_metrics, tmp_path):
+    engine = EngineRegistry().get_engine(f"sqlite:///{tmp_path}/nested.db")
+
+    @track_operations
+    class Repository:
+        def get_items(self):
+            return self.get_item_rows()
+
+        def get_item_rows(self):
+            with engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar_one()
+
+    assert Repository().get_items() == 1
+    rendered = enabled_metrics.render()
+    assert 'db_query_duration_seconds_count{operation="get_items"} 1' in rendered
+    assert 'operation="get_item_rows"' not in rendered
+    engine.dispose()
+
+
+def test_pool_gauges(enabled_metrics, tmp_path):
+    registry = EngineRegistry()
+    engine = registry.get_engine(f"sqlite:///{tmp_path}/pool.db")
+    with engine.connect():
+        assert list(registry.pool_status().values()) == [(1, 0)]
+    assert list(registry.pool_status().values()) == [(0, 0)]
+    assert "db_pool_checked_out_connections" in enabled_metrics.render()
+    registry.dispose()
+
+
+def test_auth_verification_timing(enabled_metrics):
+    token = JWTToken()
+    token.verify_token(create_token()["access_token"])
+    token.verify_token("invalid")
+    rendered = enabled_metrics.render()
+    assert 'auth_verification_duration_seconds_count{outcome="valid"} 1' in rendered
+    assert 'auth_verification_duration_seconds_count{outcome="invalid"} 1' in rendered
@@ -0,0 +1,73 @@
+import pytest
+from src.utils.exceptions import (
+    InvalidCursorError,
+    InvalidFilterError,
+    InvalidSortError,
+)
+from src.utils.formatters import parse_filter_value, parse_sort
+from src.utils.pagination import (
+    cursor_sort_key,
+    decode_cursor,
+    decode_position,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == 42
+
+
+@pytest.mark.parametrize("cursor", ["invalid", "e30", "!!!", encode_cursor(1, "title")])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_sorted_cursor_round_trip():
+    sort_key = cursor_sort_key(parse_sort("completed:desc,title"))
+    assert sort_key == "completed:desc,title:asc,id:asc"
+    assert cursor_sort_key(parse_sort("id")) == "id"
+    cursor = encode_cursor(7, sort_key, [True, "a"])
+    assert decode_position(cursor, sort_key) == (7, (True, "a"))
+    assert decode_cursor(encode_cursor(7)) == 7
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        encode_cursor(1, "title:asc,id:asc"),
+        encode_cursor(1, "title:asc,id:asc", ["a", "b"]),
+        encode_cursor(1, "title:asc,id:asc", [["a"]]),
+        encode_cursor(1, "title:asc,id:asc", [None]),
+        encode_cursor(1, "completed:asc,id:asc", [True]),
+    ],
+)
+def test_decode_invalid_sorted_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_position(cursor, "title:asc,id:asc")
+
+
+def test_parse_sort():
+    assert parse_sort("completed:DESC, title") == (
+        ("completed", "desc"),
+        ("title", "asc"),
+        ("id", "asc"),
+    )
+    assert parse_sort("id:desc,title") == (("id", "desc"),)
+    assert parse_sort("title:desc")[-1] == ("id", "desc")
+
+
+@pytest.mark.parametrize("sort", ["title_search", "title:up", "title,title:desc"])
+def test_parse_invalid_sort(sort):
+    with pytest.raises(InvalidSortError):
+        parse_sort(sort)
+
+
+def test_parse_filter_value():
+    assert parse_filter_value("completed", "true") is True
+    assert parse_filter_value("completed", "0") is False
+    assert parse_filter_value("title", "foo") == "foo"
+    with pytest.raises(InvalidFilterError):
+        parse_filter_value("completed", "foo")
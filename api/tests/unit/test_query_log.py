@@ -0,0 +1,183 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from src.adapters.query_log import (
+    EXPLAIN_PREFIX,
+    SlowQueryLog,
+    parameters_shape,
+    slow_query_log,
+)
+from src.adapters.repository import PostgreSqlRepository
+from src.entrypoints.fastapi_app import app
+
+
+class FakeCursor:
+    def __init__(self, plan):
+        self.plan = plan
+        self.executed = None
+        self.closed = False
+
+    def execute(self, statement, parameters):
+        self.executed = (statement, parameters)
+
+    def fetchone(self):
+        return (self.plan,)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDBAPIConnection:
+    def __init__(self, cursor: FakeCursor):
+        self.plan_cursor = cursor
+        self.rolled_back = False
+        self.closed = False
+
+    def cursor(self) -> FakeCursor:
+        return self.plan_cursor
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def fake_connection(dialect: str):
+    return SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+
+
+def test_parameters_shape_hides_values():
+    assert parameters_shape({"title": "secret", "ids": [1, 2]}) == {
+        "title": "str",
+        "ids": "list[2]",
+    }
+    assert parameters_shape(("secret", 1, None)) == ["str", "int", "NoneType"]
+    assert parameters_shape([{"id": 1}, {"id": 2}], executemany=True) == {
+        "rows": 2,
+        "row": {"id": "int"},
+    }
+    assert parameters_shape(None) is None
+
+
+def test_slow_query_log_records_repository_call_site(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/slow.db")
+    log = SlowQueryLog(threshold=0, explain_rate=1)
+    log.instrument(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT, "
+                "description TEXT, completed BOOLEAN)"
+            )
+        )
+        connection.execute(text("INSERT INTO items VALUES (1, 'a', 'b', 0)"))
+    log.clear()
+    with Session(engine) as session:
+        assert PostgreSqlRepository(session, read_only=True).get_item(1).title == "a"
+    [entry] = log.top()
+    assert entry["call_site"] == "PostgreSqlRepository.get_item"
+    assert entry["statement"].startswith("SELECT items.id")
+    assert entry["parameters"] == ["int"]
+    assert entry["count"] == 1 and entry["plan"] is None
+    engine.dispose()
+
+
+def test_slow_query_log_skips_fast_statements(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fast.db")
+    log = SlowQueryLog(threshold=10)
+    log.instrument(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert log.top() == []
+    assert not SlowQueryLog().enabled
+    engine.dispose()
+
+
+def test_slow_query_log_keeps_slowest_statements():
+    log = SlowQueryLog(threshold=0, top_size=2)
+    log.record("SELECT 1", None, 0.2, "get_item")
+    log.record("SELECT 1", None, 0.4, "get_item")
+    log.record("SELECT 2", None, 0.1, "get_items")
+    log.record("SELECT 3", None, 0.3, "get_items")
+    log.record("SELECT 4", None, 0.05, "get_items")
+    top = log.top()
+    assert [entry["statement"] for entry in top] == ["SELECT 1", "SELECT 3"]
+    assert top[0]["count"] == 2
+    assert top[0]["total_duration"] == pytest.approx(0.6)
+    assert top[0]["max_duration"] == 0.4
+
+
+def test_should_explain_only_sampled_postgresql_selects():
+    log = SlowQueryLog(threshold=0, explain_rate=1)
+    postgresql = fake_connection("postgresql")
+    assert log.should_explain(postgresql, " select * from items", False)
+    assert not log.should_explain(postgresql, "UPDATE items SET title = 'a'", False)
+    assert not log.should_explain(postgresql, "SELECT 1", True)
+    assert not log.should_explain(fake_connection("sqlite"), "SELECT 1", False)
+    assert not SlowQueryLog(0, 0).should_explain(postgresql, "SELECT 1", False)
+
+
+def test_explain_rolls_back_its_connection():
+    plan = [{"Plan": {"Node Type": "Seq Scan"}}]
+    connection = FakeDBAPIConnection(FakeCursor(json.dumps(plan)))
+    log = SlowQueryLog(threshold=0, explain_rate=1)
+    assert log.explain(connection, "SELECT 1", {}) == plan
+    assert connection.plan_cursor.executed == (EXPLAIN_PREFIX + "SELECT 1", {})
+    assert connection.plan_cursor.closed and connection.rolled_back
+
+
+def test_explain_plan_recorded_in_background():
+    plan = [{"Plan": {"Node Type": "Seq Scan"}}]
+    connection = FakeDBAPIConnection(FakeCursor(plan))
+    engine = SimpleNamespace(raw_connection=lambda: connection)
+    log = SlowQueryLog(threshold=0, explain_rate=1)
+    log.record("SELECT 1", {}, 0.5, "get_item")
+    log.schedule_explain(engine, "SELECT 1", {}, "get_item")
+    log.wait(5)
+    assert log.top()[0]["plan"] == plan
+    assert connection.closed
+
+
+def test_failed_explain_keeps_unit_of_work_transaction(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/explain.db")
+    log = SlowQueryLog(threshold=0, explain_rate=1)
+    log.should_explain = lambda connection, statement, executemany: True
+    log.instrument(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+    with Session(engine) as session:
+        session.execute(text("SELECT id FROM items"))
+        session.execute(text("INSERT INTO items VALUES (1)"))
+        session.commit()
+    log.wait(5)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT id FROM items")).scalar_one() == 1
+    assert all(entry["plan"] is None for entry in log.top())
+    engine.dispose()
+
+
+def test_endpoint_slow_queries(auth_header):
+    slow_query_log.record("SELECT 1", {"id_1": "int"}, 0.5, "get_item")
+    client = TestClient(app)
+    try:
+        result = client.get("/admin/slow-queries", headers=auth_header)
+    finally:
+        slow_query_log.clear()
+    assert result.status_code == 200
+    assert result.json() == [
+        {
+            "call_site": "get_item",
+            "statement": "SELECT 1",
+            "count": 1,
+            "total_duration": 0.5,
+            "max_duration": 0.5,
+            "parameters": {"id_1": "int"},
+            "plan": None,
+        }
+    ]
+    assert client.get("/admin/slow-queries").status_code == 403
@@ -1,8 +1,23 @@
+import asyncio
+
 import pytest
-from src.adapters.repository import PostgreSqlRepository
+from sqlalchemy.dialects import postgresql
+from src.adapters.repository import (
+    AsyncPostgreSqlRepository,
+    PostgreSqlRepository,
+    prepare_filter_clause,
+    prepare_keyset_clause,
+)
 from src.domain.model import Item
-from src.domain.schema import ItemBaseSchema
+from src.domain.schema import (
+    FilterMode,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+    ItemSchema,
+)
 from src.utils.exceptions import IdNotFound
+from tests.conftest import FakeAsyncSession
 
 
 def test_get_item(session_fixture):
@@ -47,11 +62,63 @@ def test_gets_item_raise_exception(error_session_fixture):
         repository.get_items()
 
 
+@pytest.mark.parametrize(
+    "filter_field, filter_mode, expected",
+    [
+        ("title", FilterMode.SUBSTRING, "items.title LIKE '%%' || 'te/_st' || '%%'"),
+        ("description", FilterMode.PREFIX, "items.description LIKE 'te/_st' || '%%'"),
+        (
+            "title",
+            FilterMode.FULLTEXT,
+            "items.title_search @@ plainto_tsquery('english'::regconfig, ",
+        ),
+        (
+            "description",
+            FilterMode.FULLTEXT,
+            "items.description_search @@ plainto_tsquery('english'::regconfig, ",
+        ),
+    ],
+)
+def test_prepare_filter_clause(filter_field, filter_mode, expected):
+    clause = prepare_filter_clause(filter_field, "te_st", filter_mode)
+    compiled = clause.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    assert str(compiled).startswith(expected)
+
+
+def test_prepare_filter_clause_escapes_wildcards():
+    clause = prepare_filter_clause("title", "50%", FilterMode.PREFIX)
+    compiled = clause.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    assert "'50/%%'" in str(compiled)
+    assert "ESCAPE '/'" in str(compiled)
+
+
+def test_prepare_filter_clause_completed_ignores_mode():
+    clause = prepare_filter_clause("completed", True, FilterMode.FULLTEXT)
+    assert str(clause) == "items.completed = true"
+
+
+def test_prepare_filter_clause_completed_parses_query_string():
+    clause = prepare_filter_clause("completed", "false")
+    assert str(clause) == "items.completed = false"
+
+
+def test_prepare_filter_clause_unknown_field():
+    assert prepare_filter_clause("unknown", "value") is None
+
+
 def test_insert_item(session_fixture):
     repository = PostgreSqlRepository(session_fixture)
     item = ItemBaseSchema(**{"title": "new", "description": "new", "completed": True})
     result = repository.insert_item(item)
-    assert result == True
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert result == 3
+    assert statement.startswith("INSERT INTO items")
+    assert statement.endswith("RETURNING items.id")
+    assert session_fixture.round_trips == 1
 
 
 @pytest.mark.parametrize(
@@ -73,6 +140,24 @@ def test_update_item(session_fixture):
     assert results == True
 
 
+def test_update_item_writes_only_changed_fields(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    assert repository.update_item(1, ItemPatchSchema(completed=True)) == True
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("UPDATE items SET completed=%(completed)s")
+    assert "items.completed IS DISTINCT FROM true" in statement
+    assert statement.endswith("RETURNING items.id")
+    assert len(session_fixture.statements) == 1
+
+
+def test_update_item_without_fields_skips_write(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    assert repository.update_item(1, ItemPatchSchema()) == True
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("SELECT items.id")
+    assert len(session_fixture.statements) == 1
+
+
 @pytest.mark.parametrize(
     "error_session_fixture", [Exception], indirect=["error_session_fixture"]
 )
@@ -86,7 +171,10 @@ def test_update_item_raise_exception(error_session_fixture):
 def test_delete_item(session_fixture):
     repository = PostgreSqlRepository(session_fixture)
     results = repository.delete_item(1)
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
     assert results == True
+    assert statement == "DELETE FROM items WHERE items.id = %(id_1)s RETURNING items.id"
+    assert session_fixture.round_trips == 1
 
 
 @pytest.mark.parametrize(
@@ -96,3 +184,373 @@ def test_delete_item_raise_exception(error_session_fixture):
     with pytest.raises(Exception):
         repository = PostgreSqlRepository(error_session_fixture)
         repository.delete_item(1)
+
+
+def test_insert_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    items = [
+        ItemBaseSchema(title="first", description="first"),
+        ItemBaseSchema(title="second", description="second", completed=True),
+    ]
+    result = repository.insert_items(items)
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert result == [3, 4]
+    assert statement.startswith("INSERT INTO items")
+    assert statement.endswith("RETURNING items.id")
+
+
+def test_update_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    items = [
+        ItemBulkUpdateSchema(id=1, title="first", description="first"),
+        ItemBulkUpdateSchema(id=2, title="second", description="second"),
+    ]
+    result = repository.update_items(items)
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert result == [1, 2]
+    assert "FROM (VALUES" in statement
+    assert "WHERE items.id = payload.id RETURNING items.id" in statement
+
+
+def test_delete_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    result = repository.delete_items([1, 2])
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert result == [1, 2]
+    assert statement.startswith("DELETE FROM items WHERE items.id = ANY")
+    assert statement.endswith("RETURNING items.id")
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_delete_items_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = PostgreSqlRepository(error_session_fixture)
+        repository.delete_items([1])
+
+
+def test_stream_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    batches = list(repository.stream_items("title", "test", FilterMode.PREFIX, 500))
+    statement = session_fixture.statements[0]
+    assert batches == [
+        [
+            (1, "test title", "test description", False),
+            (2, "dummy title", "dummy description", True),
+        ]
+    ]
+    assert statement.get_execution_options()["yield_per"] == 500
+    assert str(statement.compile(dialect=postgresql.dialect())).endswith(
+        "WHERE (items.title LIKE %(title_1)s || '%%' ESCAPE '/') ORDER BY items.id"
+    )
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_stream_items_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = PostgreSqlRepository(error_session_fixture)
+        list(repository.stream_items(None, None))
+
+
+def test_get_item_rows(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    rows = repository.get_item_rows(10, 0, "completed", "true", after_id=1)
+    statement = session_fixture.statements[0]
+    assert rows[0] == (1, "test title", "test description", False)
+    assert [column.name for column in statement.selected_columns] == [
+        "id",
+        "title",
+        "description",
+        "completed",
+    ]
+    assert "WHERE items.completed = true AND items.id > %(id_1)s ORDER BY" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
+
+
+def test_get_item_rows_sorted_after_position(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    sort = (("completed", "desc"), ("title", "asc"), ("id", "asc"))
+    repository.get_item_rows(10, 0, None, None, 1, sort=sort, after_values=[True, "a"])
+    statement = str(
+        session_fixture.statements[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert statement.endswith(
+        "WHERE items.completed < true "
+        "OR items.completed = true AND items.title > 'a' "
+        "OR items.completed = true AND items.title = 'a' AND items.id > 1 "
+        "ORDER BY items.completed DESC, items.title, items.id \n LIMIT 10 OFFSET 0"
+    )
+
+
+@pytest.mark.parametrize(
+    "sort, after_values, expected",
+    [
+        ((("id", "asc"),), (), "items.id > 1"),
+        ((("id", "desc"),), (), "items.id < 1"),
+        (
+            (("title", "asc"), ("id", "asc")),
+            ("a",),
+            "(items.title, items.id) > ('a', 1)",
+        ),
+        (
+            (("completed", "desc"), ("id", "desc")),
+            (True,),
+            "(items.completed, items.id) < (true, 1)",
+        ),
+        (
+            (("title", "asc"), ("description", "desc"), ("id", "desc")),
+            ("a", "b"),
+            "items.title > 'a' OR items.title = 'a' AND items.description < 'b' "
+            "OR items.title = 'a' AND items.description = 'b' AND items.id < 1",
+        ),
+    ],
+)
+def test_prepare_keyset_clause(sort, after_values, expected):
+    clause = prepare_keyset_clause(1, sort, after_values)
+    assert (
+        str(
+            clause.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        == expected
+    )
+
+
+def test_get_item_rows_projection(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    rows = repository.get_item_rows(10, 0, None, None, columns=("id", "title"))
+    statement = session_fixture.statements[0]
+    assert rows[1] == (2, "dummy title")
+    assert str(statement.compile(dialect=postgresql.dialect())).startswith(
+        "SELECT items.id, items.title \nFROM items"
+    )
+
+
+def test_read_only_get_item(session_fixture):
+    repository = PostgreSqlRepository(session_fixture, read_only=True)
+    result = repository.get_item(1)
+    statement = session_fixture.statements[0]
+    assert ItemSchema.from_orm(result).dict() == {
+        "id": 1,
+        "title": "test title",
+        "description": "test description",
+        "completed": False,
+    }
+    assert "WHERE items.id = %(id_1)s" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
+
+
+def test_read_only_get_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture, read_only=True)
+    results = repository.get_items(10, 0, None, None)
+    assert [result.id for result in results] == [1, 2]
+    assert len(session_fixture.statements) == 1
+
+
+def test_count_items_reads_counter_table(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    assert repository.count_items(None, None) == {False: 1, True: 1}
+    repository.count_items("completed", "true")
+    statements = [
+        str(statement.compile(dialect=postgresql.dialect()))
+        for statement in session_fixture.statements
+    ]
+    assert statements[0] == (
+        "SELECT items_counts.completed, CAST(sum(items_counts.count) AS BIGINT) AS count "
+        "\nFROM items_counts GROUP BY items_counts.completed"
+    )
+    assert (
+        "WHERE items_counts.completed = true GROUP BY items_counts.completed"
+        in statements[1]
+    )
+
+
+def test_rollup_counts_replaces_rows_with_sums(session_fixture):
+    PostgreSqlRepository(session_fixture).rollup_counts()
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith(
+        "WITH removed AS \n(DELETE FROM items_counts "
+        "RETURNING items_counts.completed, items_counts.count)"
+    )
+    assert "INSERT INTO items_counts (completed, count)" in statement
+    assert statement.endswith(
+        "GROUP BY removed.completed \nHAVING sum(removed.count) != %(sum_2)s"
+    )
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_rollup_counts_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        PostgreSqlRepository(error_session_fixture).rollup_counts()
+
+
+def test_async_rollup_counts(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    asyncio.run(repository.rollup_counts())
+    assert len(session_fixture.statements) == 1
+
+
+def test_count_items_with_text_filter_groups_matching_rows(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    assert repository.count_items("title", "test") == {False: 1, True: 1}
+    statement = str(session_fixture.statements[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith(
+        "SELECT items.completed IS true AS completed, count(*) AS count \nFROM items"
+    )
+    assert statement.endswith("GROUP BY items.completed IS true")
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_count_items_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        PostgreSqlRepository(error_session_fixture).count_items(None, None)
+
+
+def test_async_count_items(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    assert asyncio.run(repository.count_items(None, None)) == {False: 1, True: 1}
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_get_item_rows_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = PostgreSqlRepository(error_session_fixture)
+        repository.get_item_rows(10, 0, None, None)
+
+
+def test_lock_item(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    result = repository.lock_item(1)
+    assert result.id == 1
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_lock_item_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = PostgreSqlRepository(error_session_fixture)
+        repository.lock_item(1)
+
+
+def test_copy_items(session_fixture):
+    repository = PostgreSqlRepository(session_fixture)
+    items = [
+        ItemBaseSchema(title="first", description="zażółć"),
+        ItemBaseSchema(title="second", description='with "quotes"', completed=True),
+    ]
+    result = repository.copy_items(items)
+    sql, data = session_fixture.raw_connection.cursor().copies[0]
+    assert result == 2
+    assert sql.startswith("COPY items (title, description, completed) FROM STDIN")
+    assert data.decode() == (
+        '"first","zażółć","False"\r\n' '"second","with ""quotes""","True"\r\n'
+    )
+
+
+def test_copy_items_keeps_empty_strings(session_fixture):
+    items = [ItemBaseSchema(title="t", description="")]
+    PostgreSqlRepository(session_fixture).copy_items(items)
+    _, data = session_fixture.raw_connection.cursor().copies[0]
+    assert data.decode() == '"t","","False"\r\n'
+    session = FakeAsyncSession(session_fixture)
+    asyncio.run(AsyncPostgreSqlRepository(session).copy_items(items))
+    assert session.raw_connection.copies[0][1] == [("t", "", False)]
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_copy_items_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = PostgreSqlRepository(error_session_fixture)
+        repository.copy_items([ItemBaseSchema(title="first", description="first")])
+
+
+def test_async_get_item(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    result = asyncio.run(repository.get_item(1))
+    assert isinstance(result, Item)
+    assert result.id == 1
+    assert result.title == "test title"
+
+
+def test_async_get_items(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    results = asyncio.run(repository.get_items(10, 0, None, None))
+    assert all(isinstance(result, Item) for result in results)
+    assert [result.id for result in results] == [1, 2]
+
+
+def test_async_insert_item(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    item = ItemBaseSchema(**{"title": "new", "description": "new", "completed": True})
+    assert asyncio.run(repository.insert_item(item)) == 3
+
+
+def test_async_update_item(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    item = ItemBaseSchema(**{"title": "new", "description": "new", "completed": True})
+    assert asyncio.run(repository.update_item(1, item)) == True
+
+
+def test_async_delete_item(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    assert asyncio.run(repository.delete_item(1)) == True
+
+
+@pytest.mark.parametrize(
+    "error_session_fixture", [Exception], indirect=["error_session_fixture"]
+)
+def test_async_get_items_raise_exception(error_session_fixture):
+    with pytest.raises(Exception):
+        repository = AsyncPostgreSqlRepository(FakeAsyncSession(error_session_fixture))
+        asyncio.run(repository.get_items(10, 0, None, None))
+
+
+def test_async_bulk_operations(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    item = ItemBulkUpdateSchema(id=1, title="new", description="new")
+    assert asyncio.run(repository.insert_items([item])) == [3]
+    assert asyncio.run(repository.update_items([item])) == [1, 2]
+    assert asyncio.run(repository.delete_items([1])) == [1, 2]
+
+
+def test_async_stream_items(session_fixture):
+    async def collect():
+        repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+        return [rows async for rows in repository.stream_items(None, None)]
+
+    batches = asyncio.run(collect())
+    assert [row[0] for row in batches[0]] == [1, 2]
+
+
+def test_async_get_item_rows(session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    rows = asyncio.run(repository.get_item_rows(10, 0, None, None))
+    assert [row[0] for row in rows] == [1, 2]
+
+
+def test_async_copy_items(session_fixture):
+    session = FakeAsyncSession(session_fixture)
+    repository = AsyncPostgreSqlRepository(session)
+    items = [ItemBaseSchema(title="first", description="first", completed=True)]
+    result = asyncio.run(repository.copy_items(items))
+    assert result == 1
+    assert session.raw_connection.copies == [
+        ("items", [("first", "first", True)], ("title", "description", "completed"))
+    ]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from src.entrypoints.fastapi_app import app
+
+
+@pytest.fixture(params=["mock_postgres_connection", "mock_async_postgres_connection"])
+def connection_mode(request):
+    request.getfixturevalue(request.param)
+
+
+@pytest.mark.parametrize(
+    "method, url, body, expected",
+    [
+        ("GET", "/items", None, 1),
+        ("GET", "/items?fields=title", None, 1),
+        ("GET", "/items/1", None, 1),
+        ("POST", "/items", {"title": "new", "description": "new"}, 1),
+        ("PATCH", "/items/1", {"completed": True}, 1),
+        ("PATCH", "/items/1", {}, 1),
+        ("DELETE", "/items/1", None, 1),
+        ("POST", "/items/bulk", [{"title": "new", "description": "new"}], 1),
+        ("PATCH", "/items/bulk", [{"id": 1, "title": "a", "description": "b"}], 1),
+        ("DELETE", "/items/bulk", [1, 2], 1),
+    ],
+)
+def test_endpoint_round_trips(
+    connection_mode, session_fixture, auth_header, method, url, body, expected
+):
+    client = TestClient(app)
+    content = None if body is None else json.dumps(body)
+    result = client.request(method, url, content=content, headers=auth_header)
+    assert result.status_code < 300
+    assert session_fixture.round_trips == expected
+
+
+def test_endpoint_cached_get_item_round_trips(
+    connection_mode, session_fixture, auth_header
+):
+    client = TestClient(app)
+    client.get("/items/1", headers=auth_header)
+    client.get("/items/1", headers=auth_header)
+    assert session_fixture.round_trips == 1
+
+
+@pytest.mark.parametrize("method", ["PATCH", "DELETE"])
+def test_endpoint_conditional_write_round_trips(
+    connection_mode, session_fixture, auth_header, method
+):
+    client = TestClient(app)
+    etag = client.get("/items/1", headers=auth_header).headers["ETag"]
+    session_fixture.round_trips = 0
+    body = json.dumps({"title": "new"}) if method == "PATCH" else None
+    result = client.request(
+        method, "/items/1", content=body, headers={**auth_header, "If-Match": etag}
+    )
+    assert result.status_code == 204
+    assert session_fixture.round_trips == 2
@@ -1,5 +1,17 @@
-from src.domain.schema import ItemSchema
-from src.service_layer import services
+import asyncio
+
+import pytest
+
+from src.domain.schema import (
+    DataFormat,
+    ItemBaseSchema,
+    ItemBulkUpdateSchema,
+    ItemPatchSchema,
+    ItemSchema,
+)
+from src.service_layer import async_services, services
+from src.utils.etags import item_etag
+from src.utils.exceptions import IdNotFound, PreconditionFailedError
 
 
 def test_get_item(fake_uow):
@@ -22,6 +34,27 @@ def test_get_items(fake_uow):
     assert results[1].completed == True
 
 
+def test_get_items_after_id(fake_uow):
+    results = services.get_items(10, 0, None, None, uow=fake_uow, after_id=1)
+    assert [result.id for result in results] == [2]
+
+
+def test_get_stats(fake_uow):
+    assert services.get_stats(None, None, uow=fake_uow) == {
+        "total": 2,
+        "completed": 1,
+        "pending": 1,
+    }
+
+
+def test_async_get_stats(fake_async_uow):
+    assert asyncio.run(async_services.get_stats(None, None, uow=fake_async_uow)) == {
+        "total": 2,
+        "completed": 1,
+        "pending": 1,
+    }
+
+
 def test_insert_item(fake_uow):
     item = ItemSchema(id=3, title="new", description="new", completed=True)
     services.insert_item(item, fake_uow)
@@ -49,3 +82,214 @@ def test_delete_item(fake_uow):
     result = services.get_items(10, 0, None, None, uow=fake_uow)
     assert len(result) == expected_length
     assert delete_record not in result
+
+
+def test_insert_items(fake_uow):
+    items = [
+        ItemBaseSchema(title="first", description="first"),
+        ItemBaseSchema(title="second", description="second"),
+    ]
+    results = services.insert_items(items, fake_uow)
+    assert [(result.id, result.status) for result in results] == [
+        (3, "created"),
+        (4, "created"),
+    ]
+    assert services.get_item(4, fake_uow).title == "second"
+
+
+def test_update_items(fake_uow):
+    items = [
+        ItemBulkUpdateSchema(id=1, title="first", description="first"),
+        ItemBulkUpdateSchema(id=1, title="last", description="last"),
+        ItemBulkUpdateSchema(id=9, title="missing", description="missing"),
+    ]
+    results = services.update_items(items, fake_uow)
+    assert [(result.id, result.status) for result in results] == [
+        (1, "updated"),
+        (1, "updated"),
+        (9, "not_found"),
+    ]
+    assert services.get_item(1, fake_uow).title == "last"
+
+
+def test_delete_items(fake_uow):
+    results = services.delete_items([2, 9], fake_uow)
+    assert [(result.id, result.status) for result in results] == [
+        (2, "deleted"),
+        (9, "not_found"),
+    ]
+    assert len(services.get_items(10, 0, None, None, uow=fake_uow)) == 1
+
+
+def test_export_items_ndjson(fake_uow):
+    chunks = list(services.export_items(DataFormat.NDJSON, None, None, fake_uow))
+    assert "".join(chunks).splitlines() == [
+        '{"id":1,"title":"test title","description":"test description","completed":false}',
+        '{"id":2,"title":"dummy title","description":"dummy description","completed":true}',
+    ]
+
+
+def test_export_items_csv(fake_uow):
+    chunks = list(
+        services.export_items(DataFormat.CSV, None, None, fake_uow, batch_size=1)
+    )
+    assert chunks == [
+        "id,title,description,completed\n",
+        "1,test title,test description,False\n",
+        "2,dummy title,dummy description,True\n",
+    ]
+
+
+def test_import_items_ndjson(fake_uow):
+    chunks = [
+        b'{"title": "first", "description": "za\xc5',
+        b'\xbc\xc3\xb3\xc5\x82\xc4\x87"}\nnot json\n',
+        b'{"title": "second", "description": "second", "completed": true}',
+    ]
+    result = services.import_items(chunks, DataFormat.NDJSON, fake_uow, batch_size=1)
+    items = services.get_items(10, 0, None, None, uow=fake_uow)
+    assert (result.accepted, result.rejected) == (2, 1)
+    assert [(item.id, item.description) for item in items[2:]] == [
+        (3, "zażółć"),
+        (4, "second"),
+    ]
+
+
+def test_import_items_csv(fake_uow):
+    chunks = [
+        b'description,title,completed\r\n"multi\nline",first,true\r\n',
+        b"second,second,false\nthird,third,not a bool\n",
+    ]
+    result = services.import_items(chunks, DataFormat.CSV, fake_uow)
+    items = services.get_items(10, 0, None, None, uow=fake_uow)
+    assert (result.accepted, result.rejected) == (2, 1)
+    assert [(item.title, item.description, item.completed) for item in items[2:]] == [
+        ("first", "multi\nline", True),
+        ("second", "second", False),
+    ]
+
+
+def test_update_item_partial(fake_uow):
+    services.update_item(1, ItemPatchSchema(completed=True), fake_uow)
+    result = services.get_item(1, fake_uow)
+    assert result.title == "test title"
+    assert result.description == "test description"
+    assert result.completed == True
+
+
+def test_update_item_raise_id_not_found(fake_uow):
+    with pytest.raises(IdNotFound):
+        services.update_item(5, ItemPatchSchema(title="new"), fake_uow)
+
+
+def test_insert_item_return_id(fake_uow):
+    item = ItemBaseSchema(title="new", description="new")
+    assert services.insert_item(item, fake_uow) == 3
+
+
+def test_delete_item_raise_id_not_found(fake_uow):
+    with pytest.raises(IdNotFound):
+        services.delete_item(5, fake_uow)
+
+
+def test_async_delete_item_raise_id_not_found(fake_async_uow):
+    with pytest.raises(IdNotFound):
+        asyncio.run(async_services.delete_item(5, fake_async_uow))
+
+
+def test_update_item_if_match(fake_uow):
+    etag = item_etag(services.get_item(1, fake_uow))
+    item = ItemBaseSchema(title="new", description="new")
+    with pytest.raises(PreconditionFailedError):
+        services.update_item(1, item, fake_uow, if_match='"stale"')
+    with pytest.raises(PreconditionFailedError):
+        services.delete_item(9, fake_uow, if_match="*")
+    services.update_item(1, item, fake_uow, if_match=etag)
+    assert fake_uow.repository.records[0].data["title"] == "new"
+
+
+def test_async_get_item(fake_async_uow):
+    result = asyncio.run(async_services.get_item(1, fake_async_uow))
+    assert result.id == 1
+    assert result.title == "test title"
+    assert result.description == "test description"
+    assert result.completed == False
+
+
+def test_async_get_items(fake_async_uow):
+    results = asyncio.run(
+        async_services.get_items(10, 0, None, None, uow=fake_async_uow)
+    )
+    assert len(results) == 2
+    assert results[0].id == 1
+    assert results[1].id == 2
+
+
+def test_async_insert_item(fake_async_uow):
+    item = ItemSchema(id=3, title="new", description="new", completed=True)
+    asyncio.run(async_services.insert_item(item, fake_async_uow))
+    result = asyncio.run(async_services.get_item(3, fake_async_uow))
+    assert result.id == 3
+    assert result.title == "new"
+
+
+def test_async_update_item(fake_async_uow):
+    item = ItemSchema(id=1, title="updated", description="updated", completed=True)
+    asyncio.run(async_services.update_item(1, item, fake_async_uow))
+    result = asyncio.run(async_services.get_item(1, fake_async_uow))
+    assert result.title == "updated"
+    assert result.completed == True
+
+
+def test_async_delete_item(fake_async_uow):
+    asyncio.run(async_services.delete_item(2, fake_async_uow))
+    result = asyncio.run(
+        async_services.get_items(10, 0, None, None, uow=fake_async_uow)
+    )
+    assert len(result) == 1
+
+
+def test_async_bulk_operations(fake_async_uow):
+    created = asyncio.run(
+        async_services.insert_items(
+            [ItemBaseSchema(title="new", description="new")], fake_async_uow
+        )
+    )
+    updated = asyncio.run(
+        async_services.update_items(
+            [ItemBulkUpdateSchema(id=3, title="updated", description="updated")],
+            fake_async_uow,
+        )
+    )
+    deleted = asyncio.run(async_services.delete_items([3, 4], fake_async_uow))
+    assert [(result.id, result.status) for result in created] == [(3, "created")]
+    assert [(result.id, result.status) for result in updated] == [(3, "updated")]
+    assert [(result.id, result.status) for result in deleted] == [
+        (3, "deleted"),
+        (4, "not_found"),
+    ]
+
+
+def test_async_export_items(fake_async_uow):
+    async def collect():
+        return [
+            chunk
+            async for chunk in async_services.export_items(
+                DataFormat.CSV, None, None, fake_async_uow
+            )
+        ]
+
+    chunks = asyncio.run(collect())
+    assert chunks[0] == "id,title,description,completed\n"
+    assert chunks[1].count("\n") == 2
+
+
+def test_async_import_items(fake_async_uow):
+    async def chunks():
+        yield b"title,description\nfirst,"
+        yield b"first\n"
+
+    result = asyncio.run(
+        async_services.import_items(chunks(), DataFormat.CSV, fake_async_uow)
+    )
+    assert (result.accepted, result.rejected) == (1, 0)
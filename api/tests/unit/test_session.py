@@ -0,0 +1,154 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.adapters import cache
+from src.adapters.session import (
+    AsyncPostgreSqlSession,
+    EngineRegistry,
+    PostgreSqlSession,
+    ReplicaRouter,
+)
+from src.auth.token_handler import create_token
+from src.config.settings import settings
+from src.entrypoints.fastapi_app import app
+from src.entrypoints.routers import items
+
+
+def test_engine_registry_reuses_engine():
+    registry = EngineRegistry()
+    first = PostgreSqlSession(registry)
+    second = PostgreSqlSession(registry)
+    assert registry.get_engine(first.url) is registry.get_engine(second.url)
+    assert registry.get_session_factory(first.url) is registry.get_session_factory(
+        second.url
+    )
+    registry.dispose()
+
+
+def test_engine_registry_applies_pool_settings():
+    registry = EngineRegistry()
+    engine = registry.get_engine(PostgreSqlSession(registry).url)
+    assert engine.pool.size() == settings.db_pool_size
+    assert engine.pool._max_overflow == settings.db_max_overflow
+    assert engine.pool._recycle == settings.db_pool_recycle
+    assert engine.pool._pre_ping == settings.db_pool_pre_ping
+    assert engine.pool._timeout == settings.db_pool_timeout
+    registry.dispose()
+
+
+def test_engine_registry_dispose_forgets_engines():
+    registry = EngineRegistry()
+    url = PostgreSqlSession(registry).url
+    engine = registry.get_engine(url)
+    registry.dispose()
+    assert registry.get_engine(url) is not engine
+    registry.dispose()
+
+
+def test_session_created_from_shared_factory():
+    registry = EngineRegistry()
+    session = PostgreSqlSession(registry).create_session()
+    assert session.get_bind() is registry.get_engine(PostgreSqlSession(registry).url)
+    session.close()
+    registry.dispose()
+
+
+class SqliteSession(PostgreSqlSession):
+    def __init__(self, registry, host=None, directory=None):
+        super().__init__(registry, host)
+        self.directory = directory
+
+    @property
+    def url(self) -> str:
+        return f"sqlite:///{self.directory}/{self.host}.db"
+
+
+def test_session_bound_to_replica_host():
+    session = AsyncPostgreSqlSession(EngineRegistry(), "replica:6543")
+    assert (session.host, session.port) == ("replica", 6543)
+    assert "@replica:6543/" in session.url
+    assert PostgreSqlSession(EngineRegistry(), "other").port == settings.db_port
+
+
+def test_replica_router_round_robin():
+    router = ReplicaRouter(["first", "second"], registry=EngineRegistry())
+    hosts = [router.read_session(PostgreSqlSession).host for _ in range(3)]
+    assert hosts == ["first", "second", "first"]
+
+
+def test_replica_router_without_replicas_reads_primary():
+    router = ReplicaRouter([], registry=EngineRegistry())
+    router.record_write("client")
+    assert router.read_session(PostgreSqlSession, "client").host == settings.db_host
+
+
+def test_replica_router_least_connections(tmp_path):
+    registry = EngineRegistry()
+    router = ReplicaRouter(["first", "second"], "least_connections", registry=registry)
+    session_class = lambda registry, host=None: SqliteSession(registry, host, tmp_path)
+    busy = registry.get_engine(SqliteSession(registry, "first", tmp_path).url)
+    with busy.connect():
+        assert router.read_session(session_class).host == "second"
+        with registry.get_engine(
+            SqliteSession(registry, "second", tmp_path).url
+        ).connect(), busy.connect():
+            assert router.read_session(session_class).host == "second"
+    assert registry.checked_out(busy.url.render_as_string()) == 0
+    registry.dispose()
+
+
+def test_replica_router_read_your_writes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    router = ReplicaRouter(["replica"], sticky_window=5, registry=EngineRegistry())
+    router.record_write("writer")
+    assert router.read_session(PostgreSqlSession, "writer").host == settings.db_host
+    assert router.read_session(PostgreSqlSession, "reader").host == "replica"
+    now[0] += 5
+    assert router.read_session(PostgreSqlSession, "writer").host == "replica"
+
+
+def test_replica_router_replica_reads_do_not_fill_cache_after_write(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    shared = cache.InMemoryCache(10, 60)
+    router = ReplicaRouter(["replica"], sticky_window=5, registry=EngineRegistry())
+    replica = router.read_session(PostgreSqlSession, "reader")
+    assert router.read_cache(shared, replica) is shared
+    router.record_write("writer")
+    primary = router.read_session(PostgreSqlSession, "writer")
+    assert router.read_cache(shared, primary) is shared
+    view = router.read_cache(shared, replica)
+    view.set("key", "stale")
+    assert view.get("key") is None and len(shared) == 0
+    shared.set("key", "fresh")
+    assert view.get("key") == "fresh"
+    now[0] += 5
+    assert router.read_cache(shared, replica) is shared
+    assert router.read_cache(None, replica) is None
+
+
+def test_replica_router_unknown_strategy():
+    with pytest.raises(ValueError):
+        ReplicaRouter(["replica"], "random")
+
+
+def test_endpoint_reads_from_replica_until_client_writes(
+    monkeypatch, session_fixture, auth_header
+):
+    hosts = []
+
+    def create_session(self):
+        hosts.append(self.host)
+        return session_fixture
+
+    router = ReplicaRouter(["replica"], registry=EngineRegistry())
+    monkeypatch.setattr(items, "replica_router", router)
+    monkeypatch.setattr(PostgreSqlSession, "create_session", create_session)
+    client = TestClient(app)
+    client.get("/items", headers=auth_header)
+    client.post("/items", json={"title": "a", "description": "b"}, headers=auth_header)
+    client.get("/items/1", headers=auth_header)
+    monkeypatch.setattr(settings, "jwt_token_expiration", 60)
+    other_token = create_token()["access_token"]
+    client.get("/items/2", headers={"Authorization": f"Bearer {other_token}"})
+    assert hosts == ["replica", settings.db_host, settings.db_host, "replica"]
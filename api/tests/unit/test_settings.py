@@ -0,0 +1,144 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from cryptography.fernet import Fernet
+from src.azure import key_vault
+from src.config import settings as settings_module
+from src.config.settings import (
+    Settings,
+    get_settings,
+    prepare_settings,
+    refresh_settings,
+    settings,
+)
+from src.entrypoints import fastapi_app
+
+API_ROOT = Path(__file__).parents[2]
+IMPORT_TIME_BUDGET = 0.25
+
+
+def import_times(module: str) -> dict[str, int]:
+    env = {
+        name: value for name, value in os.environ.items() if not name.startswith("COV_")
+    }
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_time, _, name = line.split("|")
+        times[name.strip()] = int(self_time.removeprefix("import time:"))
+    return times
+
+
+def test_settings_forward_to_cached_settings(monkeypatch):
+    assert isinstance(get_settings(), Settings)
+    assert get_settings() is get_settings()
+    assert settings.db_table_name == get_settings().db_table_name
+    monkeypatch.setattr(settings, "db_table_name", "patched")
+    assert get_settings().db_table_name == "patched"
+
+
+@pytest.fixture
+def cloud_environment(monkeypatch, fake_key_vault_client):
+    monkeypatch.setenv("credential_type", "cloud")
+    monkeypatch.setenv("key_vault_url", "https://test_url")
+    monkeypatch.setenv("azure_secrets", '["db-name"]')
+
+
+def rotate_secret(monkeypatch, value):
+    client_class = key_vault.SecretClient
+
+    class RotatedSecretClient(client_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.secrets["db-name"] = SimpleNamespace(value=value)
+
+    monkeypatch.setattr(key_vault, "SecretClient", RotatedSecretClient)
+
+
+def test_prepare_settings_reads_secrets_from_key_vault(cloud_environment):
+    assert prepare_settings().db_name == "vault_db"
+
+
+def test_prepare_settings_reuses_secret_cache(monkeypatch, cloud_environment, tmp_path):
+    monkeypatch.setenv("secret_cache_path", str(tmp_path / "secrets"))
+    monkeypatch.setenv("secret_cache_key", Fernet.generate_key().decode())
+    assert prepare_settings().db_name == "vault_db"
+    rotate_secret(monkeypatch, "rotated_db")
+    assert prepare_settings().db_name == "vault_db"
+    monkeypatch.delenv("secret_cache_key")
+    with pytest.raises(ValueError):
+        prepare_settings()
+
+
+def test_refresh_settings_applies_rotated_secrets(monkeypatch, cloud_environment):
+    current = prepare_settings()
+    monkeypatch.setattr(settings_module, "get_settings", lambda: current)
+    assert refresh_settings() == set()
+    rotate_secret(monkeypatch, "rotated_db")
+    assert refresh_settings() == {"db_name"}
+    assert current.db_name == "rotated_db"
+
+
+def test_refresh_settings_skipped_for_local_credentials():
+    assert refresh_settings() == set()
+
+
+def test_refresh_secrets_releases_stale_credentials(monkeypatch):
+    disposed = []
+    monkeypatch.setattr(
+        fastapi_app, "refresh_settings", lambda: {"db_password", "jwt_secret"}
+    )
+    monkeypatch.setattr(
+        fastapi_app.engine_registry, "dispose", lambda: disposed.append("sync")
+    )
+    fastapi_app.verified_tokens.set("token", {"expires": 0}, ttl=60)
+
+    async def refresh_once():
+        refresh = asyncio.create_task(fastapi_app.refresh_secrets(0))
+        while not disposed:
+            await asyncio.sleep(0.01)
+        refresh.cancel()
+
+    asyncio.run(asyncio.wait_for(refresh_once(), 5))
+    assert fastapi_app.verified_tokens.get("token") is None
+
+
+def test_rollup_counts_survives_errors(monkeypatch):
+    rollups = []
+
+    def rollup(uow):
+        rollups.append(uow)
+        raise ConnectionError("Connection refused")
+
+    monkeypatch.setattr(fastapi_app.services, "rollup_counts", rollup)
+    monkeypatch.setattr(fastapi_app, "PostgreSqlSession", lambda: None)
+
+    async def rollup_twice():
+        rollup = asyncio.create_task(fastapi_app.rollup_counts(0))
+        while len(rollups) < 2:
+            await asyncio.sleep(0.01)
+        rollup.cancel()
+
+    asyncio.run(asyncio.wait_for(rollup_twice(), 5))
+    assert isinstance(rollups[0], fastapi_app.PostgreSqlUnitOfWork)
+
+
+def test_local_settings_import_time_budget():
+    times = import_times("src.entrypoints.fastapi_app")
+    assert not [name for name in times if name.split(".")[0] == "azure"]
+    own_time = sum(time for name, time in times.items() if name.startswith("src."))
+    assert own_time < IMPORT_TIME_BUDGET * 1_000_000
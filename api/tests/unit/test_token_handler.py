@@ -0,0 +1,56 @@
+import hashlib
+import time
+
+import jwt
+import pytest
+from src.auth import token_handler
+from src.auth.token_handler import create_token, decode_token_cached, verified_tokens
+from src.config.settings import settings
+from src.utils.exceptions import TokenDecodingError
+
+
+def test_decode_token_cached_verifies_token_once(monkeypatch):
+    calls = []
+    decode_token = token_handler.decode_token
+    monkeypatch.setattr(
+        token_handler,
+        "decode_token",
+        lambda token: calls.append(token) or decode_token(token),
+    )
+    token = create_token()["access_token"]
+    first = decode_token_cached(token)
+    second = decode_token_cached(token)
+    assert first == second
+    assert len(calls) == 1
+    assert verified_tokens.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_decode_token_cached_expires_with_token(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.adapters.cache.time.monotonic", lambda: now[0])
+    payload = {"expires": time.time() + 5}
+    token = jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    decode_token_cached(token)
+    now[0] += 5
+    assert verified_tokens.get(hashlib.sha256(token.encode()).hexdigest()) is None
+
+
+def test_decode_token_cached_does_not_cache_invalid_tokens():
+    token = create_token()["access_token"]
+    decode_token_cached(token)
+    with pytest.raises(TokenDecodingError):
+        decode_token_cached(token[:-2])
+    expired = jwt.encode(
+        {"expires": time.time() - 1},
+        settings.jwt_secret,
+        algorithm=settings.jwt_algorithm,
+    )
+    assert decode_token_cached(expired) is None
+    assert decode_token_cached(expired) is None
+    assert len(verified_tokens) == 1
+
+
+def test_decode_token_cached_disabled(monkeypatch):
+    monkeypatch.setattr(token_handler, "verified_tokens", None)
+    token = create_token()["access_token"]
+    assert decode_token_cached(token)["expires"] > time.time()
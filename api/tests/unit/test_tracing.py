@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from src.adapters.repository import AsyncPostgreSqlRepository
+from src.adapters.session import EngineRegistry
+from src.entrypoints.fastapi_app import app
+from src.utils import tracing
+from src.utils.tracing import (
+    NOOP_SPAN,
+    InMemorySpanExporter,
+    Tracer,
+    TracingMiddleware,
+    create_processor,
+    current_span,
+    request_timings,
+    server_timing,
+    trace_operations,
+)
+from tests.conftest import FakeAsyncSession
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing.tracer, "processor", exporter)
+    return exporter
+
+
+def span_names(exporter: InMemorySpanExporter) -> list[str]:
+    return [span.name for span in exporter.get_finished_spans()]
+
+
+def test_disabled_tracer_yields_noop_span():
+    with Tracer().start_as_current_span("auth") as span:
+        span.set_attribute("key", "value")
+        assert current_span.get() is None
+    assert span is NOOP_SPAN
+    assert span.attributes == {}
+
+
+def test_spans_nest_and_record_errors():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+    with pytest.raises(RuntimeError):
+        with tracer.start_as_current_span("request") as root:
+            with tracer.start_as_current_span("auth", {"user": "a"}) as child:
+                assert current_span.get() is child
+                raise RuntimeError
+    assert current_span.get() is None
+    assert [span.name for span in exporter.get_finished_spans()] == ["auth", "request"]
+    assert child.parent is root and child.attributes == {"user": "a"}
+    assert child.status == root.status == "error"
+    assert not child.is_recording() and child.duration >= 0
+    exporter.clear()
+    assert exporter.get_finished_spans() == []
+
+
+def test_timings_sum_phases_without_nested_spans_of_same_phase():
+    tracer = Tracer(InMemorySpanExporter())
+    timings, outer, queries = {}, [], []
+    token = request_timings.set(timings)
+    try:
+        with tracer.start_as_current_span("request"):
+            for _ in range(2):
+                with tracer.start_as_current_span("repository.get_items") as span:
+                    with tracer.start_as_current_span("repository.get_item_rows"):
+                        with tracer.start_as_current_span("db.query") as query:
+                            queries.append(query)
+                outer.append(span)
+    finally:
+        request_timings.reset(token)
+    assert list(timings) == ["db", "repository"]
+    assert timings["repository"] == pytest.approx(sum(s.duration for s in outer))
+    assert timings["db"] == pytest.approx(sum(s.duration for s in queries))
+
+
+def test_server_timing_header_value():
+    assert server_timing({"auth": 0.0001, "db": 0.00125}, 0.002) == (
+        "auth;dur=0.100, db;dur=1.250, total;dur=2.000"
+    )
+
+
+def test_create_processor():
+    assert create_processor("none") is None
+    assert isinstance(create_processor("memory"), InMemorySpanExporter)
+    with pytest.raises(ValueError):
+        create_processor("zipkin")
+
+
+def test_trace_operations_records_statements(exporter, tmp_path):
+    engine = EngineRegistry().get_engine(f"sqlite:///{tmp_path}/tracing.db")
+
+    @trace_operations("repository")
+    class Repository:
+        def get_item(self):
+            with engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar_one()
+
+        def stream_items(self):
+            yield current_span.get().name
+            with engine.connect() as connection:
+                yield connection.execute(text("SELECT 2")).scalar_one()
+
+        async def count_items(self):
+            return current_span.get().name
+
+    repository = Repository()
+    assert repository.get_item() == 1
+    assert list(repository.stream_items()) == ["repository.stream_items", 2]
+    assert asyncio.run(repository.count_items()) == "repository.count_items"
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == [
+        "db.query",
+        "repository.get_item",
+        "db.query",
+        "repository.stream_items",
+        "repository.count_items",
+    ]
+    assert spans[0].parent is spans[1]
+    assert spans[0].attributes["db.statement"] == "SELECT 1"
+    assert spans[2].parent is spans[3]
+    engine.dispose()
+
+
+def test_trace_operations_marks_errors_but_not_early_close(exporter):
+    @trace_operations("repository")
+    class Repository:
+        def get_item(self):
+            raise RuntimeError
+
+        def stream_items(self):
+            yield from range(3)
+
+    with pytest.raises(RuntimeError):
+        Repository().get_item()
+    items = Repository().stream_items()
+    assert next(items) == 0
+    items.close()
+    failed, closed = exporter.get_finished_spans()
+    assert failed.status == "error"
+    assert closed.name == "repository.stream_items" and closed.status != "error"
+
+
+def test_async_repository_traced_once(exporter, session_fixture):
+    repository = AsyncPostgreSqlRepository(FakeAsyncSession(session_fixture))
+    asyncio.run(repository.count_items(None, None))
+    assert span_names(exporter) == ["repository.count_items"]
+
+
+def test_middleware_adds_server_timing_header(exporter):
+    tracing_app = FastAPI()
+    tracing_app.add_middleware(TracingMiddleware)
+
+    @tracing_app.get("/items")
+    async def get_items():
+        with tracing.tracer.start_as_current_span("repository.get_items"):
+            pass
+        return []
+
+    response = TestClient(tracing_app).get("/items")
+    phases = [
+        metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")
+    ]
+    assert phases == ["repository", "total"]
+    request = exporter.get_finished_spans()[-1]
+    assert request.name == "request"
+    assert request.attributes == {
+        "http.method": "GET",
+        "http.target": "/items",
+        "http.status_code": 200,
+    }
+
+
+def test_endpoint_spans_per_layer(exporter, mock_postgres_connection, auth_header):
+    result = TestClient(app).get("/items", headers=auth_header)
+    assert result.status_code == 200
+    names = span_names(exporter)
+    for name in (
+        "auth",
+        "uow.create",
+        "uow.enter",
+        "repository.get_items",
+        "serialize",
+    ):
+        assert name in names
+    assert "server-timing" not in result.headers
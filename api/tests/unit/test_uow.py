@@ -1,7 +1,12 @@
+import asyncio
+
 import pytest
-from src.adapters.session import PostgreSqlSession
+from src.adapters.session import AsyncPostgreSqlSession, PostgreSqlSession
 from src.domain.model import Item
-from src.service_layer.unit_of_work import PostgreSqlUnitOfWork
+from src.service_layer.unit_of_work import (
+    AsyncPostgreSqlUnitOfWork,
+    PostgreSqlUnitOfWork,
+)
 
 
 def test_unit_of_work_return_get_item(
@@ -22,8 +27,68 @@ def test_unit_of_work_return_get_items(
     assert all(isinstance(result, Item) for result in results)
 
 
+def test_read_only_unit_of_work_return_rows(
+    mock_postgres_connection,
+):
+    uow = PostgreSqlUnitOfWork(PostgreSqlSession(), read_only=True)
+    with uow:
+        result = uow.repository.get_item(1)
+        results = uow.repository.get_items(10, 0, None, None)
+    assert not isinstance(result, Item)
+    assert (result.id, result.title) == (1, "test title")
+    assert [row.id for row in results] == [1, 2]
+
+
 def test_unit_of_work_raise_exception_when_connection_fails():
     with pytest.raises(Exception):
         uow = PostgreSqlUnitOfWork(PostgreSqlSession())
         with uow:
             uow.repository.get_items()
+
+
+def test_unit_of_work_can_be_entered_twice(
+    mock_postgres_connection,
+):
+    uow = PostgreSqlUnitOfWork(PostgreSqlSession())
+    with uow:
+        first = uow.repository.get_item(1)
+    with uow:
+        second = uow.repository.get_item(1)
+    assert first.id == second.id
+
+
+def test_async_unit_of_work_return_get_item(
+    mock_async_postgres_connection,
+):
+    async def get_item():
+        uow = AsyncPostgreSqlUnitOfWork(AsyncPostgreSqlSession())
+        async with uow:
+            return await uow.repository.get_item(1)
+
+    assert isinstance(asyncio.run(get_item()), Item)
+
+
+def test_async_unit_of_work_return_get_items(
+    mock_async_postgres_connection,
+):
+    async def get_items():
+        uow = AsyncPostgreSqlUnitOfWork(AsyncPostgreSqlSession())
+        async with uow:
+            return await uow.repository.get_items(10, 0, None, None)
+
+    results = asyncio.run(get_items())
+    assert all(isinstance(result, Item) for result in results)
+
+
+def test_async_read_only_unit_of_work_return_rows(
+    mock_async_postgres_connection,
+):
+    async def get_item():
+        async with AsyncPostgreSqlUnitOfWork(
+            AsyncPostgreSqlSession(), read_only=True
+        ) as uow:
+            return await uow.repository.get_item(1)
+
+    result = asyncio.run(get_item())
+    assert not isinstance(result, Item)
+    assert result.id == 1
@@ -1,11 +1,112 @@
 --- Create table
 CREATE TABLE IF NOT EXISTS items (
     id serial PRIMARY KEY, 
-    title VARCHAR (50), 
-    description VARCHAR (255), 
-    completed BOOL
+    title VARCHAR (50) NOT NULL, 
+    description VARCHAR (255) NOT NULL, 
+    completed BOOL NOT NULL DEFAULT false
 );
 
+--- Sortable columns are NOT NULL, so sorted pages seek with row comparison,
+--- tables created by earlier versions of this script are migrated
+UPDATE items SET
+    title = coalesce(title, ''),
+    description = coalesce(description, ''),
+    completed = coalesce(completed, false)
+WHERE title IS NULL OR description IS NULL OR completed IS NULL;
+ALTER TABLE items
+    ALTER COLUMN title SET NOT NULL,
+    ALTER COLUMN description SET NOT NULL,
+    ALTER COLUMN completed SET NOT NULL,
+    ALTER COLUMN completed SET DEFAULT false;
+
+--- Search indexes
+--- Trigram indexes serve substring and prefix filters (LIKE '%value%', LIKE 'value%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_items_title_trgm ON items USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_items_description_trgm ON items USING gin (description gin_trgm_ops);
+
+--- Sort indexes
+--- Composite indexes serve sort=field (ascending or descending) with index scans,
+--- id breaks ties, so pages are sought by keyset cursor, e.g. (title, id) > ('a', 5)
+CREATE INDEX IF NOT EXISTS ix_items_completed_id ON items (completed, id);
+CREATE INDEX IF NOT EXISTS ix_items_title_id ON items (title, id);
+CREATE INDEX IF NOT EXISTS ix_items_description_id ON items (description, id);
+
+--- Generated search vectors serve full-text filters (filter_mode=fulltext)
+ALTER TABLE items ADD COLUMN IF NOT EXISTS title_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(title, ''))) STORED;
+ALTER TABLE items ADD COLUMN IF NOT EXISTS description_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(description, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_items_title_search ON items USING gin (title_search);
+CREATE INDEX IF NOT EXISTS ix_items_description_search ON items USING gin (description_search);
+
+--- Counter table serves total and per completion state counts in constant time
+--- Statement-level triggers append net change of each statement as new rows, so
+--- concurrent writers and COPY batches never wait on a shared counter row lock.
+--- Counts are sums per state; the API rolls rows up periodically
+--- (counts_rollup_interval), so the table stays a few rows long
+DO $$
+BEGIN
+    --- Earlier versions kept one updated row per state, counts are rebuilt below
+    IF EXISTS (
+        SELECT 1 FROM information_schema.tables WHERE table_name = 'items_counts'
+    ) AND NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'items_counts' AND column_name = 'id'
+    ) THEN
+        DROP TABLE items_counts;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS items_counts (
+    id bigserial PRIMARY KEY,
+    completed BOOL NOT NULL,
+    count BIGINT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION items_counts_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM items_counts;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO items_counts (completed, count)
+        SELECT completed, count(*) FROM new_rows GROUP BY completed;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO items_counts (completed, count)
+        SELECT completed, -count(*) FROM old_rows GROUP BY completed;
+    ELSE
+        INSERT INTO items_counts (completed, count)
+        SELECT completed, sum(delta) FROM (
+            SELECT completed, -1 AS delta FROM old_rows
+            UNION ALL
+            SELECT completed, 1 AS delta FROM new_rows
+        ) AS changes
+        GROUP BY completed
+        HAVING sum(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER items_counts_insert AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION items_counts_refresh();
+CREATE OR REPLACE TRIGGER items_counts_update AFTER UPDATE ON items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION items_counts_refresh();
+CREATE OR REPLACE TRIGGER items_counts_delete AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION items_counts_refresh();
+CREATE OR REPLACE TRIGGER items_counts_truncate AFTER TRUNCATE ON items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_counts_refresh();
+
+--- Initialize counters from rows already stored in table
+DELETE FROM items_counts;
+INSERT INTO items_counts (completed, count)
+SELECT completed, count(*) FROM items GROUP BY completed;
+
 --- Fill up table with test data
 INSERT INTO items(title, description, completed) 
 VALUES 
@@ -13,4 +114,4 @@ VALUES
 ('Prepare docker image', 'Docker image creation', True),
 ('API implementation', 'Implement REST API', True),
 ('Unit tests', 'Implement unit tests', True),
-('Code refactoring', 'Find bugs and fix them', False);
\ No newline at end of file
+('Code refactoring', 'Find bugs and fix them', False);